@@ -6,6 +6,23 @@
 
 运行方式：
     python3 chapters/week_09/examples/06_log_analyzer.py
+    python3 chapters/week_09/examples/06_log_analyzer.py access.log      # 分析日志文件
+    python3 chapters/week_09/examples/06_log_analyzer.py access.log.gz   # gzip 压缩的日志
+    cat access.log | python3 chapters/week_09/examples/06_log_analyzer.py -   # 从标准输入读
+    python3 chapters/week_09/examples/06_log_analyzer.py --mmap access.log  # 用 mmap 读取
+    python3 chapters/week_09/examples/06_log_analyzer.py --jobs 8 access.log  # 8 个进程并行解析
+    python3 chapters/week_09/examples/06_log_analyzer.py --follow access.log  # 实时监控（Ctrl+C 退出）
+
+大文件（几个 GB）也能分析：日志逐行读取、边读边统计，
+命令行模式不保留每条记录，内存占用与文件大小无关。
+--jobs 把文件按行切成若干块，交给多个进程分别解析，最后合并各块的统计。
+
+需要在内存里保留上千万条记录时，用 LogAnalyzer(storage="columns") 按列存放：
+每条记录只占十几个字节（IP 4 字节、状态码 2 字节、方法和路径各一个编号），
+装了 NumPy 时可以用 storage="numpy"，过滤在 NumPy 数组上完成。
+
+--follow 像 tail -F 一样盯着一个不断增长的日志（能跟上日志轮转和截断），
+定期打印最近 1 分钟、5 分钟、1 小时的请求数、错误率和访问最多的 IP。
 
 预期输出：
     === 日志分析器 ===
@@ -31,10 +48,391 @@
     ...
 """
 
+import argparse
+import gzip
+import heapq
+import io
+import mmap
+import os
 import re
-from collections import defaultdict
+import sys
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选的，只有 storage="numpy" 需要
+    np = None
+
+
+@contextmanager
+def open_log(source: str | Path, encoding: str = "utf-8", use_mmap: bool = False):
+    """打开日志来源，得到一个逐行产出文本的迭代器
+
+    Args:
+        source: 文件路径；以 .gz 结尾时按 gzip 解压；"-" 表示标准输入
+        encoding: 文件编码，无法解码的字节替换为 �
+        use_mmap: 普通文件用 mmap 映射后逐行读取（gzip 和标准输入不支持，忽略）
+
+    Yields:
+        逐行产出字符串的迭代器（不会一次读入整个文件）
+    """
+    if str(source) == "-":
+        stdin = io.TextIOWrapper(sys.stdin.buffer, encoding=encoding, errors="replace")
+        try:
+            yield stdin
+        finally:
+            stdin.detach()  # 不关闭 sys.stdin 本身
+        return
+
+    path = Path(source)
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding=encoding, errors="replace") as f:
+            yield f
+        return
+
+    if use_mmap and path.stat().st_size > 0:  # 空文件无法 mmap
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield (line.decode(encoding, errors="replace") for line in iter(mm.readline, b""))
+        return
+
+    with open(path, "r", encoding=encoding, errors="replace") as f:
+        yield f
+
+
+class LogAggregator:
+    """边读边更新的统计量：总数、错误数、每个 IP 的访问/错误数、
+    状态码、请求方法和路径的分布
+
+    每条记录只做几次字典更新，不保存记录本身，
+    所以处理多大的日志占用的内存都只和 IP、状态码、路径的种类有关。
+    查询时直接读这些计数，不用再扫描记录。
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.errors = 0
+        self.ip_stats: dict[str, dict[str, int]] = {}  # 按 IP 第一次出现的顺序
+        self.status_counts: Counter = Counter()
+        self.method_counts: Counter = Counter()
+        self.path_counts: Counter = Counter()
+        self._sorted_ips: list[str] | None = None  # extract_unique_ips 的缓存，出现新 IP 时作废
+
+    def add(self, record: dict) -> None:
+        """计入一条解析后的记录"""
+        is_error = record["status_int"] >= 400
+        self.total += 1
+        self.errors += is_error
+        self.status_counts[record["status"]] += 1
+        self.method_counts[record["method"]] += 1
+        self.path_counts[record["path"]] += 1
+
+        stats = self.ip_stats.get(record["ip"])
+        if stats is None:
+            stats = self.ip_stats[record["ip"]] = {"total": 0, "errors": 0}
+            self._sorted_ips = None
+        stats["total"] += 1
+        stats["errors"] += is_error
+
+    def merge(self, other: "LogAggregator") -> None:
+        """把另一块日志的统计合并进来
+
+        按日志先后顺序合并时，IP、方法、路径的先后顺序与逐行统计完全一致。
+        """
+        self.total += other.total
+        self.errors += other.errors
+        self.status_counts.update(other.status_counts)
+        self.method_counts.update(other.method_counts)
+        self.path_counts.update(other.path_counts)
+        for ip, stats in other.ip_stats.items():
+            mine = self.ip_stats.get(ip)
+            if mine is None:
+                self.ip_stats[ip] = dict(stats)
+                self._sorted_ips = None
+            else:
+                mine["total"] += stats["total"]
+                mine["errors"] += stats["errors"]
+
+    def sorted_ips(self) -> list[str]:
+        """排好序的独立 IP（缓存到下一次出现新 IP）"""
+        if self._sorted_ips is None:
+            self._sorted_ips = sorted(self.ip_stats)
+        return self._sorted_ips
+
+
+def ip_to_int(ip: str) -> int | None:
+    """把 "a.b.c.d" 转成 32 位整数；不是合法的 IPv4 地址时返回 None"""
+    parts = ip.split(".")
+    if len(parts) != 4 or not all(part.isascii() and part.isdigit() for part in parts):
+        return None
+    value = 0
+    for part in parts:
+        number = int(part)
+        if number > 255 or str(number) != part:  # 例如 999 或 010：转换后无法原样还原
+            return None
+        value = value << 8 | number
+    return value
+
+
+def int_to_ip(value: int) -> str:
+    """32 位整数 → a.b.c.d 形式的字符串"""
+    return f"{value >> 24}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+class LogColumns:
+    """按列存放解析后的日志记录（只追加，顺序即加载顺序）
+
+    一条记录如果是 parse_line 返回的字典，要占几百字节；按列存放后：
+    - IP：array('I')，每条 4 字节
+    - 状态码：array('H')，每条 2 字节
+    - 方法、路径：整个表只保存一次字符串，每条记录存一个编号（array('I')）
+
+    LOG_PATTERN 也能匹配 999.1.1.1 这类不合法的 IP，它们原样保存在一个字典里。
+    records[i] 取出与 parse_line 格式相同的字典，过滤和生成报告直接在列上做。
+    """
+
+    def __init__(self):
+        self.ips = array("I")
+        self.statuses = array("H")
+        self.method_codes = array("I")
+        self.path_codes = array("I")
+        self.methods: list[str] = []  # 编号 → 方法
+        self.paths: list[str] = []  # 编号 → 路径
+        self._method_lookup: dict[str, int] = {}
+        self._path_lookup: dict[str, int] = {}
+        self._raw_ips: dict[int, str] = {}  # 行号 → 无法转成整数的 IP
+
+    @staticmethod
+    def _intern(value: str, names: list[str], lookup: dict[str, int]) -> int:
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(names)
+            names.append(value)
+        return code
+
+    def append(self, record: dict) -> None:
+        """追加一条 parse_line 返回的记录"""
+        value = ip_to_int(record["ip"])
+        if value is None:
+            self._raw_ips[len(self.ips)] = record["ip"]
+            value = 0
+        self.ips.append(value)
+        self.statuses.append(record["status_int"])
+        self.method_codes.append(self._intern(record["method"], self.methods, self._method_lookup))
+        self.path_codes.append(self._intern(record["path"], self.paths, self._path_lookup))
+
+    def extend(self, other: "LogColumns") -> None:
+        """把另一段按列存放的记录整块接在后面（方法、路径编号换成本表的编号）"""
+        base = len(self)
+        self.ips.extend(other.ips)
+        self.statuses.extend(other.statuses)
+        for codes, other_codes, other_names, names, lookup in (
+            (self.method_codes, other.method_codes, other.methods, self.methods, self._method_lookup),
+            (self.path_codes, other.path_codes, other.paths, self.paths, self._path_lookup),
+        ):
+            remap = [self._intern(name, names, lookup) for name in other_names]
+            if remap == list(range(len(remap))):
+                codes.extend(other_codes)  # 编号相同（例如第一块），直接拼接
+            else:
+                codes.extend(array("I", map(remap.__getitem__, other_codes)))
+        for row, raw in other._raw_ips.items():
+            self._raw_ips[row + base] = raw
+
+    # =====================
+    # 按行取出
+    # =====================
+
+    def __len__(self) -> int:
+        return len(self.ips)
+
+    def __getitem__(self, row: int) -> dict:
+        """第 row 条记录（与 parse_line 的格式相同）"""
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        status = self.statuses[row]
+        return {
+            "ip": self.ip(row),
+            "method": self.methods[self.method_codes[row]],
+            "path": self.paths[self.path_codes[row]],
+            "status": f"{status:03d}",
+            "status_int": status,
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def ip(self, row: int) -> str:
+        """第 row 条记录的 IP"""
+        if row in self._raw_ips:
+            return self._raw_ips[row]
+        return int_to_ip(self.ips[row])
+
+    def ip_strings(self) -> list[str]:
+        """所有记录的 IP（相同的整数只格式化一次）"""
+        names: dict[int, str] = {}
+        result = []
+        for value in self.ips:
+            name = names.get(value)
+            if name is None:
+                name = names[value] = int_to_ip(value)
+            result.append(name)
+        for row, raw in self._raw_ips.items():
+            result[row] = raw
+        return result
+
+    # =====================
+    # 列上的过滤和报告
+    # =====================
+
+    @staticmethod
+    def _matching_statuses(status_prefix: str, distinct: Iterable[int]) -> set[int]:
+        return {code for code in distinct if f"{code:03d}".startswith(status_prefix)}
+
+    def rows_by_status(self, status_prefix: str) -> list[int]:
+        """状态码以 status_prefix 开头的行号（按加载顺序）"""
+        codes = self._matching_statuses(status_prefix, set(self.statuses))
+        return [row for row, code in enumerate(self.statuses) if code in codes]
+
+    def rows_by_ip(self, ip: str) -> list[int]:
+        """某个 IP 的所有行号（按加载顺序）"""
+        value = ip_to_int(ip)
+        if value is None:
+            return [row for row, raw in self._raw_ips.items() if raw == ip]
+        rows = [row for row, v in enumerate(self.ips) if v == value]
+        if value == 0 and self._raw_ips:  # 0.0.0.0 与不合法 IP 的占位值相同
+            rows = [row for row in rows if row not in self._raw_ips]
+        return rows
+
+    def report_lines(self, mask_ips: bool = False) -> Iterator[str]:
+        """逐行产出 CSV 报告（不含表头），IP 和状态码按整数缓存格式化结果"""
+        ip_names: dict[int, str] = {}
+        status_names: dict[int, str] = {}
+        for row in range(len(self)):
+            value = self.ips[row]
+            if row in self._raw_ips:
+                ip = self._raw_ips[row]
+                if mask_ips:
+                    parts = ip.split(".")
+                    ip = f"***.***.{parts[2]}.{parts[3]}"
+            else:
+                ip = ip_names.get(value)
+                if ip is None:
+                    ip = ip_names[value] = (
+                        f"***.***.{value >> 8 & 255}.{value & 255}" if mask_ips
+                        else int_to_ip(value)
+                    )
+            status = self.statuses[row]
+            status_name = status_names.get(status)
+            if status_name is None:
+                status_name = status_names[status] = f"{status:03d}"
+            yield (f"{ip},{self.methods[self.method_codes[row]]},"
+                   f"{self.paths[self.path_codes[row]]},{status_name}")
+
+    def nbytes(self) -> int:
+        """各列占用的字节数（不含方法名和路径字符串）"""
+        columns = (self.ips, self.statuses, self.method_codes, self.path_codes)
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+class NumpyLogColumns(LogColumns):
+    """LogColumns 的 NumPy 版本：追加仍写入 array，过滤时把列零拷贝地看成 NumPy 数组
+
+    np.frombuffer 直接共享 array 的内存，过滤由 NumPy 在 C 里完成，
+    比逐个比较 Python 整数快一两个数量级。
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError('storage="numpy" 需要安装 NumPy：pip install numpy')
+        super().__init__()
+
+    def rows_by_status(self, status_prefix: str) -> list[int]:
+        statuses = np.frombuffer(self.statuses, dtype=np.uint16)
+        codes = self._matching_statuses(status_prefix, np.unique(statuses).tolist())
+        return np.flatnonzero(np.isin(statuses, list(codes))).tolist()
+
+    def rows_by_ip(self, ip: str) -> list[int]:
+        value = ip_to_int(ip)
+        if value is None:
+            return super().rows_by_ip(ip)
+        rows = np.flatnonzero(np.frombuffer(self.ips, dtype=np.uint32) == value).tolist()
+        if value == 0 and self._raw_ips:
+            rows = [row for row in rows if row not in self._raw_ips]
+        return rows
+
+
+STORAGES = {"dict": list, "columns": LogColumns, "numpy": NumpyLogColumns}
+
+
+def split_chunks(file_path: str | Path, chunk_bytes: int) -> list[tuple[int, int]]:
+    """把文件切成大约 chunk_bytes 字节的若干块，每块的边界都在换行符之后
+
+    Returns:
+        [(起始偏移, 结束偏移), ...]，首尾相接覆盖整个文件
+    """
+    size = Path(file_path).stat().st_size
+    offsets = [0]
+    with open(file_path, "rb") as f:
+        while offsets[-1] + chunk_bytes < size:
+            f.seek(offsets[-1] + chunk_bytes - 1)
+            f.readline()  # 走到这一行的行尾，下一块从新的一行开始
+            if f.tell() >= size:
+                break
+            offsets.append(f.tell())
+    offsets.append(size)
+    return list(zip(offsets, offsets[1:]))
+
+
+def _parse_chunk(task: tuple) -> tuple["LogAggregator", object, int]:
+    """在子进程中解析一块日志
+
+    记录以紧凑、可以整块拼接的形式传回主进程（见 LogAnalyzer._merge_chunk）：
+    - 字典列表：记录 + 块内的二级索引（下标从 0 开始）；相同的字符串共用一个对象，
+      pickle 只写一次
+    - 按列存放：这一块的 LogColumns，只有几个 array 和方法、路径名表
+
+    Returns:
+        (这一块的统计, 这一块的记录（不保存记录时为 None）, 读取的行数)
+    """
+    file_path, start, end, encoding, keep_records, storage = task
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # newline=None：与文本模式读文件一样，\r\n 和单独的 \r 都算换行
+    lines = io.StringIO(data.decode(encoding, errors="replace"), newline=None)
+    del data
+
+    # 子进程里按列存放不需要 NumPy，主进程再放进 NumpyLogColumns
+    analyzer = LogAnalyzer(keep_records=keep_records,
+                           storage="dict" if storage == "dict" else "columns")
+    strings: dict[str, str] = {}
+    line_count = 0
+    for line in lines:
+        line_count += 1
+        record = analyzer.parse_line(line)
+        if record:
+            analyzer.aggregator.add(record)
+            if not keep_records:
+                continue
+            if storage == "dict":
+                for key in ("ip", "method", "path", "status"):
+                    record[key] = strings.setdefault(record[key], record[key])
+            analyzer._index_record(record)
+
+    if not keep_records:
+        chunk = None
+    elif storage == "dict":
+        chunk = (analyzer.records, analyzer._ip_index, analyzer._status_index)
+    else:
+        chunk = analyzer.records
+    return analyzer.aggregator, chunk, line_count
 
 
 class LogAnalyzer:
@@ -48,11 +446,33 @@ class LogAnalyzer:
         r"(?P<status>\d{3})"
     )
 
-    def __init__(self):
-        self.records: list[dict] = []
+    def __init__(self, keep_records: bool = True, storage: str = "dict"):
+        """
+        Args:
+            keep_records: 是否保存每条记录。只需要统计时设为 False，
+                内存占用不再随日志行数增长，但过滤、提取 IP、生成报告需要记录，不可用
+            storage: 记录的存放方式。"dict"：字典列表（默认）；
+                "columns"：按列存放的 LogColumns；"numpy"：用 NumPy 过滤的 NumpyLogColumns
 
-    def parse_line(self, line: str) -> dict | None:
-        """解析单行日志
+        Raises:
+            ValueError: 未知的 storage
+            ImportError: storage="numpy" 但没有安装 NumPy
+        """
+        if storage not in STORAGES:
+            raise ValueError(f"未知的存放方式：{storage}（可选：{', '.join(STORAGES)}）")
+        self.keep_records = keep_records
+        self.storage = storage
+        self.records: list[dict] | LogColumns = STORAGES[storage]()
+        self.aggregator = LogAggregator()
+        # 二级索引：IP / 状态码 → 记录在 self.records 中的下标（递增），过滤时直接查。
+        # 按列存放时不建索引（索引本身每条记录要占几十字节），过滤直接扫描列
+        self._ip_index: dict[str, list[int]] = {}
+        self._status_index: dict[str, list[int]] = {}
+        self.last_load: dict[str, float] = {}  # 最近一次 load_from_file 的行数、耗时和速度
+
+    @classmethod
+    def parse_line(cls, line: str) -> dict | None:
+        """解析单行日志（不依赖分析器的状态，也可以直接用 LogAnalyzer.parse_line 调用）
 
         Args:
             line: 日志行字符串
@@ -64,7 +484,7 @@ class LogAnalyzer:
         if not line:
             return None
 
-        match = self.LOG_PATTERN.search(line)
+        match = cls.LOG_PATTERN.search(line)
         if not match:
             return None
 
@@ -76,61 +496,209 @@ class LogAnalyzer:
             "status_int": int(match.group("status"))
         }
 
-    def load_from_text(self, text: str) -> int:
-        """从文本加载日志
+    def ingest(self, lines: Iterable[str]) -> int:
+        """逐行解析并计入统计（lines 可以是文件对象等任意迭代器）
 
         Args:
-            text: 日志文本（多行）
+            lines: 日志行
 
         Returns:
             成功解析的记录数
         """
         count = 0
-        for line in text.strip().split("\n"):
+        for line in lines:
             record = self.parse_line(line)
             if record:
-                self.records.append(record)
+                self.aggregator.add(record)
+                if self.keep_records:
+                    self._index_record(record)
                 count += 1
         return count
 
-    def load_from_file(self, file_path: str | Path, encoding: str = "utf-8") -> int:
-        """从文件加载日志
+    def _index_record(self, record: dict) -> None:
+        """保存一条记录并登记到二级索引"""
+        offset = len(self.records)
+        self.records.append(record)
+        if self.storage != "dict":
+            return
+        self._ip_index.setdefault(record["ip"], []).append(offset)
+        self._status_index.setdefault(record["status"], []).append(offset)
+
+    def load_from_text(self, text: str) -> int:
+        """从文本加载日志
 
         Args:
-            file_path: 日志文件路径
+            text: 日志文本（多行）
+
+        Returns:
+            成功解析的记录数
+        """
+        return self.ingest(io.StringIO(text))
+
+    def _staging(self) -> "LogAnalyzer":
+        """一次加载先写进的临时分析器（设置相同，数据为空）"""
+        return LogAnalyzer(keep_records=self.keep_records, storage=self.storage)
+
+    def _commit(self, staged: "LogAnalyzer") -> None:
+        """把一次完整加载的结果并入当前分析器
+
+        加载中途出错时不会调用，已有的统计和记录保持不变。
+        """
+        if self.aggregator.total == 0:
+            # 还没有数据（最常见的情况）：直接接管，不必再逐条登记
+            self.aggregator, self.records = staged.aggregator, staged.records
+            self._ip_index, self._status_index = staged._ip_index, staged._status_index
+            return
+        self.aggregator.merge(staged.aggregator)
+        for record in staged.records:
+            self._index_record(record)
+
+    def _merge_chunk(self, chunk) -> None:
+        """并入子进程解析的一块记录（_parse_chunk 的返回值）
+
+        记录整块拼接；块内二级索引的下标整体加上已有的记录数后接在后面，
+        不再逐条登记。
+        """
+        if chunk is None:
+            return
+        base = len(self.records)
+        if self.storage != "dict":
+            self.records.extend(chunk)
+            return
+
+        records, ip_index, status_index = chunk
+        self.records.extend(records)
+        for index, chunk_index in ((self._ip_index, ip_index),
+                                   (self._status_index, status_index)):
+            for key, offsets in chunk_index.items():
+                if base:
+                    offsets = [offset + base for offset in offsets]
+                mine = index.get(key)
+                if mine is None:
+                    index[key] = offsets
+                else:
+                    mine.extend(offsets)
+
+    def load_from_file(self, file_path: str | Path, encoding: str = "utf-8",
+                       use_mmap: bool = False) -> int:
+        """从文件流式加载日志（逐行读取，不会一次读入整个文件）
+
+        读取中途出错时返回 0，这个文件已经读到的部分不计入统计。
+
+        Args:
+            file_path: 日志文件路径；.gz 文件自动解压，"-" 表示标准输入
             encoding: 文件编码，默认 utf-8
+            use_mmap: 是否用 mmap 读取普通文件
 
         Returns:
             成功解析的记录数
         """
-        file_path = Path(file_path)
+        if str(file_path) != "-":
+            file_path = Path(file_path)
+            if not file_path.exists():
+                print(f"警告: 文件 {file_path} 不存在")
+                return 0
+
+        line_count = 0
+
+        def counted(lines: Iterable[str]) -> Iterator[str]:
+            nonlocal line_count
+            for line in lines:
+                line_count += 1
+                yield line
+
+        staged = self._staging()
+        start = time.perf_counter()
+        try:
+            with open_log(file_path, encoding, use_mmap) as lines:
+                count = staged.ingest(counted(lines))
+        except Exception as e:
+            print(f"错误: 读取文件时发生异常 - {e}")
+            return 0
+
+        self._commit(staged)
+        self._record_load(line_count, count, start)
+        return count
+
+    def load_parallel(self, file_path: str | Path, workers: int | None = None,
+                      chunk_bytes: int = 16 * 1024 * 1024, encoding: str = "utf-8",
+                      mp_context=None) -> int:
+        """用多个进程并行加载一个日志文件
+
+        文件按换行对齐切成大约 chunk_bytes 的块，每个子进程解析一块，
+        返回这块的统计（以及记录），主进程按块的先后顺序合并。
+        合并后的统计、记录顺序与 load_from_file 完全相同。
+        所有块都解析成功后才并入当前分析器，任何一块出错都返回 0，已有数据保持不变。
 
+        .gz 文件和标准输入无法按偏移切块，退回 load_from_file 逐行读取。
+        编码需要兼容 ASCII 换行（utf-8、gbk 等），切块时按字节 \n 对齐。
+
+        Args:
+            file_path: 日志文件路径
+            workers: 进程数，默认为 CPU 核数
+            chunk_bytes: 每块的大约字节数
+            encoding: 文件编码
+            mp_context: 子进程的启动方式（multiprocessing.get_context(...)），默认用平台的默认方式
+
+        Returns:
+            成功解析的记录数
+        """
+        if str(file_path) == "-" or Path(file_path).suffix == ".gz":
+            return self.load_from_file(file_path, encoding)
+
+        file_path = Path(file_path)
         if not file_path.exists():
             print(f"警告: 文件 {file_path} 不存在")
             return 0
 
+        start = time.perf_counter()
+        tasks = [
+            (str(file_path), chunk_start, chunk_end, encoding, self.keep_records, self.storage)
+            for chunk_start, chunk_end in split_chunks(file_path, chunk_bytes)
+        ]
+        staged = self._staging()
+        line_count = 0
         try:
-            with open(file_path, "r", encoding=encoding, errors="replace") as f:
-                content = f.read()
-            return self.load_from_text(content)
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                     mp_context=mp_context) as executor:
+                # map 按提交顺序返回结果，合并顺序就是日志顺序
+                for aggregator, chunk, lines in executor.map(_parse_chunk, tasks):
+                    staged.aggregator.merge(aggregator)
+                    staged._merge_chunk(chunk)
+                    line_count += lines
         except Exception as e:
             print(f"错误: 读取文件时发生异常 - {e}")
             return 0
 
+        count = staged.aggregator.total
+        self._commit(staged)
+        self._record_load(line_count, count, start)
+        return count
+
+    def _record_load(self, line_count: int, count: int, start: float) -> None:
+        """记录最近一次加载的行数、耗时和速度"""
+        seconds = time.perf_counter() - start
+        self.last_load = {
+            "lines": line_count,
+            "records": count,
+            "seconds": seconds,
+            "lines_per_sec": line_count / seconds if seconds > 0 else 0.0,
+        }
+
+    def _require_records(self) -> None:
+        if not self.keep_records:
+            raise ValueError("未保存日志记录：需要逐条记录时请用 LogAnalyzer(keep_records=True)")
+
     def get_stats(self) -> dict[str, int]:
         """获取统计信息
 
         Returns:
             包含总请求数、独立 IP 数、错误数的字典
         """
-        total = len(self.records)
-        unique_ips = len(set(r["ip"] for r in self.records))
-        errors = sum(1 for r in self.records if r["status_int"] >= 400)
-
         return {
-            "total_requests": total,
-            "unique_ips": unique_ips,
-            "errors": errors
+            "total_requests": self.aggregator.total,
+            "unique_ips": len(self.aggregator.ip_stats),
+            "errors": self.aggregator.errors
         }
 
     def get_ip_stats(self) -> dict[str, dict[str, int]]:
@@ -139,15 +707,23 @@ class LogAnalyzer:
         Returns:
             字典，key 是 IP，value 是统计信息
         """
-        stats = defaultdict(lambda: {"total": 0, "errors": 0})
+        return {ip: dict(stats) for ip, stats in self.aggregator.ip_stats.items()}
 
-        for record in self.records:
-            ip = record["ip"]
-            stats[ip]["total"] += 1
-            if record["status_int"] >= 400:
-                stats[ip]["errors"] += 1
+    def get_status_counts(self) -> dict[str, int]:
+        """获取状态码分布
 
-        return dict(stats)
+        Returns:
+            字典，key 是状态码，value 是出现次数（按状态码排序）
+        """
+        return dict(sorted(self.aggregator.status_counts.items()))
+
+    def get_method_counts(self) -> dict[str, int]:
+        """获取各请求方法的次数（从多到少）"""
+        return dict(self.aggregator.method_counts.most_common())
+
+    def get_top_paths(self, limit: int = 10) -> list[tuple[str, int]]:
+        """获取访问最多的 limit 个路径（次数相同时先出现的在前）"""
+        return self.aggregator.path_counts.most_common(limit)
 
     def filter_by_status(self, status_prefix: str) -> list[dict]:
         """按状态码前缀过滤记录
@@ -158,10 +734,17 @@ class LogAnalyzer:
         Returns:
             符合条件的记录列表
         """
-        return [
-            r for r in self.records
-            if r["status"].startswith(status_prefix)
+        self._require_records()
+        if self.storage != "dict":
+            return [self.records[i] for i in self.records.rows_by_status(status_prefix)]
+        # 状态码只有几十种：先找出匹配前缀的状态码，再按下标顺序合并它们的记录
+        offset_lists = [
+            offsets for status, offsets in self._status_index.items()
+            if status.startswith(status_prefix)
         ]
+        if len(offset_lists) == 1:
+            return [self.records[i] for i in offset_lists[0]]
+        return [self.records[i] for i in heapq.merge(*offset_lists)]
 
     def filter_by_ip(self, ip: str) -> list[dict]:
         """按 IP 地址过滤记录
@@ -172,7 +755,10 @@ class LogAnalyzer:
         Returns:
             该 IP 的所有记录
         """
-        return [r for r in self.records if r["ip"] == ip]
+        self._require_records()
+        if self.storage != "dict":
+            return [self.records[i] for i in self.records.rows_by_ip(ip)]
+        return [self.records[i] for i in self._ip_index.get(ip, [])]
 
     def extract_ips(self) -> list[str]:
         """提取所有 IP 地址
@@ -180,6 +766,9 @@ class LogAnalyzer:
         Returns:
             IP 地址列表（可能包含重复）
         """
+        self._require_records()
+        if self.storage != "dict":
+            return self.records.ip_strings()
         return [r["ip"] for r in self.records]
 
     def extract_unique_ips(self) -> list[str]:
@@ -188,7 +777,7 @@ class LogAnalyzer:
         Returns:
             去重后的 IP 地址列表
         """
-        return sorted(set(r["ip"] for r in self.records))
+        return list(self.aggregator.sorted_ips())
 
     def generate_report(self, mask_ips: bool = False) -> str:
         """生成 CSV 格式的报告
@@ -199,8 +788,13 @@ class LogAnalyzer:
         Returns:
             CSV 格式的报告字符串
         """
+        self._require_records()
         lines = ["IP,方法,路径,状态"]
 
+        if self.storage != "dict":
+            lines.extend(self.records.report_lines(mask_ips))
+            return "\n".join(lines)
+
         for r in self.records:
             ip = r["ip"]
             if mask_ips:
@@ -227,11 +821,270 @@ class LogAnalyzer:
             print(f"{ip}: 总请求 {data['total']}, 错误 {data['errors']}")
 
 
+# =====================
+# 实时监控（follow 模式）
+# =====================
+
+def follow_lines(file_path: str | Path, poll_interval: float = 1.0, from_start: bool = False,
+                 encoding: str = "utf-8") -> Iterator[str | None]:
+    """像 tail -F 一样跟踪一个不断增长的日志文件
+
+    - 日志轮转（文件被改名、新建同名文件）：读完旧文件剩下的内容后，从头读新文件
+    - 截断（copytruncate 或 > access.log）：文件变得比已读位置还短时，回到开头
+    - 文件暂时不存在：等它出现后从头读
+    - 写了一半的行先缓存起来，等换行符到了再产出
+
+    Args:
+        file_path: 日志文件路径
+        poll_interval: 没有新内容时，隔多久再检查一次（秒）
+        from_start: True 从文件开头读；False（默认）只读之后新写入的行
+
+    Yields:
+        每一行日志；没有新内容时产出 None（每次轮询一个），调用方可以借机做定期工作或退出
+    """
+    file_path = Path(file_path)
+    f = None
+    seek_to_end = not from_start  # 只对一开始就存在的文件生效
+    partial = b""
+    try:
+        while True:
+            if f is None:
+                try:
+                    f = open(file_path, "rb")
+                except FileNotFoundError:
+                    pass
+                else:
+                    if seek_to_end:
+                        f.seek(0, os.SEEK_END)
+                seek_to_end = False
+
+            if f is not None:
+                chunk = f.readline()
+                if chunk:
+                    partial += chunk
+                    if partial.endswith(b"\n"):
+                        yield partial.decode(encoding, errors="replace")
+                        partial = b""
+                    continue
+
+                # 读到文件末尾：检查是否被轮转或截断
+                try:
+                    current = os.stat(file_path)
+                except FileNotFoundError:
+                    current = None
+                if current is not None and current.st_ino != os.fstat(f.fileno()).st_ino:
+                    # 上次读到末尾之后、改名之前，旧文件可能又写进了几行：关闭前再读到末尾
+                    for chunk in iter(f.readline, b""):
+                        partial += chunk
+                        if partial.endswith(b"\n"):
+                            yield partial.decode(encoding, errors="replace")
+                            partial = b""
+                    f.close()  # 旧文件已经读完，换成新文件
+                    f = None
+                    if partial:
+                        yield partial.decode(encoding, errors="replace")
+                        partial = b""
+                    continue
+                if current is not None and current.st_size < f.tell():
+                    f.seek(0)
+                    partial = b""
+                    continue
+
+            yield None
+            time.sleep(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+class SlidingWindow:
+    """最近 seconds 秒内的请求数、错误数和各 IP 的访问次数
+
+    窗口分成 slots 个槽组成的环形缓冲区，每个槽统计 seconds/slots 秒。
+    时间前进到一个旧槽时，先从总数里扣掉它的计数再复用，
+    所以内存只和槽数、每个槽内的 IP 种类有关，与运行多久无关；
+    窗口边界的精度是一个槽（例如 1 小时窗口分 60 个槽，精度 1 分钟）。
+    """
+
+    def __init__(self, seconds: float, slots: int = 60):
+        self.seconds = seconds
+        self.slots = slots
+        self.width = seconds / slots
+        self._periods = [-1] * slots  # 每个槽当前统计的是第几个时间段，-1 表示空
+        self._requests = [0] * slots
+        self._errors = [0] * slots
+        self._ips = [Counter() for _ in range(slots)]
+        self._latest = 0.0  # 见过的最大时间，时钟回拨时沿用它
+        self._period = -1  # _latest 所在的时间段
+        self.requests = 0
+        self.errors = 0
+        self.ip_counts: Counter = Counter()
+
+    def _evict(self, slot: int) -> None:
+        """从总数中扣掉一个槽的计数并清空它"""
+        self.requests -= self._requests[slot]
+        self.errors -= self._errors[slot]
+        for ip, count in self._ips[slot].items():
+            left = self.ip_counts[ip] - count
+            if left > 0:
+                self.ip_counts[ip] = left
+            else:
+                del self.ip_counts[ip]  # 滑出窗口的 IP 不保留
+        self._periods[slot] = -1
+        self._requests[slot] = self._errors[slot] = 0
+        self._ips[slot] = Counter()
+
+    def expire(self, now: float) -> None:
+        """扣掉所有已经滑出窗口的槽（进入新的时间段时才需要检查）"""
+        self._latest = max(self._latest, now)
+        period = int(self._latest // self.width)
+        if period == self._period:
+            return
+        self._period = period
+        oldest = period - self.slots + 1
+        for slot, period in enumerate(self._periods):
+            if 0 <= period < oldest:
+                self._evict(slot)
+
+    def add(self, record: dict, now: float) -> None:
+        """计入一条在 now 时刻读到的记录"""
+        self.expire(now)
+        period = self._period
+        slot = period % self.slots
+        if self._periods[slot] != period:
+            self._evict(slot)
+            self._periods[slot] = period
+
+        is_error = record["status_int"] >= 400
+        self._requests[slot] += 1
+        self._errors[slot] += is_error
+        self._ips[slot][record["ip"]] += 1
+        self.requests += 1
+        self.errors += is_error
+        self.ip_counts[record["ip"]] += 1
+
+    def summary(self, now: float, top: int = 3) -> dict:
+        """窗口内的请求数、错误数、错误率和访问最多的 top 个 IP"""
+        self.expire(now)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "top_ips": self.ip_counts.most_common(top),
+        }
+
+
+WINDOWS = {"1m": 60, "5m": 300, "1h": 3600}
+
+
+class LogMonitor:
+    """实时监控：逐行解析新日志，维护多个滑动窗口
+
+    只保留滑动窗口里的计数，不累计全部统计，长时间运行内存也不会增长。
+
+    用法：
+        monitor = LogMonitor()
+        monitor.follow("access.log")     # 每 10 秒打印一次，Ctrl+C 退出
+
+    Args:
+        windows: {窗口名: 秒数}，默认最近 1 分钟、5 分钟、1 小时
+        clock: 返回当前时间戳（秒）的函数，测试时可以替换
+    """
+
+    def __init__(self, windows: dict[str, float] | None = None,
+                 clock: Callable[[], float] = time.time):
+        self.windows = {
+            name: SlidingWindow(seconds) for name, seconds in (windows or WINDOWS).items()
+        }
+        self.clock = clock
+
+    def feed(self, line: str) -> bool:
+        """处理一行日志
+
+        Returns:
+            True 如果这一行是合法的日志记录
+        """
+        record = LogAnalyzer.parse_line(line)
+        if not record:
+            return False
+        now = self.clock()
+        for window in self.windows.values():
+            window.add(record, now)
+        return True
+
+    def snapshot(self, top: int = 3) -> dict[str, dict]:
+        """各个窗口当前的统计"""
+        now = self.clock()
+        return {name: window.summary(now, top) for name, window in self.windows.items()}
+
+    def print_snapshot(self, top: int = 3) -> None:
+        """打印各个窗口的统计"""
+        print(f"=== {datetime.fromtimestamp(self.clock()):%H:%M:%S} ===")
+        for name, summary in self.snapshot(top).items():
+            top_ips = ", ".join(f"{ip}({count})" for ip, count in summary["top_ips"]) or "-"
+            print(f"最近 {name}: 请求 {summary['requests']}, 错误 {summary['errors']} "
+                  f"({summary['error_rate']:.1%}), 最多的 IP: {top_ips}")
+
+    def follow(self, file_path: str | Path, report_every: float = 10.0,
+               poll_interval: float = 1.0, from_start: bool = False) -> None:
+        """跟踪日志文件，每隔 report_every 秒打印一次统计，直到 Ctrl+C"""
+        last_report = self.clock()
+        try:
+            for line in follow_lines(file_path, poll_interval, from_start):
+                if line is not None:
+                    self.feed(line)
+                if self.clock() - last_report >= report_every:
+                    self.print_snapshot()
+                    last_report = self.clock()
+        except KeyboardInterrupt:
+            print("\n已停止监控")
+            self.print_snapshot()
+
+
 # =====================
 # 演示
 # =====================
 
+def analyze_files(paths: list[str], use_mmap: bool = False, jobs: int = 1) -> None:
+    """命令行模式：流式分析日志文件，打印统计和处理速度"""
+    analyzer = LogAnalyzer(keep_records=False)
+    for path in paths:
+        if jobs > 1:
+            analyzer.load_parallel(path, workers=jobs)
+        else:
+            analyzer.load_from_file(path, use_mmap=use_mmap)
+        load = analyzer.last_load
+        if load:
+            print(f"{path}: 读取 {load['lines']} 行，解析 {load['records']} 条，"
+                  f"用时 {load['seconds']:.2f} 秒（{load['lines_per_sec']:.0f} 行/秒）")
+
+    print()
+    analyzer.print_summary()
+
+    print("\n=== 状态码分布 ===")
+    for status, count in analyzer.get_status_counts().items():
+        print(f"{status}: {count}")
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description="分析 Web 访问日志")
+        parser.add_argument("paths", nargs="+", help="日志文件（.gz 自动解压，- 表示标准输入）")
+        parser.add_argument("--mmap", action="store_true", help="用 mmap 读取普通文件")
+        parser.add_argument("--jobs", type=int, default=1, help="并行解析的进程数")
+        parser.add_argument("--follow", action="store_true",
+                            help="实时监控一个不断增长的日志文件（Ctrl+C 退出）")
+        parser.add_argument("--interval", type=float, default=10.0,
+                            help="--follow 时每隔多少秒打印一次统计")
+        args = parser.parse_args()
+        if args.follow:
+            if len(args.paths) != 1 or args.paths[0] == "-":
+                parser.error("--follow 只能跟踪一个日志文件")
+            LogMonitor().follow(args.paths[0], report_every=args.interval)
+        else:
+            analyze_files(args.paths, use_mmap=args.mmap, jobs=args.jobs)
+        sys.exit(0)
+
     # 示例日志数据
     sample_logs = """\
 192.168.1.1 - GET /api/users 200
@@ -0,0 +1,642 @@
+"""Week 09 测试：日志分析器示例（examples/06_log_analyzer.py）
+
+本测试文件演示：
+1. 从普通文件、gzip 文件、标准输入流式加载日志
+2. 边读边统计的结果与原来逐条记录统计的结果一致
+3. 不保存记录（keep_records=False）时内存占用不随行数增长
+4. 查询直接读增量统计和二级索引，结果与逐条扫描一致
+5. 多进程分块并行加载，结果与逐行加载完全相同；加载出错时已有数据保持不变
+6. 按列存放记录（LogColumns / NumpyLogColumns），查询结果与字典列表相同
+7. follow 模式：跟踪增长、轮转、截断的日志，滑动窗口统计
+
+运行方式：
+  pytest chapters/week_09/tests/test_log_analyzer.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import gzip
+import importlib.util
+import io
+import multiprocessing
+import os
+import pickle
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+EXAMPLE = Path(__file__).parent.parent / "examples" / "06_log_analyzer.py"
+
+# 文件名以数字开头，不能直接 import，按路径加载；
+# 登记到 sys.modules 后，并行加载时子进程才能找到 _parse_chunk
+_spec = importlib.util.spec_from_file_location("log_analyzer", EXAMPLE)
+log_analyzer = importlib.util.module_from_spec(_spec)
+sys.modules["log_analyzer"] = log_analyzer
+_spec.loader.exec_module(log_analyzer)
+LogAnalyzer = log_analyzer.LogAnalyzer
+
+# 子进程要继承上面按路径加载的模块，所以在进程内测试并行加载时固定用 fork；
+# spawn 启动的子进程会重新 import，找不到 log_analyzer。
+# 平台默认的启动方式由 test_cli_jobs 通过命令行运行脚本来覆盖
+FORK = (multiprocessing.get_context("fork")
+        if "fork" in multiprocessing.get_all_start_methods() else None)
+needs_fork = pytest.mark.skipif(FORK is None, reason="当前平台不支持 fork")
+
+SAMPLE_LOGS = """\
+192.168.1.1 - GET /api/users 200
+192.168.1.2 - POST /api/login 200
+192.168.1.1 - GET /api/products 404
+这行格式不对
+192.168.1.1 - DELETE /api/users/123 403
+
+192.168.1.3 - GET /api/admin 500
+"""
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "access.log"
+    path.write_text(SAMPLE_LOGS, encoding="utf-8")
+    return path
+
+
+def expected_stats():
+    analyzer = LogAnalyzer()
+    analyzer.load_from_text(SAMPLE_LOGS)
+    return analyzer.get_stats(), analyzer.get_ip_stats()
+
+
+class TestStreamingLoad:
+    """测试流式加载"""
+
+    def test_load_from_text(self):
+        """测试从文本加载：跳过空行和格式错误的行"""
+        analyzer = LogAnalyzer()
+        assert analyzer.load_from_text(SAMPLE_LOGS) == 5
+        assert analyzer.get_stats() == {"total_requests": 5, "unique_ips": 3, "errors": 3}
+        assert list(analyzer.get_ip_stats()) == ["192.168.1.1", "192.168.1.2", "192.168.1.3"]
+        assert analyzer.get_ip_stats()["192.168.1.1"] == {"total": 3, "errors": 2}
+        assert analyzer.get_status_counts() == {"200": 2, "403": 1, "404": 1, "500": 1}
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_load_from_file(self, log_file, use_mmap):
+        """测试从普通文件加载（逐行读取 / mmap）"""
+        analyzer = LogAnalyzer()
+        assert analyzer.load_from_file(log_file, use_mmap=use_mmap) == 5
+        assert (analyzer.get_stats(), analyzer.get_ip_stats()) == expected_stats()
+        assert len(analyzer.records) == 5
+
+    def test_load_gzip(self, tmp_path):
+        """测试 .gz 文件自动解压"""
+        path = tmp_path / "access.log.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(SAMPLE_LOGS)
+
+        analyzer = LogAnalyzer()
+        assert analyzer.load_from_file(path, use_mmap=True) == 5
+        assert (analyzer.get_stats(), analyzer.get_ip_stats()) == expected_stats()
+
+    def test_load_stdin(self, monkeypatch):
+        """测试 "-" 从标准输入读取"""
+        stdin = io.TextIOWrapper(io.BytesIO(SAMPLE_LOGS.encode("utf-8")))
+        monkeypatch.setattr(sys, "stdin", stdin)
+
+        analyzer = LogAnalyzer()
+        assert analyzer.load_from_file("-") == 5
+        assert (analyzer.get_stats(), analyzer.get_ip_stats()) == expected_stats()
+        assert not stdin.closed
+
+    def test_empty_file_with_mmap(self, tmp_path):
+        """测试空文件（无法 mmap，退回逐行读取）"""
+        path = tmp_path / "empty.log"
+        path.write_text("")
+        assert LogAnalyzer().load_from_file(path, use_mmap=True) == 0
+
+    def test_missing_file(self, tmp_path, capsys):
+        """测试文件不存在（反例）"""
+        assert LogAnalyzer().load_from_file(tmp_path / "missing.log") == 0
+        assert "不存在" in capsys.readouterr().out
+
+    def test_invalid_bytes_replaced(self, tmp_path):
+        """测试无法解码的字节不会中断加载"""
+        path = tmp_path / "bad.log"
+        path.write_bytes(b"\xff\xfe garbage\n192.168.1.1 - GET /api/users 200\n")
+        assert LogAnalyzer().load_from_file(path) == 1
+
+    def test_failed_load_leaves_data_unchanged(self, tmp_path, capsys):
+        """测试读到一半出错（gzip 文件被截断）时，这个文件读到的部分不计入"""
+        path = tmp_path / "access.log.gz"
+        path.write_bytes(gzip.compress(random_logs(2000).encode("utf-8"))[:-200])
+        analyzer = LogAnalyzer()
+        analyzer.load_from_text(SAMPLE_LOGS)
+
+        assert analyzer.load_from_file(path) == 0
+        assert "异常" in capsys.readouterr().out
+        assert (analyzer.get_stats(), analyzer.get_ip_stats()) == expected_stats()
+        assert len(analyzer.records) == 5
+
+    def test_last_load_reports_speed(self, log_file):
+        """测试记录读取行数和处理速度"""
+        analyzer = LogAnalyzer()
+        analyzer.load_from_file(log_file)
+        load = analyzer.last_load
+        assert load["lines"] == 7
+        assert load["records"] == 5
+        assert load["lines_per_sec"] >= 0
+
+
+class TestWithoutRecords:
+    """测试只统计、不保存记录"""
+
+    def test_stats_without_records(self, log_file):
+        """测试不保存记录时统计结果不变"""
+        analyzer = LogAnalyzer(keep_records=False)
+        assert analyzer.load_from_file(log_file) == 5
+        assert analyzer.records == []
+        assert (analyzer.get_stats(), analyzer.get_ip_stats()) == expected_stats()
+
+    def test_record_queries_need_records(self):
+        """测试需要逐条记录的查询给出明确的错误（反例）"""
+        analyzer = LogAnalyzer(keep_records=False)
+        analyzer.load_from_text(SAMPLE_LOGS)
+        with pytest.raises(ValueError):
+            analyzer.generate_report()
+
+    def test_memory_does_not_grow_with_lines(self, tmp_path):
+        """测试内存峰值与行数无关（只与 IP、路径的种类有关）"""
+        def peak_for(lines):
+            path = tmp_path / f"{lines}.log"
+            with open(path, "w") as f:
+                for i in range(lines):
+                    f.write(f"10.0.{i % 4}.1 - GET /api/items/{i % 50} {200 + i % 2 * 300}\n")
+            analyzer = LogAnalyzer(keep_records=False)
+            tracemalloc.start()
+            analyzer.load_from_file(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert analyzer.get_stats()["total_requests"] == lines
+            return peak
+
+        small, large = peak_for(2_000), peak_for(20_000)
+        assert large < small * 2
+
+
+def random_logs(lines, seed=0):
+    rng = random.Random(seed)
+    ips = [f"10.0.{i}.{j}" for i in range(3) for j in range(5)]
+    methods = ["GET", "POST", "DELETE"]
+    statuses = [200, 201, 301, 403, 404, 500, 503]
+    return "\n".join(
+        f"{rng.choice(ips)} - {rng.choice(methods)} /api/{rng.randrange(8)} {rng.choice(statuses)}"
+        for _ in range(lines)
+    )
+
+
+parse_chunk = log_analyzer._parse_chunk
+
+
+def fail_after_first_chunk(task):
+    """只有第一块能解析成功（模拟子进程读取出错）"""
+    if task[1] > 0:
+        raise OSError("模拟的读取错误")
+    return parse_chunk(task)
+
+
+class TestAggregatesAndIndexes:
+    """测试增量统计和二级索引"""
+
+    @pytest.fixture
+    def analyzer(self):
+        analyzer = LogAnalyzer()
+        analyzer.load_from_text(random_logs(500))
+        return analyzer
+
+    @pytest.mark.parametrize("prefix", ["4", "5", "404", "2", "", "9"])
+    def test_filter_by_status_matches_scan(self, analyzer, prefix):
+        """测试按状态码过滤：结果和顺序与逐条扫描一致"""
+        expected = [r for r in analyzer.records if r["status"].startswith(prefix)]
+        assert analyzer.filter_by_status(prefix) == expected
+
+    def test_filter_by_ip_matches_scan(self, analyzer):
+        """测试按 IP 过滤：结果和顺序与逐条扫描一致"""
+        for ip in analyzer.extract_unique_ips() + ["8.8.8.8"]:
+            assert analyzer.filter_by_ip(ip) == [r for r in analyzer.records if r["ip"] == ip]
+
+    def test_stats_match_scan(self, analyzer):
+        """测试统计结果与逐条扫描一致"""
+        records = analyzer.records
+        assert analyzer.get_stats() == {
+            "total_requests": len(records),
+            "unique_ips": len({r["ip"] for r in records}),
+            "errors": sum(r["status_int"] >= 400 for r in records),
+        }
+        for ip, stats in analyzer.get_ip_stats().items():
+            mine = [r for r in records if r["ip"] == ip]
+            assert stats == {"total": len(mine), "errors": sum(r["status_int"] >= 400 for r in mine)}
+        assert analyzer.get_method_counts() == Counter(r["method"] for r in records)
+        assert sum(n for _, n in analyzer.get_top_paths(100)) == len(records)
+
+    def test_unique_ips_after_more_loads(self, analyzer):
+        """测试再次加载出现新 IP 时，独立 IP 列表随之更新"""
+        before = analyzer.extract_unique_ips()
+        analyzer.load_from_text("1.2.3.4 - GET /api/new 200")
+        assert analyzer.extract_unique_ips() == sorted(before + ["1.2.3.4"])
+
+    def test_queries_without_records(self):
+        """测试不保存记录时也能提取独立 IP 和各类计数"""
+        analyzer = LogAnalyzer(keep_records=False)
+        analyzer.load_from_text(SAMPLE_LOGS)
+        assert analyzer.extract_unique_ips() == ["192.168.1.1", "192.168.1.2", "192.168.1.3"]
+        assert analyzer.get_method_counts() == {"GET": 3, "POST": 1, "DELETE": 1}
+        assert analyzer.get_top_paths(1) == [("/api/users", 1)]
+        with pytest.raises(ValueError):
+            analyzer.filter_by_ip("192.168.1.1")
+
+
+class TestParallelLoad:
+    """测试多进程并行加载"""
+
+    def load_both(self, path, **kwargs):
+        sequential, parallel = LogAnalyzer(), LogAnalyzer()
+        count = sequential.load_from_file(path)
+        assert parallel.load_parallel(path, workers=2, mp_context=FORK, **kwargs) == count
+        return sequential, parallel
+
+    def assert_same(self, sequential, parallel):
+        assert parallel.get_stats() == sequential.get_stats()
+        assert list(parallel.get_ip_stats().items()) == list(sequential.get_ip_stats().items())
+        assert parallel.get_status_counts() == sequential.get_status_counts()
+        assert list(parallel.get_method_counts().items()) == list(sequential.get_method_counts().items())
+        assert parallel.get_top_paths(5) == sequential.get_top_paths(5)
+        assert parallel.records == sequential.records
+        assert parallel.filter_by_status("4") == sequential.filter_by_status("4")
+        assert parallel.last_load["lines"] == sequential.last_load["lines"]
+
+    @needs_fork
+    @pytest.mark.parametrize("chunk_bytes", [1, 37, 256, 1 << 20])
+    def test_same_as_sequential(self, tmp_path, chunk_bytes):
+        """测试不同块大小下，并行结果（包括 IP 出现顺序）与逐行加载相同"""
+        path = tmp_path / "access.log"
+        path.write_text(random_logs(300) + "\n", encoding="utf-8")
+        self.assert_same(*self.load_both(path, chunk_bytes=chunk_bytes))
+
+    @needs_fork
+    def test_awkward_lines(self, tmp_path):
+        """测试 CRLF、单独的 \\r、无法解码的字节、末尾没有换行"""
+        path = tmp_path / "access.log"
+        path.write_bytes(
+            "192.168.1.1 - GET /api/用户 200\r\n".encode("utf-8")
+            + b"\xff\xfe\n192.168.1.2 - GET /a 404\r192.168.1.3 - GET /b 500\n"
+            + b"192.168.1.1 - POST /c 201"
+        )
+        sequential, parallel = self.load_both(path, chunk_bytes=7)
+        assert sequential.get_stats()["total_requests"] == 4
+        self.assert_same(sequential, parallel)
+
+    @needs_fork
+    def test_without_records(self, tmp_path):
+        """测试不保存记录时只合并统计"""
+        path = tmp_path / "access.log"
+        path.write_text(random_logs(200), encoding="utf-8")
+        analyzer = LogAnalyzer(keep_records=False)
+        assert analyzer.load_parallel(path, workers=2, chunk_bytes=100, mp_context=FORK) == 200
+        assert analyzer.records == []
+        expected = LogAnalyzer()
+        expected.load_from_file(path)
+        assert analyzer.get_ip_stats() == expected.get_ip_stats()
+
+    @needs_fork
+    def test_failed_chunk_leaves_data_unchanged(self, tmp_path, monkeypatch, capsys):
+        """测试某一块解析失败时返回 0，已经合并的块不会留在分析器里"""
+        path = tmp_path / "access.log"
+        path.write_text(random_logs(200), encoding="utf-8")
+        analyzer = LogAnalyzer()
+        analyzer.load_from_text(SAMPLE_LOGS)
+        monkeypatch.setattr(log_analyzer, "_parse_chunk", fail_after_first_chunk)
+
+        assert analyzer.load_parallel(path, workers=2, chunk_bytes=500, mp_context=FORK) == 0
+        assert "异常" in capsys.readouterr().out
+        assert (analyzer.get_stats(), analyzer.get_ip_stats()) == expected_stats()
+        assert len(analyzer.records) == 5
+        assert analyzer.filter_by_status("4") == [analyzer.records[2], analyzer.records[3]]
+
+    def test_cli_jobs(self, tmp_path):
+        """测试命令行 --jobs：用平台默认的启动方式运行，统计与逐行加载相同"""
+        path = tmp_path / "access.log"
+        path.write_text(random_logs(300), encoding="utf-8")
+
+        def summary(*args):
+            result = subprocess.run(
+                [sys.executable, str(EXAMPLE), *args, str(path)],
+                capture_output=True, text=True, encoding="utf-8", check=True,
+            )
+            # 第一行是读取行数和耗时，之后是统计
+            return result.stdout.split("\n", 1)[1]
+
+        assert summary("--jobs", "2") == summary()
+
+    @pytest.mark.parametrize("storage", ["dict", "columns"])
+    def test_parent_only_concatenates_chunks(self, tmp_path, monkeypatch, storage):
+        """测试保存记录时，主进程只拼接各块（不逐条登记），耗时远小于子进程的解析"""
+        path = tmp_path / "access.log"
+        path.write_text(random_logs(20_000), encoding="utf-8")
+        chunks = log_analyzer.split_chunks(path, 100_000)
+        assert len(chunks) > 3
+
+        # 在本进程里模拟子进程：解析 + pickle，和主进程的 unpickle + 合并分开计时
+        start = time.perf_counter()
+        payloads = [
+            pickle.dumps(log_analyzer._parse_chunk((str(path), s, e, "utf-8", True, storage)))
+            for s, e in chunks
+        ]
+        worker_seconds = time.perf_counter() - start
+
+        def no_per_record_work(self, record):
+            raise AssertionError("主进程不应逐条登记记录")
+
+        analyzer = LogAnalyzer(storage=storage)
+        staged = analyzer._staging()
+        monkeypatch.setattr(LogAnalyzer, "_index_record", no_per_record_work)
+        start = time.perf_counter()
+        for payload in payloads:
+            aggregator, chunk, _ = pickle.loads(payload)
+            staged.aggregator.merge(aggregator)
+            staged._merge_chunk(chunk)
+        analyzer._commit(staged)
+        parent_seconds = time.perf_counter() - start
+        monkeypatch.undo()
+
+        expected = LogAnalyzer(storage=storage)
+        expected.load_from_file(path)
+        assert list(analyzer.records) == list(expected.records)
+        assert analyzer.filter_by_status("4") == expected.filter_by_status("4")
+        assert analyzer.filter_by_ip("10.0.1.2") == expected.filter_by_ip("10.0.1.2")
+        assert parent_seconds < worker_seconds / 3
+
+    def test_split_chunks(self, tmp_path):
+        """测试切块：首尾相接，每块都从一行的开头开始"""
+        path = tmp_path / "access.log"
+        data = random_logs(100).encode("utf-8")
+        path.write_bytes(data)
+        chunks = log_analyzer.split_chunks(path, 100)
+        assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            assert end == start and data[start - 1:start] == b"\n"
+
+    def test_gzip_falls_back(self, tmp_path):
+        """测试 .gz 文件退回逐行加载"""
+        path = tmp_path / "access.log.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(SAMPLE_LOGS)
+        assert LogAnalyzer().load_parallel(path) == 5
+
+    def test_missing_file(self, tmp_path, capsys):
+        """测试文件不存在（反例）"""
+        assert LogAnalyzer().load_parallel(tmp_path / "missing.log") == 0
+        assert "不存在" in capsys.readouterr().out
+
+
+ODD_LOGS = """\
+999.1.1.1 - GET /odd 200
+010.0.0.1 - GET /leading-zero 404
+0.0.0.0 - POST /zero 500
+255.255.255.255 - GET /max 099
+"""
+
+STORAGES = [
+    "columns",
+    pytest.param("numpy", marks=pytest.mark.skipif(log_analyzer.np is None, reason="未安装 NumPy")),
+]
+
+
+class TestColumnarStorage:
+    """测试按列存放记录"""
+
+    def load_both(self, storage, text):
+        expected, columnar = LogAnalyzer(), LogAnalyzer(storage=storage)
+        expected.load_from_text(text)
+        columnar.load_from_text(text)
+        return expected, columnar
+
+    @pytest.mark.parametrize("storage", STORAGES)
+    def test_records_round_trip(self, storage):
+        """测试逐条取出的记录与 parse_line 的结果相同（包括不合法的 IP）"""
+        expected, columnar = self.load_both(storage, random_logs(300) + "\n" + ODD_LOGS)
+        assert len(columnar.records) == len(expected.records)
+        assert list(columnar.records) == expected.records
+        assert columnar.extract_ips() == expected.extract_ips()
+
+    @pytest.mark.parametrize("storage", STORAGES)
+    def test_filters_and_report(self, storage):
+        """测试过滤和报告在列上完成，结果与字典列表相同"""
+        expected, columnar = self.load_both(storage, random_logs(300) + "\n" + ODD_LOGS)
+        for prefix in ["4", "5", "404", "0", "", "9"]:
+            assert columnar.filter_by_status(prefix) == expected.filter_by_status(prefix)
+        for ip in expected.extract_unique_ips() + ["8.8.8.8", "not-an-ip"]:
+            assert columnar.filter_by_ip(ip) == expected.filter_by_ip(ip)
+        assert columnar.generate_report() == expected.generate_report()
+        assert columnar.generate_report(mask_ips=True) == expected.generate_report(mask_ips=True)
+
+    @needs_fork
+    def test_parallel_load(self, tmp_path):
+        """测试并行加载也能按列存放"""
+        path = tmp_path / "access.log"
+        path.write_text(random_logs(200), encoding="utf-8")
+        expected, columnar = LogAnalyzer(), LogAnalyzer(storage="columns")
+        expected.load_from_file(path)
+        columnar.load_parallel(path, workers=2, chunk_bytes=500, mp_context=FORK)
+        assert list(columnar.records) == expected.records
+
+    def test_extend_remaps_names(self):
+        """测试拼接两段列：方法、路径编号换成本表的编号，不合法 IP 的行号平移"""
+        first, second = log_analyzer.LogColumns(), log_analyzer.LogColumns()
+        first.append(record("10.0.0.1"))
+        second.append(dict(record("999.1.1.1", 404), method="POST", path="/b"))
+        second.append(record("10.0.0.2"))
+        first.extend(second)
+
+        assert list(first) == [
+            record("10.0.0.1"),
+            dict(record("999.1.1.1", 404), method="POST", path="/b"),
+            record("10.0.0.2"),
+        ]
+        assert first.rows_by_ip("999.1.1.1") == [1]
+
+    def test_compact(self):
+        """测试每条记录只占十几个字节"""
+        analyzer = LogAnalyzer(storage="columns")
+        analyzer.load_from_text(random_logs(1000))
+        assert analyzer.records.nbytes() == 1000 * (4 + 2 + 4 + 4)
+
+    def test_ip_to_int(self):
+        """测试 IP 与整数互相转换"""
+        assert log_analyzer.ip_to_int("192.168.1.1") == 0xC0A80101
+        assert log_analyzer.int_to_ip(0xC0A80101) == "192.168.1.1"
+        for bad in ["999.1.1.1", "010.0.0.1", "1.2.3", "a.b.c.d", ""]:
+            assert log_analyzer.ip_to_int(bad) is None
+
+    def test_unknown_storage(self):
+        """测试未知的存放方式（反例）"""
+        with pytest.raises(ValueError):
+            LogAnalyzer(storage="parquet")
+
+    @pytest.mark.skipif(log_analyzer.np is not None, reason="已安装 NumPy")
+    def test_numpy_missing(self):
+        """测试没有 NumPy 时给出安装提示"""
+        with pytest.raises(ImportError, match="numpy"):
+            LogAnalyzer(storage="numpy")
+
+
+def record(ip="10.0.0.1", status=200):
+    return {"ip": ip, "method": "GET", "path": "/", "status": str(status), "status_int": status}
+
+
+class TestSlidingWindow:
+    """测试环形缓冲区实现的滑动窗口"""
+
+    def test_counts_within_window(self):
+        """测试窗口内的请求数、错误率和最多的 IP"""
+        window = log_analyzer.SlidingWindow(60)
+        for t, ip, status in [(0, "a", 200), (10, "b", 500), (20, "b", 404), (30, "c", 200)]:
+            window.add(record(ip, status), now=t)
+        summary = window.summary(now=30, top=2)
+        assert summary["requests"] == 4
+        assert summary["errors"] == 2
+        assert summary["error_rate"] == 0.5
+        assert summary["top_ips"] == [("b", 2), ("a", 1)]
+
+    def test_old_slots_expire(self):
+        """测试滑出窗口的计数被扣除，IP 也不再保留"""
+        window = log_analyzer.SlidingWindow(60)
+        window.add(record("a", 500), now=0)
+        window.add(record("b"), now=30)
+        assert window.summary(now=59)["requests"] == 2
+        summary = window.summary(now=60)
+        assert (summary["requests"], summary["errors"]) == (1, 0)
+        assert dict(window.ip_counts) == {"b": 1}
+        assert window.summary(now=1000) == {
+            "requests": 0, "errors": 0, "error_rate": 0.0, "top_ips": [],
+        }
+
+    def test_memory_is_bounded(self):
+        """测试运行很久后槽数不变，只保留窗口内的 IP"""
+        window = log_analyzer.SlidingWindow(60)
+        for t in range(10_000):
+            window.add(record(f"10.0.{t // 256 % 256}.{t % 256}"), now=t)
+        assert len(window._ips) == 60
+        assert window.requests == 60
+        assert len(window.ip_counts) == 60
+
+    def test_clock_going_backwards(self):
+        """测试时钟回拨时记录计入最新的槽，不会覆盖较新的数据"""
+        window = log_analyzer.SlidingWindow(60)
+        window.add(record(), now=100)
+        window.add(record(), now=40)
+        assert window.summary(now=100)["requests"] == 2
+
+    def test_monitor_windows(self):
+        """测试 LogMonitor 同时维护 1m/5m/1h 三个窗口"""
+        now = [0.0]
+        monitor = log_analyzer.LogMonitor(clock=lambda: now[0])
+        assert monitor.feed("10.0.0.1 - GET /a 500")
+        assert not monitor.feed("这行格式不对")
+        now[0] = 120
+        monitor.feed("10.0.0.2 - GET /b 200")
+        snapshot = monitor.snapshot()
+        assert snapshot["1m"]["requests"] == 1
+        assert snapshot["5m"]["requests"] == 2
+        assert snapshot["5m"]["error_rate"] == 0.5
+        assert snapshot["1h"]["top_ips"] == [("10.0.0.1", 1), ("10.0.0.2", 1)]
+        assert snapshot["1h"]["requests"] == 2
+
+        now[0] = 4000
+        assert monitor.snapshot()["1h"]["requests"] == 0
+        assert monitor.windows["1h"].ip_counts == {}
+
+
+def read_available(lines):
+    """从 follow_lines 取出当前能读到的所有行（遇到 None 即停）"""
+    result = []
+    for line in lines:
+        if line is None:
+            return result
+        result.append(line)
+
+
+class TestFollowLines:
+    """测试跟踪增长、轮转、截断的日志文件"""
+
+    def test_only_new_lines(self, tmp_path):
+        """测试默认只读之后追加的行，写了一半的行等换行符到了再产出"""
+        path = tmp_path / "access.log"
+        path.write_text("old line\n")
+        lines = log_analyzer.follow_lines(path, poll_interval=0)
+        assert read_available(lines) == []
+
+        with open(path, "a") as f:
+            f.write("first\nsec")
+        assert read_available(lines) == ["first\n"]
+        with open(path, "a") as f:
+            f.write("ond\n")
+        assert read_available(lines) == ["second\n"]
+
+    def test_rotation(self, tmp_path):
+        """测试日志轮转：读完旧文件后从头读新文件"""
+        path = tmp_path / "access.log"
+        path.write_text("")
+        lines = log_analyzer.follow_lines(path, poll_interval=0)
+        assert read_available(lines) == []
+
+        with open(path, "a") as f:
+            f.write("before rotation\n")
+        os.rename(path, tmp_path / "access.log.1")
+        path.write_text("after rotation\n")
+        assert read_available(lines) == ["before rotation\n", "after rotation\n"]
+
+    def test_rotation_drains_old_file(self, tmp_path, monkeypatch):
+        """测试轮转前最后写进旧文件的行（读到末尾之后才写入）不会丢"""
+        path = tmp_path / "access.log"
+        rotated = tmp_path / "access.log.1"
+        path.write_text("")
+        lines = log_analyzer.follow_lines(path, poll_interval=0)
+        assert read_available(lines) == []
+
+        os.rename(path, rotated)
+        path.write_text("after rotation\n")
+        real_stat = os.stat
+
+        def stat_after_late_write(file_path, *args, **kwargs):
+            # 在 follow_lines 读到旧文件末尾、检查是否轮转的那一刻，旧文件又写入了一行
+            monkeypatch.setattr(os, "stat", real_stat)
+            with open(rotated, "a") as f:
+                f.write("late line\n")
+            return real_stat(file_path, *args, **kwargs)
+
+        monkeypatch.setattr(os, "stat", stat_after_late_write)
+        assert read_available(lines) == ["late line\n", "after rotation\n"]
+
+    def test_truncation(self, tmp_path):
+        """测试截断：回到文件开头"""
+        path = tmp_path / "access.log"
+        path.write_text("a long line before truncation\n")
+        lines = log_analyzer.follow_lines(path, poll_interval=0, from_start=True)
+        assert read_available(lines) == ["a long line before truncation\n"]
+
+        with open(path, "w") as f:
+            f.write("new\n")
+        assert read_available(lines) == ["new\n"]
+
+    def test_file_appears_later(self, tmp_path):
+        """测试文件暂时不存在：出现后从头读"""
+        path = tmp_path / "access.log"
+        lines = log_analyzer.follow_lines(path, poll_interval=0)
+        assert read_available(lines) == []
+        path.write_text("hello\n")
+        assert read_available(lines) == ["hello\n"]
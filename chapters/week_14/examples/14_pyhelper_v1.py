@@ -15,19 +15,26 @@ PyHelper v1.0.0 - 命令行学习助手（最终发布版本）
 
 功能清单：
 - add: 添加学习笔记
+- import: 批量导入笔记（JSON Lines / JSON 数组，一次写入）
+- status: 修改笔记状态（草稿/已发布/已归档）
 - list: 列出笔记（支持过滤）
 - search: 搜索笔记（关键词）
-- export: 导出笔记（JSON/CSV/Markdown）
-- stats: 统计信息
+- export: 导出笔记（JSON/JSON Lines/CSV/Markdown，流式写出，可 gzip 压缩）
+- stats: 统计信息（可按天/周/月统计新增笔记）
+- migrate: 把笔记迁移到 SQLite（之后用 --backend sqlite）
 - plan generate: 生成学习计划（agent team）
 - plan show: 显示学习计划
 
 运行方式：
     python3 chapters/week_14/examples/14_pyhelper_v1.py add "今天学了代码收敛"
+    python3 chapters/week_14/examples/14_pyhelper_v1.py import lectures.jsonl
+    python3 chapters/week_14/examples/14_pyhelper_v1.py status 20260101-120000-0000 published
     python3 chapters/week_14/examples/14_pyhelper_v1.py list
     python3 chapters/week_14/examples/14_pyhelper_v1.py search "代码"
     python3 chapters/week_14/examples/14_pyhelper_v1.py export --format json
     python3 chapters/week_14/examples/14_pyhelper_v1.py stats
+    python3 chapters/week_14/examples/14_pyhelper_v1.py migrate
+    python3 chapters/week_14/examples/14_pyhelper_v1.py --backend sqlite search "代码"
     python3 chapters/week_14/examples/14_pyhelper_v1.py plan generate
 
 预期输出：
@@ -36,17 +43,21 @@ PyHelper v1.0.0 - 命令行学习助手（最终发布版本）
     - 返回正确的退出码（0=成功，1=失败）
 """
 
+# 启动速度：这里只导入每个子命令都要用的模块。
+# csv/gzip（export）、re（plan generate）、datetime（add）、倒排索引（search）、
+# 导入/导出模块（import/export）、sqlite3（--backend sqlite）都在用到它们的函数里才导入，
+# 这样在命令行提示符、编辑器钩子里调用 `pyhelper list` 时不必为它们付出导入时间。
 import argparse
-import csv
 import json
 import logging
-import re
+import os
 import sys
 from dataclasses import dataclass, asdict
-from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from pyhelper.storage import NoteStore
 
 
 # =====================
@@ -60,9 +71,13 @@ class NoteStatus(Enum):
     ARCHIVED = "archived"
 
 
-@dataclass
+@dataclass(slots=True)
 class Note:
-    """学习笔记（dataclass 数据模型）"""
+    """学习笔记（dataclass 数据模型）
+
+    slots=True：实例不带 __dict__，单个 Note 更省内存。
+    需要扫描大量笔记时用 pyhelper/note_table.py 的列式 NoteTable，只在需要时创建 Note。
+    """
     id: str
     content: str
     tags: List[str]
@@ -86,7 +101,7 @@ class Note:
             id=data["id"],
             content=data["content"],
             tags=data.get("tags", []),
-            created_at=data.get("created_at", datetime.now().strftime("%Y-%m-%d")),
+            created_at=data["created_at"] if "created_at" in data else today(),
             status=NoteStatus(data.get("status", "draft"))
         )
 
@@ -112,61 +127,235 @@ class StudyPlan:
 
 LOG_DIR = Path.home() / ".pyhelper"
 LOG_FILE = LOG_DIR / "pyhelper.log"
-DATA_FILE = LOG_DIR / "notes.json"
+DATA_FILE = LOG_DIR / "notes.json"  # 旧版本的存储文件，第一次使用时自动迁移
+STORE_FILE = LOG_DIR / NoteStore.LOG_NAME
+DB_FILE = LOG_DIR / "notes.db"  # --backend sqlite 使用的数据库
+INDEX_FILE = LOG_DIR / "search_index.json"  # JSON 后端的倒排索引
+STATS_FILE = LOG_DIR / "stats.json"  # JSON 后端的统计汇总
+ID_STATE_FILE = LOG_DIR / "ids.state"  # ID 生成器的计数器（带文件锁）
 PLAN_FILE = LOG_DIR / "plan.json"
 
-# 确保目录存在
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    filename=LOG_FILE,
-    encoding="utf-8"
-)
 logger = logging.getLogger(__name__)
 
 
+def setup_logging(verbose: bool = False) -> None:
+    """配置日志（main() 解析完参数后才调用，导入本模块不会创建目录或打开文件）
+
+    FileHandler 使用 delay=True：直到写出第一条日志时才打开日志文件，
+    `--help` 或参数错误这类情况完全不碰 ~/.pyhelper。
+    """
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler(LOG_FILE, encoding="utf-8", delay=True)]
+    )
+
+
 # =====================
 # 数据存储（Week 10）
 # =====================
 
-def load_notes() -> List[Note]:
-    """加载笔记列表（JSON 反序列化）"""
-    if not DATA_FILE.exists():
-        logger.info("数据文件不存在，返回空列表")
-        return []
+# 存储后端：json（追加写日志，默认）或 sqlite（带全文索引，适合大量笔记）
+BACKENDS = ("json", "sqlite")
+_backend = os.environ.get("PYHELPER_BACKEND", "json")
+_store = None
+
+
+def open_store(backend: str):
+    """打开指定后端的笔记存储
+
+    两种后端接口一致：append/append_many/get/update/delete/iter_notes/replace_all
+    """
+    if backend == "sqlite":
+        # 只有选用 SQLite 后端时才导入 sqlite3
+        from pyhelper.sqlite_store import SQLiteNoteStore
+        return SQLiteNoteStore(DB_FILE)
+    return NoteStore(LOG_DIR)
+
+
+def set_backend(backend: str) -> None:
+    """切换存储后端（由 --backend 参数调用）"""
+    global _backend, _store
+    _backend = backend
+    _store = None
+
+
+def get_store():
+    """获取当前后端的笔记存储"""
+    global _store
+    if _store is None:
+        _store = open_store(_backend)
+    return _store
+
+
+_search_index = None
+
+
+def get_search_index():
+    """获取 JSON 后端的倒排索引（见 pyhelper/search_index.py）"""
+    global _search_index
+    if _search_index is None:
+        # 只有 search 需要倒排索引（导入时要编译分词正则）
+        from pyhelper.search_index import SearchIndex
+        _search_index = SearchIndex(INDEX_FILE)
+        _search_index.load()
+    return _search_index
+
+
+def _sync_search_index() -> None:
+    """本进程已加载倒排索引时，把刚写入的笔记增量同步进去
+
+    没加载时什么也不做：下次搜索会从日志追上来，添加笔记仍然只写一行。
+    """
+    store = get_store()
+    if _search_index is not None and isinstance(store, NoteStore):
+        _search_index.sync(store)
+
+
+def iter_all_notes() -> Iterator[Note]:
+    """按添加顺序逐条产出笔记（不一次性载入，供导出等流式处理使用）"""
+    for item in get_store().iter_notes():
+        yield Note.from_dict(item)
+
+
+_stats_rollup = None
+
+
+def get_stats_rollup():
+    """获取 JSON 后端的统计汇总（见 pyhelper/stats.py）"""
+    global _stats_rollup
+    if _stats_rollup is None:
+        from pyhelper.stats import StatsRollup
+        _stats_rollup = StatsRollup(STATS_FILE)
+        _stats_rollup.load()
+    return _stats_rollup
+
+
+def _update_stats_rollup(before, expected: int, replaced: Optional[Dict[str, dict]] = None) -> None:
+    """把刚写入的记录计入统计汇总
+
+    只有写入前汇总就是最新的、并且这段日志里恰好是本次写入的 expected 条记录时才更新；
+    否则（汇总还没建立、其他进程同时写入）什么也不做，下次 stats 会重新扫描。
+
+    Args:
+        before: 写入前的日志位置
+        expected: 本次写入的记录数
+        replaced: 被修改的笔记 ID → 修改前的版本
+    """
+    store = get_store()
+    if not isinstance(store, NoteStore) or not STATS_FILE.exists():
+        return
+    rollup = get_stats_rollup()
+    if rollup.position != tuple(before):
+        return
+    changes = store.changes_since(before)
+    if changes is None or len(changes[0]) != expected:
+        return
 
+    replaced = replaced or {}
+    records, position = changes
+    for record in records:
+        note_id = record["note"]["id"] if record["op"] == "put" else record["id"]
+        # 先加新版本再扣旧版本：没变的标签计数不会中途归零，次数相同的标签保持原来的先后顺序
+        if record["op"] == "put":
+            rollup.add(record["note"])
+        if note_id in replaced:
+            rollup.remove(replaced[note_id])
+    rollup.position = position
+    rollup.save()
+
+
+def _log_position():
+    """JSON 后端当前的日志位置（SQLite 后端返回 None）"""
+    store = get_store()
+    return store.position() if isinstance(store, NoteStore) else None
+
+
+def load_notes() -> List[Note]:
+    """加载笔记列表（按添加顺序）"""
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        notes = [Note.from_dict(item) for item in data]
+        notes = [Note.from_dict(item) for item in get_store().iter_notes()]
         logger.info(f"加载了 {len(notes)} 条笔记")
         return notes
-    except json.JSONDecodeError as e:
-        logger.error(f"数据文件格式错误：{e}")
-        return []
     except Exception as e:
         logger.error(f"加载数据失败：{e}")
         return []
 
 
+def load_note_table():
+    """把笔记逐条读进列式的 NoteTable（见 pyhelper/note_table.py）
+
+    按状态过滤只需要扫描状态列，不必为每条笔记创建 Note 对象。
+    """
+    from pyhelper.note_table import NoteTable
+    table = NoteTable.from_notes(get_store().iter_notes())
+    logger.info(f"加载了 {len(table)} 条笔记（列式）")
+    return table
+
+
 def save_notes(notes: List[Note]) -> None:
-    """保存笔记列表（JSON 序列化）"""
+    """整体保存笔记列表（重写日志；单条添加请用 append_note）"""
     try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            data = [note.to_dict() for note in notes]
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        logger.info(f"保存了 {len(notes)} 条笔记")
+        count = get_store().replace_all(note.to_dict() for note in notes)
+        logger.info(f"保存了 {count} 条笔记")
     except Exception as e:
         logger.error(f"保存数据失败：{e}")
         raise
 
 
+def append_note(note: Note) -> None:
+    """追加一条笔记：只写日志末尾，不读取已有笔记（统计汇总增量加一）"""
+    before = _log_position()
+    get_store().append(note.to_dict())
+    _sync_search_index()
+    if before is not None:
+        _update_stats_rollup(before, 1)
+
+
+def update_note_status(note_id: str, status: NoteStatus) -> Optional[Note]:
+    """修改笔记状态：按 ID 查索引，追加新版本
+
+    Returns:
+        修改后的笔记；笔记不存在时返回 None
+    """
+    before = _log_position()
+    old = get_store().get(note_id) if before is not None else None
+    data = get_store().update(note_id, status=status.value)
+    _sync_search_index()
+    if data and old is not None:
+        _update_stats_rollup(before, 1, {note_id: old})
+    return Note.from_dict(data) if data else None
+
+
+def now():
+    """当前时间（datetime 在第一次用到时才导入）"""
+    from datetime import datetime
+    return datetime.now()
+
+
+def today() -> str:
+    """今天的日期（YYYY-MM-DD）"""
+    return now().strftime("%Y-%m-%d")
+
+
+# ID 方案：timestamp（时间 + 跨进程计数器，默认）或 ulid，见 pyhelper/ids.py
+ID_SCHEME = os.environ.get("PYHELPER_ID_SCHEME", "timestamp")
+_id_generator = None
+
+
+def get_id_generator():
+    """获取笔记 ID 生成器（同一秒、多个进程同时添加也不会重复）"""
+    global _id_generator
+    if _id_generator is None:
+        from pyhelper.ids import make_id_generator
+        _id_generator = make_id_generator(ID_SCHEME, ID_STATE_FILE)
+    return _id_generator
+
+
 def generate_id() -> str:
-    """生成笔记 ID（基于时间戳）"""
-    return datetime.now().strftime("%Y%m%d-%H%M%S")
+    """生成笔记 ID（唯一且递增，例如 20260201-090000-0000）"""
+    return get_id_generator().next_id()
 
 
 # =====================
@@ -178,6 +367,8 @@ class ReaderAgent:
 
     def read_note(self, file_path: Path) -> Optional[Dict]:
         """读取笔记文件并提取关键信息"""
+        import re
+
         logger.info(f"读取笔记：{file_path}")
 
         try:
@@ -315,15 +506,12 @@ def generate_study_plans(notes_dir: str, output: str) -> int:
             logger.error(f"处理 {note_file.name} 失败：{e}")
             continue
 
-    # 导出为 JSON
-    output_path = Path(output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # 导出为 JSON（先写临时文件再重命名：写到一半崩溃不会留下半个 plan.json）
+    from pyhelper.locking import atomic_write_text
 
+    output_path = Path(output)
     plans_dict = [plan.to_dict() for plan in plans]
-    output_path.write_text(
-        json.dumps(plans_dict, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+    atomic_write_text(output_path, json.dumps(plans_dict, ensure_ascii=False, indent=2))
 
     logger.info(f"✓ 学习计划已生成：{output_path}")
     logger.info(f"  共 {len(plans)} 周")
@@ -340,22 +528,200 @@ def generate_study_plans(notes_dir: str, output: str) -> int:
 # 核心功能函数
 # =====================
 
-def add_note(notes: List[Note], content: str, tags: List[str] = None) -> Note:
-    """添加学习笔记"""
-    note = Note(
+def create_note(content: str, tags: List[str] = None) -> Note:
+    """创建一条草稿笔记"""
+    return Note(
         id=generate_id(),
         content=content,
         tags=tags or [],
-        created_at=datetime.now().strftime("%Y-%m-%d"),
+        created_at=today(),
         status=NoteStatus.DRAFT
     )
+
+
+def add_note(notes: List[Note], content: str, tags: List[str] = None) -> Note:
+    """添加学习笔记"""
+    note = create_note(content, tags)
     notes.append(note)
     return note
 
 
-def filter_notes_by_status(notes: List[Note], status: NoteStatus) -> List[Note]:
-    """按状态过滤笔记"""
-    return [note for note in notes if note.status == status]
+def validate_note_record(data, new_id: Callable[[], str]) -> Note:
+    """把导入的一条原始记录校验成 Note（缺少 id/created_at/status 时自动补齐）
+
+    Args:
+        data: 原始记录
+        new_id: 记录没有 id 时调用它生成一个
+
+    Raises:
+        ValueError: 记录不是对象、没有内容或字段类型不对
+    """
+    if not isinstance(data, dict):
+        raise ValueError("不是 JSON 对象")
+    content = data.get("content")
+    if not isinstance(content, str) or not content.strip():
+        raise ValueError("缺少笔记内容")
+    tags = data.get("tags", [])
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError("tags 必须是字符串列表")
+    for field in ("id", "created_at"):
+        if field in data and not isinstance(data[field], str):
+            raise ValueError(f"{field} 必须是字符串")
+    return Note.from_dict(dict(data, id=data.get("id") or new_id()))
+
+
+def _content_key(content: str) -> bytes:
+    """内容去重用的摘要（忽略首尾空白）"""
+    import hashlib
+    return hashlib.sha1(content.strip().encode("utf-8")).digest()
+
+
+def import_notes(records) -> Dict[str, int]:
+    """批量导入笔记：逐条校验、去重，整批一次写入
+
+    ID 已存在或内容与已有笔记相同的记录视为重复并跳过（日志只记一条汇总，
+    逐条明细是 DEBUG 级别）；无效记录记一条警告并跳过，不影响其余记录。
+    整批通过 store.append_many 写入：JSON 后端只 fsync 一次，
+    SQLite 后端只用一个事务，中途失败不会留下导入了一半的数据。
+
+    Args:
+        records: pyhelper.importer.iter_records() 产出的 (位置, 数据, 错误)
+
+    Returns:
+        {"added": 导入数, "duplicates": 重复数, "invalid": 无效数}
+    """
+    store = get_store()
+    seen_contents = {_content_key(item["content"]) for item in store.iter_notes()}
+    seen_ids = set()
+    report = {"added": 0, "duplicates": 0, "invalid": 0}
+    # 没有 ID 的记录按需分配，每次向生成器预留一批，不必每条都加锁
+    from pyhelper.ids import iter_ids
+    new_ids = iter_ids(get_id_generator())
+
+    def valid_notes():
+        for where, data, error in records:
+            if error is None:
+                try:
+                    note = validate_note_record(data, lambda: next(new_ids))
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                logger.warning(f"跳过{where}：{error}")
+                report["invalid"] += 1
+                continue
+
+            key = _content_key(note.content)
+            if note.id in seen_ids or note.id in store or key in seen_contents:
+                logger.debug(f"跳过{where}：重复的笔记 {note.id}")
+                report["duplicates"] += 1
+                continue
+            seen_ids.add(note.id)
+            seen_contents.add(key)
+            yield note.to_dict()
+
+    before = _log_position()
+    report["added"] = store.append_many(valid_notes())
+    if report["duplicates"]:
+        logger.info(f"导入时跳过 {report['duplicates']} 条重复的笔记")
+    _sync_search_index()
+    if before is not None and report["added"]:
+        _update_stats_rollup(before, report["added"])
+    return report
+
+
+def filter_notes_by_status(notes, status: NoteStatus) -> List[Note]:
+    """按状态过滤笔记
+
+    notes 可以是 Note 列表，也可以是 NoteTable：后者直接在状态列上过滤，
+    只为命中的笔记创建 Note。
+    """
+    if isinstance(notes, list):
+        return [note for note in notes if note.status == status]
+    return [Note.from_dict(notes[row]) for row in notes.indices_by_status(status.value)]
+
+
+def list_notes(status: Optional[NoteStatus] = None) -> List[Note]:
+    """列出笔记；SQLite 后端按状态过滤时走索引"""
+    store = get_store()
+    if status is None:
+        return load_notes()
+    if isinstance(store, NoteStore):
+        return filter_notes_by_status(load_note_table(), status)
+    return [Note.from_dict(item) for item in store.iter_by_status(status.value)]
+
+
+def find_notes(keyword: str) -> List[Note]:
+    """搜索笔记；SQLite 后端使用全文索引，JSON 后端使用倒排索引
+
+    关键词按不区分大小写的子串匹配。JSON 后端还支持空格分隔表示 AND、
+    OR 连接多组条件；SQLite 后端把整个关键词当作一个子串。
+    倒排索引过期（日志被压缩/替换、索引文件丢失）时，
+    本次回退到逐条扫描，并顺便重建索引。
+    """
+    store = get_store()
+    if not isinstance(store, NoteStore):
+        return [Note.from_dict(item) for item in store.search(keyword)]
+
+    index = get_search_index()
+    if index.sync(store):
+        candidates = (store.get(note_id) for note_id in index.search(keyword))
+        return [
+            Note.from_dict(item) for item in candidates
+            if item is not None and index.matches(keyword, item)
+        ]
+
+    logger.info("搜索索引已过期，逐条扫描并重建索引")
+    # 持锁读取位置和笔记：别的进程的批次写到一半时，位置会落在批次中间，
+    # 之后从这里增量同步就会漏掉整批；持锁会等这一批写完
+    with store.locked():
+        position = store.position()
+        notes = list(store.iter_notes())
+    index.rebuild(notes, position)
+    return [Note.from_dict(item) for item in notes if index.matches(keyword, item)]
+
+
+def collect_stats() -> dict:
+    """统计笔记数量和热门标签
+
+    JSON 后端使用持久化的统计汇总（stats.json），SQLite 后端直接在数据库里聚合。
+    """
+    store = get_store()
+    if not isinstance(store, NoteStore):
+        counts = store.count_by_status()
+        return {
+            "total": sum(counts.values()),
+            "draft": counts.get(NoteStatus.DRAFT.value, 0),
+            "published": counts.get(NoteStatus.PUBLISHED.value, 0),
+            "archived": counts.get(NoteStatus.ARCHIVED.value, 0),
+            "top_tags": dict(store.top_tags(5)),
+        }
+
+    return fresh_stats_rollup().summary(5)
+
+
+def fresh_stats_rollup():
+    """与日志一致的统计汇总：位置对得上时直接使用，否则一遍扫描重建"""
+    store = get_store()
+    rollup = get_stats_rollup()
+    position = store.position()
+    if rollup.position != position:
+        logger.info("统计汇总已过期，重新扫描笔记")
+        rollup.rebuild(store.iter_notes(), position)
+    return rollup
+
+
+def collect_buckets(period: str) -> List[tuple]:
+    """按天/周/月统计新增笔记数
+
+    Returns:
+        [(时间段, 笔记数), ...]，按时间先后排序
+    """
+    from pyhelper.stats import bucket_counts
+
+    store = get_store()
+    if isinstance(store, NoteStore):
+        return fresh_stats_rollup().buckets(period)
+    return bucket_counts(store.count_by_day(), period)
 
 
 def search_notes(notes: List[Note], keyword: str) -> List[Note]:
@@ -370,43 +736,23 @@ def search_notes(notes: List[Note], keyword: str) -> List[Note]:
     return results
 
 
-def export_notes(notes: List[Note], output: str, format: str) -> None:
-    """导出笔记"""
-    output_path = Path(output)
+def export_notes(notes: Iterable[Note], output: str, format: str, compress: bool = False) -> int:
+    """流式导出笔记：逐条写出，不需要把全部笔记放进内存
+
+    Args:
+        notes: 笔记迭代器（可以直接来自存储，见 iter_all_notes）
+        output: 输出文件
+        format: json/jsonl/csv/markdown
+        compress: True 时写 gzip 压缩文件
 
-    if format == "json":
-        with open(output_path, "w", encoding="utf-8") as f:
-            data = [note.to_dict() for note in notes]
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    elif format == "csv":
-        with open(output_path, "w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["ID", "Content", "Tags", "Created", "Status"])
-            for note in notes:
-                writer.writerow([
-                    note.id,
-                    note.content,
-                    ",".join(note.tags),
-                    note.created_at,
-                    note.status.value
-                ])
-    elif format == "markdown":
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("# 学习笔记\n\n")
-            for note in notes:
-                status_icon = {
-                    NoteStatus.DRAFT: "○",
-                    NoteStatus.PUBLISHED: "✓",
-                    NoteStatus.ARCHIVED: "◉"
-                }[note.status]
-
-                f.write(f"## {status_icon} {note.content[:50]}...\n\n")
-                f.write(f"**ID**: {note.id}\n\n")
-                f.write(f"**创建时间**: {note.created_at}\n\n")
-                if note.tags:
-                    f.write(f"**标签**: {', '.join(note.tags)}\n\n")
-                f.write(f"**内容**: {note.content}\n\n")
-                f.write("---\n\n")
+    Returns:
+        导出的笔记数量
+    """
+    from pyhelper.exporter import WRITERS, open_output
+
+    newline = "" if format == "csv" else None
+    with open_output(Path(output), compress, newline) as f:
+        return WRITERS[format]((note.to_dict() for note in notes), f)
 
 
 # =====================
@@ -414,13 +760,18 @@ def export_notes(notes: List[Note], output: str, format: str) -> None:
 # =====================
 
 def cmd_add(args):
-    """添加学习笔记"""
+    """添加学习笔记（--from-file 时批量导入）"""
+    if (args.content is None) == (args.from_file is None):
+        print("错误：请提供笔记内容或 --from-file（二选一）")
+        return 1
+    if args.from_file is not None:
+        return run_import(args.from_file, "auto")
+
     logger.info(f"添加笔记：{args.content}")
 
     try:
-        notes = load_notes()
-        note = add_note(notes, args.content, args.tags)
-        save_notes(notes)
+        note = create_note(args.content, args.tags)
+        append_note(note)
 
         logger.info(f"笔记添加成功：{note.id}")
         print(f"✓ 笔记已添加：{note.id}")
@@ -432,18 +783,72 @@ def cmd_add(args):
         return 1
 
 
+def run_import(path: str, fmt: str) -> int:
+    """从文件（或标准输入）批量导入笔记，并报告吞吐量"""
+    from time import perf_counter
+    from pyhelper.importer import iter_records, open_source
+
+    logger.info(f"批量导入笔记：{path}")
+
+    try:
+        start = perf_counter()
+        with open_source(path) as f:
+            report = import_notes(iter_records(f, fmt))
+        elapsed = perf_counter() - start
+
+        rate = report["added"] / elapsed if elapsed > 0 else 0
+        logger.info(f"导入完成：{report}，耗时 {elapsed:.2f} 秒")
+        print(f"✓ 已导入 {report['added']} 条笔记（{elapsed:.2f} 秒，{rate:.0f} 条/秒）")
+        if report["duplicates"]:
+            print(f"  跳过重复：{report['duplicates']} 条")
+        if report["invalid"]:
+            print(f"  跳过无效：{report['invalid']} 条（详见日志 {LOG_FILE}）")
+        return 0
+    except FileNotFoundError:
+        print(f"错误：文件不存在 - {path}")
+        return 1
+    except Exception as e:
+        logger.error(f"批量导入失败：{e}")
+        print(f"错误：批量导入失败 - {e}")
+        return 1
+
+
+def cmd_import(args):
+    """批量导入笔记（JSON Lines 或 JSON 数组）"""
+    return run_import(args.file, args.format)
+
+
+def cmd_status(args):
+    """修改笔记状态"""
+    logger.info(f"修改笔记状态：{args.id} → {args.status}")
+
+    try:
+        note = update_note_status(args.id, NoteStatus(args.status))
+        if note is None:
+            print(f"错误：未找到笔记 {args.id}")
+            return 1
+
+        logger.info(f"笔记状态已修改：{note.id}")
+        print(f"✓ 笔记 {note.id} 状态已改为 {note.status.value}")
+        return 0
+    except Exception as e:
+        logger.error(f"修改笔记状态失败：{e}")
+        print(f"错误：修改笔记状态失败 - {e}")
+        return 1
+
+
 def cmd_list(args):
     """列出笔记"""
     logger.info("列出笔记")
 
     try:
-        notes = load_notes()
-
         # 过滤
         if args.pending:
-            notes = filter_notes_by_status(notes, NoteStatus.DRAFT)
+            notes = list_notes(NoteStatus.DRAFT)
         elif args.published:
-            notes = filter_notes_by_status(notes, NoteStatus.PUBLISHED)
+            notes = list_notes(NoteStatus.PUBLISHED)
+        else:
+            notes = list_notes()
 
         # 显示
         if not notes:
@@ -477,8 +882,7 @@ def cmd_search(args):
     logger.info(f"搜索笔记：{args.keyword}")
 
     try:
-        notes = load_notes()
-        results = search_notes(notes, args.keyword)
+        results = find_notes(args.keyword)
 
         if not results:
             print(f"没有找到包含 '{args.keyword}' 的笔记")
@@ -502,12 +906,15 @@ def cmd_export(args):
     """导出笔记"""
     logger.info(f"导出笔记：{args.format}")
 
+    output = args.output
+    if args.compress and not output.endswith(".gz"):
+        output += ".gz"
+
     try:
-        notes = load_notes()
-        export_notes(notes, args.output, args.format)
+        count = export_notes(iter_all_notes(), output, args.format, args.compress)
 
-        logger.info(f"笔记已导出到 {args.output}")
-        print(f"✓ 已导出 {len(notes)} 条笔记到 {args.output}")
+        logger.info(f"已导出 {count} 条笔记到 {output}")
+        print(f"✓ 已导出 {count} 条笔记到 {output}")
         return 0
     except Exception as e:
         logger.error(f"导出笔记失败：{e}")
@@ -515,44 +922,37 @@ def cmd_export(args):
         return 1
 
 
+PERIOD_NAMES = {"day": "天", "week": "周", "month": "月"}
+
+
 def cmd_stats(args):
     """显示统计信息"""
     logger.info("生成统计")
 
     try:
-        notes = load_notes()
-
-        total = len(notes)
-        draft = len(filter_notes_by_status(notes, NoteStatus.DRAFT))
-        published = len(filter_notes_by_status(notes, NoteStatus.PUBLISHED))
-        archived = len(filter_notes_by_status(notes, NoteStatus.ARCHIVED))
-
-        # 统计标签
-        all_tags = {}
-        for note in notes:
-            for tag in note.tags:
-                all_tags[tag] = all_tags.get(tag, 0) + 1
+        stats = collect_stats()
 
         print("PyHelper 统计")
         print("=" * 60)
-        print(f"总笔记数：{total}")
-        print(f"  - 草稿：{draft}")
-        print(f"  - 已发布：{published}")
-        print(f"  - 已归档：{archived}")
+        print(f"总笔记数：{stats['total']}")
+        print(f"  - 草稿：{stats['draft']}")
+        print(f"  - 已发布：{stats['published']}")
+        print(f"  - 已归档：{stats['archived']}")
 
-        if all_tags:
+        if stats["top_tags"]:
             print(f"\n热门标签：")
-            for tag, count in sorted(all_tags.items(), key=lambda x: -x[1])[:5]:
+            for tag, count in stats["top_tags"].items():
                 print(f"  - {tag}: {count}")
 
+        if args.by:
+            stats["by_" + args.by] = dict(collect_buckets(args.by))
+            print(f"\n新增笔记（按{PERIOD_NAMES[args.by]}）：")
+            for period, count in stats["by_" + args.by].items():
+                print(f"  - {period}: {count}")
+            if not stats["by_" + args.by]:
+                print("  （没有笔记）")
+
         if args.json:
-            stats = {
-                "total": total,
-                "draft": draft,
-                "published": published,
-                "archived": archived,
-                "top_tags": dict(sorted(all_tags.items(), key=lambda x: -x[1])[:5])
-            }
             print("\nJSON 格式：")
             print(json.dumps(stats, ensure_ascii=False, indent=2))
 
@@ -563,6 +963,25 @@ def cmd_stats(args):
         return 1
 
 
+def cmd_migrate(args):
+    """把 JSON 存储中的笔记迁移到 SQLite 数据库"""
+    logger.info(f"迁移笔记：json → sqlite（{DB_FILE}）")
+
+    try:
+        source = open_store("json")
+        target = open_store("sqlite")
+        count = target.append_many(source.iter_notes())
+
+        logger.info(f"已迁移 {count} 条笔记到 {DB_FILE}")
+        print(f"✓ 已迁移 {count} 条笔记到 {DB_FILE}")
+        print("  之后使用 --backend sqlite（或设置 PYHELPER_BACKEND=sqlite）读写该数据库")
+        return 0
+    except Exception as e:
+        logger.error(f"迁移笔记失败：{e}")
+        print(f"错误：迁移笔记失败 - {e}")
+        return 1
+
+
 def cmd_plan_generate(args):
     """生成学习计划"""
     return generate_study_plans(args.notes_dir, args.output)
@@ -627,16 +1046,48 @@ def main():
         action="store_true",
         help="显示详细日志"
     )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=_backend,
+        help="存储后端（默认 json，可用环境变量 PYHELPER_BACKEND 修改）"
+    )
 
     # 创建子命令
     subparsers = parser.add_subparsers(dest="command", help="可用子命令")
 
     # add 子命令
     add_parser = subparsers.add_parser("add", help="添加学习笔记")
-    add_parser.add_argument("content", help="笔记内容")
+    add_parser.add_argument("content", nargs="?", help="笔记内容")
     add_parser.add_argument("--tags", nargs="*", help="标签（多个）")
+    add_parser.add_argument(
+        "--from-file",
+        metavar="PATH",
+        help="从文件批量添加（同 import 子命令）"
+    )
     add_parser.set_defaults(func=cmd_add)
 
+    # import 子命令
+    import_parser = subparsers.add_parser("import", help="批量导入笔记")
+    import_parser.add_argument("file", help="JSON Lines 或 JSON 数组文件（- 表示标准输入）")
+    import_parser.add_argument(
+        "--format",
+        choices=["auto", "json", "jsonl"],
+        default="auto",
+        help="输入格式（默认根据内容自动判断）"
+    )
+    import_parser.set_defaults(func=cmd_import)
+
+    # status 子命令
+    status_parser = subparsers.add_parser("status", help="修改笔记状态")
+    status_parser.add_argument("id", help="笔记 ID")
+    status_parser.add_argument(
+        "status",
+        choices=[s.value for s in NoteStatus],
+        help="新状态"
+    )
+    status_parser.set_defaults(func=cmd_status)
+
     # list 子命令
     list_parser = subparsers.add_parser("list", help="列出笔记")
     group = list_parser.add_mutually_exclusive_group()
@@ -646,7 +1097,10 @@ def main():
 
     # search 子命令
     search_parser = subparsers.add_parser("search", help="搜索笔记")
-    search_parser.add_argument("keyword", help="搜索关键词")
+    search_parser.add_argument(
+        "keyword",
+        help="搜索关键词（按子串匹配；JSON 后端中空格分隔表示同时包含，OR 表示任一）"
+    )
     search_parser.set_defaults(func=cmd_search)
 
     # export 子命令
@@ -654,17 +1108,31 @@ def main():
     export_parser.add_argument("--output", "-o", default="backup.json", help="输出文件")
     export_parser.add_argument(
         "--format",
-        choices=["json", "csv", "markdown"],
+        choices=["json", "jsonl", "csv", "markdown"],
         default="json",
         help="导出格式"
     )
+    export_parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="gzip 压缩输出（文件名自动加 .gz）"
+    )
     export_parser.set_defaults(func=cmd_export)
 
     # stats 子命令
     stats_parser = subparsers.add_parser("stats", help="统计信息")
     stats_parser.add_argument("--json", action="store_true", help="JSON 格式输出")
+    stats_parser.add_argument(
+        "--by",
+        choices=list(PERIOD_NAMES),
+        help="按天/周/月统计新增笔记数"
+    )
     stats_parser.set_defaults(func=cmd_stats)
 
+    # migrate 子命令
+    migrate_parser = subparsers.add_parser("migrate", help="把笔记从 JSON 存储迁移到 SQLite")
+    migrate_parser.set_defaults(func=cmd_migrate)
+
     # plan 子命令
     plan_parser = subparsers.add_parser("plan", help="学习计划管理")
     plan_subparsers = plan_parser.add_subparsers(dest="plan_command", help="计划子命令")
@@ -683,9 +1151,11 @@ def main():
     # 解析参数
     args = parser.parse_args()
 
-    # 调整日志级别
+    set_backend(args.backend)
+
+    # 配置日志（--verbose 时使用 DEBUG 级别）
+    setup_logging(args.verbose)
     if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("verbose 模式已启用")
 
     # 执行
@@ -726,7 +1196,10 @@ PyHelper v1.0.0 - 从 Week 01 到 Week 14 的完整演进
 
 技术栈：
   - 数据模型：dataclass (Note, NoteStatus, StudyPlan)
-  - 存储：JSON (notes.json, plan.json)
+  - 存储：JSON Lines 追加写日志 + 偏移索引 (notes.jsonl)，JSON (plan.json)
+  - 可选存储：SQLite + FTS5 全文索引 (notes.db，--backend sqlite)
+  - 统计：持久化汇总（stats.json，写入时增量更新）；过滤：列式 NoteTable
+  - 搜索：倒排索引（中文按字/相邻两字，英文按 1~3 个字符的片段，search_index.json）
   - CLI：argparse (子命令、参数、互斥组)
   - 日志：logging (文件、级别、格式)
   - 异常：try/except (优雅降级)
@@ -734,16 +1207,27 @@ PyHelper v1.0.0 - 从 Week 01 到 Week 14 的完整演进
 
 命令清单：
   - pyhelper add "内容" [--tags ...]
+  - pyhelper add --from-file notes.jsonl
+  - pyhelper import FILE|- [--format auto|json|jsonl]
+  - pyhelper status ID draft|published|archived
   - pyhelper list [--pending|--published]
   - pyhelper search "关键词"
-  - pyhelper export --format json --output file.json
-  - pyhelper stats [--json]
+  - pyhelper export --format json|jsonl|csv|markdown --output file [--compress]
+  - pyhelper stats [--json] [--by day|week|month]
+  - pyhelper migrate
+  - pyhelper --backend sqlite <子命令>
   - pyhelper plan generate [--notes-dir dir] [--output file]
   - pyhelper plan show [--week N]
 
 目录结构：
   ~/.pyhelper/
-    ├── notes.json       # 笔记数据
+    ├── notes.jsonl      # 笔记数据（追加写日志，旧的 notes.json 会自动迁移）
+    ├── notes.idx.json   # 笔记 ID → 日志偏移的索引
+    ├── notes.db         # SQLite 后端（可选，pyhelper migrate 生成）
+    ├── search_index.json # 搜索用的倒排索引（自动维护）
+    ├── stats.json       # 统计汇总（状态/标签/每天新增，自动维护）
+    ├── ids.state        # 笔记 ID 计数器
+    ├── notes.lock       # 写锁（多个进程同时写入时排队）
     ├── plan.json        # 学习计划
     └── pyhelper.log     # 日志文件
 
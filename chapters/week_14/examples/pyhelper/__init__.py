@@ -0,0 +1,22 @@
+"""
+PyHelper - Week 14 发布版本的支撑模块
+
+14_pyhelper_v1.py 是命令行入口，本包放的是它背后的"引擎"：
+
+项目结构：
+├── storage.py          # 笔记存储（追加写日志 + 偏移索引 + 压缩）
+├── sqlite_store.py     # 可选的 SQLite 存储（FTS5 全文索引）
+├── search_index.py     # 倒排索引（JSON 存储的搜索）
+├── ids.py              # 笔记 ID 生成器（时间 + 计数器 / ULID）
+├── locking.py          # 跨进程文件锁和原子写入
+├── importer.py         # 批量导入的输入读取（JSON Lines / JSON 数组）
+├── note_table.py       # 列式存放大量笔记（按状态过滤）
+├── stats.py            # 持久化的统计汇总（stats 子命令）
+├── exporter.py         # 流式导出（JSON / JSON Lines / CSV / Markdown，可 gzip）
+└── tests/              # 测试目录
+
+导入方式（14_pyhelper_v1.py 所在目录已在 sys.path 中）：
+  from pyhelper.storage import NoteStore
+"""
+
+__version__ = "1.0.0"
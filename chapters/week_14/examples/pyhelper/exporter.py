@@ -0,0 +1,113 @@
+"""
+exporter.py - 流式导出笔记
+
+职责：把笔记逐条写到文件，不把全部笔记载入内存
+
+每个导出函数接收笔记字典的迭代器（通常直接来自 store.iter_notes()），
+写一条丢一条，内存占用与笔记总数无关：
+- write_json：JSON 数组（与 json.dump(..., indent=2) 的输出一致）
+- write_jsonl：每行一条 JSON（可以直接用 pyhelper import 导回）
+- write_csv：CSV 表格
+- write_markdown：Markdown 文档
+
+open_output() 负责打开带大缓冲区的输出文件，可选 gzip 压缩。
+
+导入方式：
+  from pyhelper.exporter import WRITERS, open_output
+"""
+
+import io
+import json
+from typing import Callable, Dict, Iterable, TextIO
+
+# 输出缓冲区大小：攒够再写，减少系统调用
+BUFFER_SIZE = 1024 * 1024
+
+STATUS_ICONS = {"draft": "○", "published": "✓", "archived": "◉"}
+
+
+def open_output(path, compress: bool = False, newline=None) -> TextIO:
+    """打开导出文件（文本模式，UTF-8）
+
+    Args:
+        path: 输出路径
+        compress: True 时写 gzip 压缩文件
+        newline: 传给文本层的换行参数（CSV 需要 ""）
+    """
+    if not compress:
+        return open(path, "w", encoding="utf-8", newline=newline, buffering=BUFFER_SIZE)
+
+    import gzip
+    binary = io.BufferedWriter(gzip.GzipFile(path, "wb"), BUFFER_SIZE)
+    return io.TextIOWrapper(binary, encoding="utf-8", newline=newline)
+
+
+def write_json(notes: Iterable[dict], f: TextIO) -> int:
+    """逐条写出 JSON 数组
+
+    Returns:
+        写出的笔记数量
+    """
+    count = 0
+    for note in notes:
+        f.write("[\n  " if count == 0 else ",\n  ")
+        # 字符串里的换行已被转义，缩进只会加在结构换行上
+        f.write(json.dumps(note, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
+
+
+def write_jsonl(notes: Iterable[dict], f: TextIO) -> int:
+    """每行写一条 JSON"""
+    count = 0
+    for note in notes:
+        f.write(json.dumps(note, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(notes: Iterable[dict], f: TextIO) -> int:
+    """写出 CSV（标签用逗号连接）"""
+    import csv
+
+    writer = csv.writer(f)
+    writer.writerow(["ID", "Content", "Tags", "Created", "Status"])
+    count = 0
+    for note in notes:
+        writer.writerow([
+            note["id"],
+            note["content"],
+            ",".join(note.get("tags") or []),
+            note.get("created_at", ""),
+            note.get("status", "draft"),
+        ])
+        count += 1
+    return count
+
+
+def write_markdown(notes: Iterable[dict], f: TextIO) -> int:
+    """写出 Markdown 文档"""
+    f.write("# 学习笔记\n\n")
+    count = 0
+    for note in notes:
+        icon = STATUS_ICONS.get(note.get("status", "draft"), "○")
+        f.write(f"## {icon} {note['content'][:50]}...\n\n")
+        f.write(f"**ID**: {note['id']}\n\n")
+        f.write(f"**创建时间**: {note.get('created_at', '')}\n\n")
+        if note.get("tags"):
+            f.write(f"**标签**: {', '.join(note['tags'])}\n\n")
+        f.write(f"**内容**: {note['content']}\n\n")
+        f.write("---\n\n")
+        count += 1
+    return count
+
+
+# 导出格式 → 写出函数
+WRITERS: Dict[str, Callable[[Iterable[dict], TextIO], int]] = {
+    "json": write_json,
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+    "markdown": write_markdown,
+}
@@ -0,0 +1,166 @@
+"""
+ids.py - 笔记 ID 生成器
+
+职责：保证同一秒内、多个进程同时添加的笔记也不会拿到相同的 ID
+
+两种方案（PYHELPER_ID_SCHEME 环境变量选择，默认 timestamp）：
+
+- timestamp：时间 + 计数器，形如 20260201-090000-0003
+  - 与旧 ID（20260201-090000）前缀相同，按字符串排序即按时间排序
+  - 计数器保存在 ~/.pyhelper/ids.state（上次用到的时间字符串和计数），读写时持有文件锁，
+    多个进程同时添加也依次递增；同一秒超过 10000 条时借用下一秒
+  - 按格式化后的本地时间比较：时钟回拨、夏令时结束（钟表回退一小时）时
+    沿用上次的时间继续计数，ID 始终递增
+
+- ulid：ULID（48 位毫秒时间 + 80 位随机数，26 个 Crockford Base32 字符）
+  - 不需要共享状态：随机部分让不同进程、不同机器生成的 ID 几乎不可能相同
+  - 同一进程同一毫秒内把随机部分加一，保证单调递增
+
+导入方式：
+  from pyhelper.ids import make_id_generator
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from pyhelper.locking import file_lock
+
+SCHEMES = ("timestamp", "ulid")
+
+
+class TimestampIdGenerator:
+    """时间 + 计数器的 ID，计数器通过加锁的状态文件在进程间共享
+
+    Args:
+        state_path: 状态文件路径（保存上次用到的时间字符串和计数）
+        clock: 返回当前时间戳（秒）的函数，测试时可以替换
+    """
+
+    SEQ_DIGITS = 4
+    TIME_FORMAT = "%Y%m%d-%H%M%S"
+
+    def __init__(self, state_path, clock: Callable[[], float] = time.time):
+        self.state_path = Path(state_path)
+        self.clock = clock
+
+    def next_id(self) -> str:
+        """生成一个 ID"""
+        return self.reserve(1)[0]
+
+    def reserve(self, count: int) -> List[str]:
+        """一次加锁预留 count 个连续的 ID"""
+        limit = 10 ** self.SEQ_DIGITS
+        with file_lock(self.state_path) as f:
+            state = self.parse_state(f.read())
+            stamp = self.format_time(int(self.clock()))
+            if state is not None and state[0] >= stamp:
+                # 同一秒、时钟回拨或夏令时结束：沿用上次的时间，计数接着往下
+                stamp, seq = state[0], state[1] + 1
+            else:
+                seq = 0
+
+            ids = []
+            for _ in range(count):
+                if seq >= limit:
+                    stamp, seq = self.next_second(stamp), 0
+                ids.append(f"{stamp}-{seq:0{self.SEQ_DIGITS}d}")
+                seq += 1
+
+            f.seek(0)
+            f.truncate()
+            f.write(f"{stamp} {seq - 1}\n".encode("ascii"))
+        return ids
+
+    @classmethod
+    def parse_state(cls, data: bytes) -> Optional[Tuple[str, int]]:
+        """状态文件内容 → (时间字符串, 计数)；为空或损坏时返回 None，当作没有状态"""
+        parts = data.split()
+        if len(parts) != 2:
+            return None
+        try:
+            stamp, seq = parts[0].decode("ascii"), int(parts[1])
+            datetime.strptime(stamp, cls.TIME_FORMAT)
+        except ValueError:
+            return None
+        return stamp, seq
+
+    @classmethod
+    def format_time(cls, second: int) -> str:
+        return time.strftime(cls.TIME_FORMAT, time.localtime(second))
+
+    @classmethod
+    def next_second(cls, stamp: str) -> str:
+        """时间字符串的下一秒（按钟表读数加一秒，不受夏令时影响）"""
+        following = datetime.strptime(stamp, cls.TIME_FORMAT) + timedelta(seconds=1)
+        return following.strftime(cls.TIME_FORMAT)
+
+
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+class UlidGenerator:
+    """ULID：毫秒时间 + 随机数，进程内单调递增
+
+    Args:
+        clock: 返回当前时间戳（秒）的函数
+        randbits: 返回 n 字节随机数的函数
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time,
+                 randbits: Callable[[int], bytes] = os.urandom):
+        self.clock = clock
+        self.randbits = randbits
+        self._last_ms = -1
+        self._last_random = 0
+
+    def next_id(self) -> str:
+        """生成一个 ULID"""
+        ms = int(self.clock() * 1000)
+        if ms <= self._last_ms:
+            # 同一毫秒（或时钟回拨）：时间不变，随机部分加一
+            ms = self._last_ms
+            random = self._last_random + 1
+            if random >> 80:
+                ms, random = ms + 1, 0
+        else:
+            random = int.from_bytes(self.randbits(10), "big")
+        self._last_ms, self._last_random = ms, random
+        return self.encode((ms << 80) | random)
+
+    def reserve(self, count: int) -> List[str]:
+        """生成 count 个递增的 ULID"""
+        return [self.next_id() for _ in range(count)]
+
+    @staticmethod
+    def encode(value: int) -> str:
+        """128 位整数 → 26 个 Crockford Base32 字符"""
+        chars = []
+        for _ in range(26):
+            chars.append(CROCKFORD[value & 31])
+            value >>= 5
+        return "".join(reversed(chars))
+
+
+def make_id_generator(scheme: str, state_path):
+    """按方案名创建 ID 生成器
+
+    Raises:
+        ValueError: 未知的方案名
+    """
+    if scheme == "timestamp":
+        return TimestampIdGenerator(state_path)
+    if scheme == "ulid":
+        return UlidGenerator()
+    raise ValueError(f"未知的 ID 方案：{scheme}（可选：{', '.join(SCHEMES)}）")
+
+
+def iter_ids(generator, block: int = 1000) -> Iterator[str]:
+    """按需产出 ID，每次向生成器预留一批（批量导入时减少加锁次数）
+
+    没用完的 ID 直接丢弃：ID 只要求唯一、递增，不要求连续。
+    """
+    while True:
+        yield from generator.reserve(block)
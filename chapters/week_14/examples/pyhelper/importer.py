@@ -0,0 +1,135 @@
+"""
+importer.py - 批量导入笔记时的输入读取
+
+职责：流式读取待导入的笔记，不把整个文件载入内存
+
+支持两种格式（默认根据第一个非空白字符自动判断）：
+- JSON Lines：每行一个 JSON 对象（空行忽略）
+- JSON 数组：[{...}, {...}]，例如 export --format json 的输出或旧版 notes.json
+
+路径为 "-" 时从标准输入读取；以 .gz 结尾的文件自动解压
+（export --compress 的输出可以直接导回）。
+
+本模块只负责"读出 JSON 对象"，字段校验和去重由调用方
+（14_pyhelper_v1.py 用 Note.from_dict 校验）负责。
+
+导入方式：
+  from pyhelper.importer import iter_records
+"""
+
+import json
+import sys
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+# 每次从文件读取的字符数
+CHUNK_SIZE = 64 * 1024
+
+
+@contextmanager
+def open_source(path: str):
+    """打开输入：路径为 "-" 时使用标准输入，.gz 文件自动解压"""
+    if path == "-":
+        yield sys.stdin
+    elif path.endswith(".gz"):
+        import gzip
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            yield f
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield f
+
+
+def iter_records(f: TextIO, fmt: str = "auto") -> Iterator[Tuple[str, Any, Optional[str]]]:
+    """逐条产出输入中的 JSON 对象
+
+    Args:
+        f: 文本文件对象
+        fmt: "auto"、"json"（JSON 数组）或 "jsonl"
+
+    Yields:
+        (位置描述, 数据, 错误信息)；解析失败时数据为 None、错误信息非空
+    """
+    head = f.read(CHUNK_SIZE)
+    if fmt == "auto":
+        fmt = "json" if head.lstrip().startswith("[") else "jsonl"
+    if fmt == "json":
+        yield from _iter_json_array(f, head)
+    else:
+        yield from _iter_json_lines(f, head)
+
+
+def _iter_json_lines(f: TextIO, head: str) -> Iterator[Tuple[str, Any, Optional[str]]]:
+    """JSON Lines：每行一个对象"""
+    def lines():
+        rest = head
+        while True:
+            *complete, rest = rest.split("\n")
+            yield from complete
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            rest += chunk
+        if rest:
+            yield rest
+
+    for lineno, line in enumerate(lines(), 1):
+        if not line.strip():
+            continue
+        try:
+            yield f"第 {lineno} 行", json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield f"第 {lineno} 行", None, f"JSON 格式错误：{e}"
+
+
+def _iter_json_array(f: TextIO, head: str) -> Iterator[Tuple[str, Any, Optional[str]]]:
+    """JSON 数组：逐个解析数组元素，缓冲区里只保留尚未解析的部分
+
+    数组本身的语法错误（缺少括号、逗号）无法定位到单个元素，直接抛出 ValueError。
+    """
+    decoder = json.JSONDecoder()
+    buf = head.lstrip()
+    if not buf.startswith("["):
+        raise ValueError("输入不是 JSON 数组")
+    buf = buf[1:]
+    index = 0
+    expect_value = True  # 下一个应该是元素（而不是逗号或右括号）
+
+    while True:
+        buf = buf.lstrip()
+        if not buf:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                raise ValueError("JSON 数组不完整：缺少 ]")
+            buf = chunk
+            continue
+
+        if buf[0] == "]" and (not expect_value or index == 0):
+            return
+        if not expect_value:
+            if buf[0] != ",":
+                raise ValueError(f"JSON 数组格式错误：第 {index} 个元素之后缺少逗号")
+            buf = buf[1:]
+            expect_value = True
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buf)
+        except json.JSONDecodeError:
+            # 元素可能被切在两个块之间：读更多内容再试
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                raise ValueError(f"JSON 数组格式错误：第 {index + 1} 个元素无法解析")
+            buf += chunk
+            continue
+        if end == len(buf) and not isinstance(value, (dict, list, str)):
+            # 数字、true 这类元素可能刚好被切断，读更多内容确认
+            chunk = f.read(CHUNK_SIZE)
+            if chunk:
+                buf += chunk
+                continue
+
+        index += 1
+        yield f"第 {index} 个元素", value, None
+        buf = buf[end:]
+        expect_value = False
@@ -0,0 +1,59 @@
+"""
+locking.py - 跨进程的文件锁和原子写入
+
+职责：让同时运行的多个 pyhelper 进程（比如两个终端各跑一条 add）安全地写共享文件
+
+- file_lock：fcntl.flock 建议锁。只约束同样加锁的进程，锁随文件描述符关闭自动释放，
+  进程崩溃也不会留下"死锁"。Windows 没有 fcntl，此时退化为不加锁。
+- atomic_write_text：先写同目录下的临时文件并 fsync，再用 os.replace 原子替换。
+  写到一半崩溃只会留下临时文件，原文件要么是旧内容、要么是新内容，不会被截断。
+
+导入方式：
+  from pyhelper.locking import atomic_write_text, file_lock
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path):
+    """独占地锁住 path（文件不存在时创建），退出 with 时解锁
+
+    Yields:
+        以 "r+b" 打开的锁文件，调用方可以在锁内读写它的内容
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    with open(fd, "r+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            if fcntl is not None:
+                f.flush()
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path, text: str) -> None:
+    """原子地把文本写入 path（UTF-8）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
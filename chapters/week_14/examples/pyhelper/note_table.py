@@ -0,0 +1,175 @@
+"""
+note_table.py - 列式存放大量笔记（NoteTable）
+
+职责：按状态过滤这类"扫一遍所有笔记"的操作不再为每条笔记创建对象
+
+一百万条笔记如果都变成 Note 对象，就是一百万个 __dict__、一百万个标签列表、
+几百万个小字符串。NoteTable 改成按列存放：
+- 状态：array('B')，每条笔记 1 字节
+- 创建日期：array('I')，保存日期序数（date.toordinal()）
+- 标签：整个表只保存一次标签名，每条笔记的标签是一段标签编号（array('I')）
+- ID 和内容：所有字符串拼在一个 UTF-8 缓冲区里，只记录起止偏移
+
+按状态过滤直接在状态列上做，需要某条笔记时才用 table[i] 取出它的字典。
+
+导入方式：
+  from pyhelper.note_table import NoteTable
+"""
+
+from array import array
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+
+STATUSES = ("draft", "published", "archived")
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+class StringColumn:
+    """把一列字符串拼在一个 UTF-8 缓冲区里，按偏移取出"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._offsets = array("Q", [0])
+
+    def append(self, value: str) -> None:
+        self._buffer += value.encode("utf-8")
+        self._offsets.append(len(self._buffer))
+
+    def __getitem__(self, i: int) -> str:
+        return self._buffer[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def nbytes(self) -> int:
+        return len(self._buffer) + self._offsets.itemsize * len(self._offsets)
+
+
+class NoteTable:
+    """按列存放的笔记集合（只追加，顺序即添加顺序）
+
+    用法：
+        table = NoteTable.from_notes(store.iter_notes())
+        table.indices_by_status("draft")
+        table[0]                     # 第一条笔记的字典（与 Note.to_dict() 格式一致）
+    """
+
+    def __init__(self):
+        self.ids = StringColumn()
+        self.contents = StringColumn()
+        self.status_codes = array("B")
+        self.created = array("I")  # 日期序数；0 表示不是 YYYY-MM-DD 格式
+        self._raw_created: Dict[int, str] = {}  # 无法解析的创建时间原样保存
+        self.tag_names: List[str] = []  # 标签编号 → 标签名
+        self._tag_codes: Dict[str, int] = {}  # 标签名 → 标签编号
+        self.tag_values = array("I")  # 所有笔记的标签编号首尾相接
+        self.tag_offsets = array("Q", [0])  # 第 i 条笔记的标签在 tag_values[offsets[i]:offsets[i+1]]
+        self._index: Optional[Dict[str, int]] = None  # ID → 行号，第一次按 ID 查找时才建立
+
+    @classmethod
+    def from_notes(cls, notes: Iterable[dict]) -> "NoteTable":
+        """从笔记字典（例如 store.iter_notes()）逐条建表"""
+        table = cls()
+        for note in notes:
+            table.append(note)
+        return table
+
+    def append(self, note: dict) -> int:
+        """追加一条笔记
+
+        Returns:
+            新笔记的行号
+
+        Raises:
+            ValueError: 状态不是 draft/published/archived
+        """
+        status = note.get("status", "draft")
+        if status not in _STATUS_CODES:
+            raise ValueError(f"未知的笔记状态：{status}")
+
+        row = len(self.status_codes)
+        self.ids.append(note["id"])
+        self.contents.append(note["content"])
+        self.status_codes.append(_STATUS_CODES[status])
+
+        created_at = note.get("created_at", "")
+        try:
+            ordinal = date.fromisoformat(created_at).toordinal()
+        except (TypeError, ValueError):
+            ordinal = 0
+        if ordinal and date.fromordinal(ordinal).isoformat() != created_at:
+            ordinal = 0  # 例如 "20260201"：能解析，但还原后格式会变
+        self.created.append(ordinal)
+        if not ordinal:
+            self._raw_created[row] = created_at
+
+        for tag in note.get("tags") or []:
+            code = self._tag_codes.get(tag)
+            if code is None:
+                code = self._tag_codes[tag] = len(self.tag_names)
+                self.tag_names.append(tag)
+            self.tag_values.append(code)
+        self.tag_offsets.append(len(self.tag_values))
+
+        if self._index is not None:
+            self._index[note["id"]] = row
+        return row
+
+    # =====================
+    # 按行取出
+    # =====================
+
+    def __len__(self) -> int:
+        return len(self.status_codes)
+
+    def __getitem__(self, row: int) -> dict:
+        """第 row 条笔记的字典（与 Note.to_dict() 格式一致）"""
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        ordinal = self.created[row]
+        return {
+            "id": self.ids[row],
+            "content": self.contents[row],
+            "tags": self.tags(row),
+            "created_at": (
+                date.fromordinal(ordinal).isoformat() if ordinal
+                else self._raw_created[row]
+            ),
+            "status": STATUSES[self.status_codes[row]],
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def tags(self, row: int) -> List[str]:
+        """第 row 条笔记的标签"""
+        start, end = self.tag_offsets[row], self.tag_offsets[row + 1]
+        return [self.tag_names[code] for code in self.tag_values[start:end]]
+
+    def find(self, note_id: str) -> Optional[int]:
+        """按 ID 查行号；不存在时返回 None"""
+        if self._index is None:
+            self._index = {note_id: row for row, note_id in enumerate(self.ids)}
+        return self._index.get(note_id)
+
+    # =====================
+    # 列上的过滤
+    # =====================
+
+    def indices_by_status(self, status: str) -> List[int]:
+        """某个状态的所有行号（按添加顺序）"""
+        code = _STATUS_CODES[status]
+        return [row for row, value in enumerate(self.status_codes) if value == code]
+
+    def nbytes(self) -> int:
+        """各列占用的字节数（不含标签名和 ID 索引）"""
+        arrays = (self.status_codes, self.created, self.tag_values, self.tag_offsets)
+        return (
+            self.ids.nbytes() + self.contents.nbytes()
+            + sum(a.itemsize * len(a) for a in arrays)
+        )
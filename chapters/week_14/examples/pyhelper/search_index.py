@@ -0,0 +1,348 @@
+"""
+search_index.py - PyHelper 的倒排索引（纯 Python，不依赖 SQLite）
+
+职责：让 JSON 后端的 search 不必逐条扫描全部笔记
+
+倒排索引记录"每个词出现在哪些笔记里"，查询时只看命中词的笔记集合，
+耗时取决于命中的笔记数，而不是笔记总数。
+
+分词规则（转小写后切片段，标签和内容使用同样的分词）：
+- 中文：单字和相邻两字（"异常处理" → 异 常 处 理 异常 常处 处理）
+- 英文/数字：按单词切开，再切成 1~3 个字符的片段（"json" → j s o n js so on jso son）
+
+查询语法：
+- 每个词按不区分大小写的子串匹配，与逐条扫描（search_notes）和 SQLite 后端一致：
+  ython → python，c++ 只匹配包含 "c++" 的笔记
+- 空格分隔的多个词表示 AND：  异常 python
+- OR 连接多组条件：            异常 OR 测试
+- 末尾的 * 会被忽略：          pyt* 等同于 pyt
+
+索引保存在 ~/.pyhelper/search_index.json，并记录它对应的日志位置；
+之后追加的笔记和状态修改从日志增量追上来，不需要重建。
+日志被压缩或替换后位置失效，此时调用方应回退到逐条扫描并重建索引。
+
+导入方式：
+  from pyhelper.search_index import SearchIndex
+"""
+
+import json
+import logging
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_CJK = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+# 一段连续的中文，或一个由非中文字母/数字组成的单词
+TOKEN_PATTERN = re.compile(rf"([{_CJK}]+)|([^\W_{_CJK}]+)")
+
+
+def split_terms(text: str) -> Tuple[List[str], List[str]]:
+    """把文本切成中文片段和英文单词（均已转小写）
+
+    Returns:
+        (中文片段列表, 英文单词列表)
+    """
+    runs, words = [], []
+    for cjk, word in TOKEN_PATTERN.findall(text.lower()):
+        if cjk:
+            runs.append(cjk)
+        else:
+            words.append(word)
+    return runs, words
+
+
+# 片段的最大长度：中文两个字已经足够区分，英文字母组合少，用三个字符
+CJK_GRAM = 2
+WORD_GRAM = 3
+
+
+def ngrams(piece: str, max_n: int) -> List[str]:
+    """片段 → 长度 1 到 max_n 的全部子串"""
+    return [
+        piece[i:i + n]
+        for n in range(1, min(max_n, len(piece)) + 1)
+        for i in range(len(piece) - n + 1)
+    ]
+
+
+def tokenize(text: str) -> Set[str]:
+    """文本 → 索引词集合"""
+    runs, words = split_terms(text)
+    tokens: Set[str] = set()
+    for run in runs:
+        tokens.update(ngrams(run, CJK_GRAM))
+    for word in words:
+        tokens.update(ngrams(word, WORD_GRAM))
+    return tokens
+
+
+def lookup_keys(piece: str, max_n: int) -> List[str]:
+    """查询片段 → 需要求交集的索引词（片段够长时只用最长的那一档）"""
+    n = min(max_n, len(piece))
+    return [piece[i:i + n] for i in range(len(piece) - n + 1)]
+
+
+def note_text(note: dict) -> str:
+    """参与搜索的文本：内容 + 标签"""
+    return "\n".join([note.get("content", "")] + list(note.get("tags") or []))
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """解析查询：OR 分隔的若干组，每组内的词为 AND
+
+    Returns:
+        [[词, ...], ...]；空查询返回 []
+    """
+    groups, current = [], []
+    for term in query.split():
+        if term == "OR":
+            if current:
+                groups.append(current)
+            current = []
+        else:
+            current.append(term.rstrip("*") or term)
+    if current:
+        groups.append(current)
+    return groups
+
+
+class SearchIndex:
+    """笔记倒排索引
+
+    内部用整数序号代替笔记 ID（序号即添加顺序），倒排表保存序号列表；
+    加载时不把列表转成集合，查询用到某个词时才转换，启动更快。
+
+    Args:
+        path: 索引文件路径（通常是 ~/.pyhelper/search_index.json）
+    """
+
+    VERSION = 3
+    # 增量追赶的记录数超过该值时才写回磁盘，避免每次搜索都重写索引文件
+    CHECKPOINT_RECORDS = 100
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.position: Optional[Tuple[int, int]] = None  # 对应的日志位置，None 表示未建立
+        self._reset()
+        self._pending = 0  # 上次保存后追赶的记录数
+
+    def _reset(self) -> None:
+        self._ids: List[Optional[str]] = []  # 序号 → 笔记 ID（已删除为 None）
+        self._ordinals: Dict[str, int] = {}  # 笔记 ID → 序号
+        self._digests: Dict[int, int] = {}  # 序号 → 搜索文本的 CRC32，用于跳过只改状态的更新
+        self._postings: Dict[str, Union[List[int], Set[int]]] = {}  # 索引词 → 序号
+        self._doc_tokens: Optional[Dict[int, List[str]]] = None  # 序号 → 索引词，删除/修改时才构建
+
+    # =====================
+    # 增量更新
+    # =====================
+
+    def add(self, note: dict) -> None:
+        """加入或更新一条笔记（只改动这条笔记涉及的词）"""
+        text = note_text(note)
+        digest = zlib.crc32(text.encode("utf-8"))
+        ordinal = self._ordinals.get(note["id"])
+        if ordinal is not None:
+            if self._digests[ordinal] == digest:
+                # 只改了状态等不参与搜索的字段
+                return
+            self._unlink(ordinal)
+        else:
+            ordinal = len(self._ids)
+            self._ids.append(note["id"])
+            self._ordinals[note["id"]] = ordinal
+
+        tokens = tokenize(text)
+        self._digests[ordinal] = digest
+        if self._doc_tokens is not None:
+            self._doc_tokens[ordinal] = list(tokens)
+        for token in tokens:
+            postings = self._get_postings(token)
+            if postings is None:
+                self._postings[token] = postings = set()
+            postings.add(ordinal)
+
+    def remove(self, note_id: str) -> None:
+        """删除一条笔记"""
+        ordinal = self._ordinals.pop(note_id, None)
+        if ordinal is not None:
+            self._unlink(ordinal)
+            del self._digests[ordinal]
+            self._ids[ordinal] = None
+
+    def _unlink(self, ordinal: int) -> None:
+        """把一条笔记从它的所有索引词下移除"""
+        if self._doc_tokens is None:
+            # 第一次删除/修改内容时，从倒排表反推每条笔记的词
+            self._doc_tokens = {}
+            for token, postings in self._postings.items():
+                for i in postings:
+                    self._doc_tokens.setdefault(i, []).append(token)
+        for token in self._doc_tokens.pop(ordinal, []):
+            postings = self._get_postings(token)
+            postings.discard(ordinal)
+            if not postings:
+                del self._postings[token]
+
+    def _get_postings(self, token: str) -> Optional[Set[int]]:
+        """取出某个词的倒排表（从磁盘加载的列表在这里才转成集合）"""
+        postings = self._postings.get(token)
+        if isinstance(postings, list):
+            self._postings[token] = postings = set(postings)
+        return postings
+
+    def sync(self, store) -> bool:
+        """从笔记存储的日志增量追赶到最新位置
+
+        Args:
+            store: storage.NoteStore
+
+        Returns:
+            True 如果索引已是最新；False 表示索引过期（需要重建）
+        """
+        if self.position is None:
+            return False
+        changes = store.changes_since(self.position)
+        if changes is None:
+            return False
+
+        records, self.position = changes
+        for record in records:
+            if record["op"] == "put":
+                self.add(record["note"])
+            else:
+                self.remove(record["id"])
+        self._pending += len(records)
+        if self._pending >= self.CHECKPOINT_RECORDS:
+            self.save()
+        return True
+
+    def rebuild(self, notes: Iterable[dict], position: Tuple[int, int]) -> None:
+        """从全部笔记重建索引（日志被压缩或索引文件丢失后使用）"""
+        self._reset()
+        for note in notes:
+            self.add(note)
+        self.position = position
+        self.save()
+
+    # =====================
+    # 查询
+    # =====================
+
+    def search(self, query: str) -> List[str]:
+        """按查询返回候选笔记 ID（按添加顺序）
+
+        每个词的片段求交集得到候选，可能包含少量误报（片段都在但不相连），
+        调用方应再用 matches() 在候选笔记上确认。
+        """
+        groups = parse_query(query)
+        if not groups:
+            return list(self._ordinals)
+
+        result: Set[int] = set()
+        for group in groups:
+            matched = None
+            for term in group:
+                ordinals = self._lookup_term(term)
+                matched = ordinals if matched is None else matched & ordinals
+                if not matched:
+                    break
+            result |= matched or set()
+        return [self._ids[i] for i in sorted(result)]
+
+    def _lookup_term(self, term: str) -> Set[int]:
+        """单个查询词 → 笔记序号集合"""
+        runs, words = split_terms(term)
+        keys = [key for run in runs for key in lookup_keys(run, CJK_GRAM)]
+        keys += [key for word in words for key in lookup_keys(word, WORD_GRAM)]
+        if not keys:
+            # 只有标点等不建索引的字符（如 "++"），所有笔记都是候选
+            return set(self._ordinals.values())
+
+        sets = [self._get_postings(key) or set() for key in keys]
+
+        # 从最小的集合开始求交集
+        sets.sort(key=len)
+        matched = set(sets[0])
+        for ordinals in sets[1:]:
+            matched &= ordinals
+            if not matched:
+                break
+        return matched
+
+    @staticmethod
+    def matches(query: str, note: dict) -> bool:
+        """判断一条笔记是否满足查询（与 search() 的语义一致，用于确认候选和回退扫描）"""
+        groups = parse_query(query)
+        if not groups:
+            return True
+
+        text = note_text(note).lower()
+        return any(all(term.lower() in text for term in group) for group in groups)
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    # =====================
+    # 持久化
+    # =====================
+
+    def load(self) -> bool:
+        """从磁盘加载索引
+
+        Returns:
+            True 如果加载成功；文件不存在、损坏或版本不符时返回 False
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"搜索索引损坏，将重建：{e}")
+            return False
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return False
+
+        try:
+            ids = data["ids"]
+            ordinals = {note_id: i for i, note_id in enumerate(ids)}
+            digests = dict(enumerate(data["digests"]))
+            postings = dict(data["postings"])
+            position = tuple(data["position"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"搜索索引损坏，将重建：{e!r}")
+            return False
+
+        self._reset()
+        self._ids, self._ordinals, self._digests, self._postings = ids, ordinals, digests, postings
+        self.position = position
+        self._pending = 0
+        return True
+
+    def save(self) -> None:
+        """把索引原子地写回磁盘（保存前把已删除笔记留下的空位压缩掉）"""
+        renumber = {old: new for new, old in enumerate(sorted(self._ordinals.values()))}
+        data = {
+            "version": self.VERSION,
+            "position": list(self.position or (0, 0)),
+            "ids": [self._ids[old] for old in renumber],
+            "digests": [self._digests[old] for old in renumber],
+            "postings": {
+                token: sorted(renumber[i] for i in postings)
+                for token, postings in self._postings.items()
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._pending = 0
+
+        if len(renumber) != len(self._ids):
+            self.load()
@@ -0,0 +1,354 @@
+"""
+sqlite_store.py - PyHelper 的 SQLite 存储后端
+
+职责：用标准库 sqlite3 保存笔记，让搜索、按状态过滤和统计变成索引查询
+
+适合笔记很多（几万到几十万条）的场景：
+- search：FTS5 全文索引（trigram 分词，支持中文和子串匹配）
+- list --pending/--published：status 列上的普通索引
+- stats：GROUP BY 聚合，不需要把笔记载入 Python
+
+表结构：
+  notes       笔记本体（seq 保留添加顺序，id 唯一）
+  note_tags   笔记 → 标签，用于标签统计
+  notes_fts   FTS5 虚拟表（外部内容表，由触发器与 notes 保持同步）
+
+接口与 storage.NoteStore 保持一致（append/get/update/delete/iter_notes/replace_all），
+只处理字典，Note 对象的转换由调用方负责。
+
+导入方式：
+  from pyhelper.sqlite_store import SQLiteNoteStore
+"""
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    content TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_status ON notes(status);
+
+CREATE TABLE IF NOT EXISTS note_tags (
+    note_seq INTEGER NOT NULL REFERENCES notes(seq) ON DELETE CASCADE,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS note_tags_seq ON note_tags(note_seq);
+CREATE INDEX IF NOT EXISTS note_tags_tag ON note_tags(tag);
+"""
+
+FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    content, tags, content='notes', content_rowid='seq', tokenize='trigram'
+)
+"""
+
+# 触发器名 → 定义；大批量导入时先删掉触发器，导入完再一次性重建索引
+FTS_TRIGGERS = {
+    "notes_fts_insert": """
+CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts(rowid, content, tags) VALUES (new.seq, new.content, new.tags);
+END
+""",
+    "notes_fts_delete": """
+CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts(notes_fts, rowid, content, tags)
+    VALUES ('delete', old.seq, old.content, old.tags);
+END
+""",
+    "notes_fts_update": """
+CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF content, tags ON notes BEGIN
+    INSERT INTO notes_fts(notes_fts, rowid, content, tags)
+    VALUES ('delete', old.seq, old.content, old.tags);
+    INSERT INTO notes_fts(rowid, content, tags) VALUES (new.seq, new.content, new.tags);
+END
+""",
+}
+
+# trigram 分词器至少需要 3 个字符才能走索引，更短的关键词用 LIKE
+FTS_MIN_QUERY_CHARS = 3
+
+_COLUMNS = "id, content, tags, created_at, status"
+
+
+def _row_to_dict(row: Tuple) -> dict:
+    """把 notes 表的一行转换为笔记字典（与 Note.to_dict() 格式一致）"""
+    note_id, content, tags, created_at, status = row
+    return {
+        "id": note_id,
+        "content": content,
+        "tags": json.loads(tags),
+        "created_at": created_at,
+        "status": status,
+    }
+
+
+def _escape_like(keyword: str) -> str:
+    """转义 LIKE 模式中的通配符"""
+    return keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SQLiteNoteStore:
+    """基于 SQLite 的笔记存储
+
+    当前 SQLite 不支持 FTS5 trigram 分词器（低于 3.34）时，
+    搜索自动退化为 LIKE 查询，其余功能不受影响。
+
+    Args:
+        db_path: 数据库文件路径（通常是 ~/.pyhelper/notes.db）
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self.has_fts = False
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """按需打开数据库连接并建表"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            try:
+                with conn:
+                    conn.execute(FTS_TABLE)
+                    for trigger in FTS_TRIGGERS.values():
+                        conn.execute(trigger)
+                self.has_fts = True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"SQLite 不支持 FTS5 trigram，搜索改用 LIKE：{e}")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # =====================
+    # 写入
+    # =====================
+
+    def append(self, note: dict) -> None:
+        """添加笔记；ID 已存在时整条更新（保留原来的顺序）"""
+        with self.conn:
+            self._upsert(note)
+
+    def append_many(self, notes: Iterable[dict]) -> int:
+        """在一个事务里批量写入笔记（ID 已存在时更新；与 NoteStore.append_many 接口一致）
+
+        Returns:
+            写入的笔记数量
+        """
+        with self.conn:
+            return self._bulk_upsert(notes)
+
+    def replace_all(self, notes: Iterable[dict]) -> int:
+        """用给定笔记整体替换数据库内容
+
+        Returns:
+            写入的笔记数量
+        """
+        with self.conn:
+            return self._bulk_upsert(notes, replace=True)
+
+    def update(self, note_id: str, **changes) -> Optional[dict]:
+        """修改笔记的部分字段（如 status）
+
+        Returns:
+            修改后的笔记字典；笔记不存在时返回 None
+        """
+        with self.conn:
+            note = self.get(note_id)
+            if note is None:
+                return None
+            note.update(changes)
+            self._upsert(note)
+        return note
+
+    def delete(self, note_id: str) -> bool:
+        """删除笔记
+
+        Returns:
+            True 如果笔记存在并已删除
+        """
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        return cursor.rowcount > 0
+
+    def _bulk_upsert(self, notes: Iterable[dict], replace: bool = False) -> int:
+        """批量写入（调用方负责事务）
+
+        逐条维护全文索引的代价与这批笔记的数量成正比；FTS5 的 rebuild 则要重新
+        分词整张表。所以先保留同步触发器逐条写入，只有当这批已经写入的笔记
+        不少于表中原有的笔记（首次迁移、replace_all、往小库里大批导入）时，
+        才删掉触发器，剩下的笔记写完后一次性 rebuild，再恢复触发器。
+        往十万条的库里导入一条笔记，只需要为这一条更新索引。
+
+        Args:
+            replace: True 时先清空 notes 表（replace_all）
+        """
+        conn = self.conn
+        if not conn.in_transaction:
+            # DROP TRIGGER 不会自动开启事务：显式 BEGIN，中途失败时触发器随回滚恢复
+            conn.execute("BEGIN")
+
+        rebuilding = False
+        if replace:
+            rebuilding = self._drop_fts_triggers()
+            conn.execute("DELETE FROM notes")
+            existing = 0
+        else:
+            (existing,) = conn.execute("SELECT COUNT(*) FROM notes").fetchone()
+
+        count = 0
+        for note in notes:
+            if not rebuilding and count >= existing:
+                rebuilding = self._drop_fts_triggers()
+            self._upsert(note)
+            count += 1
+
+        if rebuilding:
+            conn.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+            for trigger in FTS_TRIGGERS.values():
+                conn.execute(trigger)
+        return count
+
+    def _drop_fts_triggers(self) -> bool:
+        """删掉全文索引的同步触发器（调用方负责事务和之后的 rebuild）
+
+        Returns:
+            True 如果删掉了触发器；没有 FTS5 时返回 False
+        """
+        if not self.has_fts:
+            return False
+        for name in FTS_TRIGGERS:
+            self.conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        return True
+
+    def _upsert(self, note: dict) -> None:
+        """插入或更新一条笔记及其标签（调用方负责事务）"""
+        if "id" not in note:
+            raise ValueError("笔记缺少 id 字段")
+        tags = note.get("tags") or []
+        self.conn.execute(
+            """
+            INSERT INTO notes (id, content, tags, created_at, status)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                content = excluded.content,
+                tags = excluded.tags,
+                created_at = excluded.created_at,
+                status = excluded.status
+            """,
+            (
+                note["id"],
+                note["content"],
+                json.dumps(tags, ensure_ascii=False),
+                note["created_at"],
+                note["status"],
+            ),
+        )
+        (seq,) = self.conn.execute("SELECT seq FROM notes WHERE id = ?", (note["id"],)).fetchone()
+        self.conn.execute("DELETE FROM note_tags WHERE note_seq = ?", (seq,))
+        self.conn.executemany(
+            "INSERT INTO note_tags (note_seq, tag) VALUES (?, ?)",
+            [(seq, tag) for tag in tags],
+        )
+
+    # =====================
+    # 读取与查询
+    # =====================
+
+    def get(self, note_id: str) -> Optional[dict]:
+        """按 ID 查找笔记"""
+        row = self.conn.execute(
+            f"SELECT {_COLUMNS} FROM notes WHERE id = ?", (note_id,)
+        ).fetchone()
+        return _row_to_dict(row) if row else None
+
+    def iter_notes(self) -> Iterator[dict]:
+        """按添加顺序逐条产出笔记"""
+        for row in self.conn.execute(f"SELECT {_COLUMNS} FROM notes ORDER BY seq"):
+            yield _row_to_dict(row)
+
+    def iter_by_status(self, status: str) -> Iterator[dict]:
+        """按状态过滤笔记（走 status 索引）"""
+        cursor = self.conn.execute(
+            f"SELECT {_COLUMNS} FROM notes WHERE status = ? ORDER BY seq", (status,)
+        )
+        for row in cursor:
+            yield _row_to_dict(row)
+
+    def search(self, keyword: str) -> List[dict]:
+        """在内容和标签中搜索关键词（不区分大小写的子串匹配）
+
+        关键词不少于 3 个字符时走 FTS5 索引，否则用 LIKE。
+        """
+        if not keyword:
+            return list(self.iter_notes())
+
+        conn = self.conn
+        if self.has_fts and len(keyword) >= FTS_MIN_QUERY_CHARS:
+            # 整个关键词作为一个短语查询，避免被当作 FTS 语法解析
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            cursor = conn.execute(
+                f"""
+                SELECT {_COLUMNS} FROM notes
+                WHERE seq IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?)
+                ORDER BY seq
+                """,
+                (phrase,),
+            )
+        else:
+            pattern = f"%{_escape_like(keyword)}%"
+            cursor = conn.execute(
+                f"""
+                SELECT {_COLUMNS} FROM notes
+                WHERE content LIKE ? ESCAPE '\\'
+                   OR seq IN (SELECT note_seq FROM note_tags WHERE tag LIKE ? ESCAPE '\\')
+                ORDER BY seq
+                """,
+                (pattern, pattern),
+            )
+        return [_row_to_dict(row) for row in cursor]
+
+    def count_by_status(self) -> Dict[str, int]:
+        """各状态的笔记数量"""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM notes GROUP BY status"))
+
+    def count_by_day(self) -> Dict[str, int]:
+        """每天（created_at）新增的笔记数量"""
+        return dict(self.conn.execute("SELECT created_at, COUNT(*) FROM notes GROUP BY created_at"))
+
+    def top_tags(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """使用次数最多的标签（次数相同时按第一次出现的顺序）"""
+        return self.conn.execute(
+            """
+            SELECT tag, COUNT(*) AS n FROM note_tags
+            GROUP BY tag ORDER BY n DESC, MIN(note_seq), MIN(rowid) LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+
+    def __contains__(self, note_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM notes WHERE id = ?", (note_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM notes").fetchone()
+        return count
@@ -0,0 +1,183 @@
+"""
+stats.py - 笔记统计汇总（StatsRollup）
+
+职责：让 `pyhelper stats` 不必每次都扫描全部笔记
+
+汇总只保存几个计数器：
+- 各状态的笔记数
+- 每个标签的使用次数
+- 每天（created_at）新增的笔记数，按周/按月统计由它合并得到
+
+第一次统计时一遍扫完所有笔记建立汇总，保存到 ~/.pyhelper/stats.json，
+并记录对应的日志位置。之后添加笔记、修改状态时只改动相关的计数；
+汇总的位置与日志一致时，stats 直接读汇总文件，耗时与笔记数量无关。
+日志被其他进程改动或压缩后位置对不上，下次 stats 会重新扫描一遍。
+
+导入方式：
+  from pyhelper.stats import StatsRollup
+"""
+
+import heapq
+import json
+import logging
+import os
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ("draft", "published", "archived")
+PERIODS = ("day", "week", "month")
+
+
+def bucket_counts(days: Dict[str, int], period: str) -> List[Tuple[str, int]]:
+    """把按天的计数合并成按天/周/月的计数
+
+    Args:
+        days: {"YYYY-MM-DD": 笔记数}
+        period: "day"、"week"（ISO 周，如 2026-W05）或 "month"（如 2026-02）
+
+    Returns:
+        [(时间段, 笔记数), ...]，按时间先后排序；不是日期的 created_at 归入"其他"，排在最后
+    """
+    from datetime import date
+
+    buckets: Counter = Counter()
+    for day, count in days.items():
+        try:
+            parsed = date.fromisoformat(day)
+        except (TypeError, ValueError):
+            buckets["其他"] += count
+            continue
+        if period == "week":
+            year, week, _ = parsed.isocalendar()
+            key = f"{year}-W{week:02d}"
+        elif period == "month":
+            key = f"{parsed.year}-{parsed.month:02d}"
+        else:
+            key = parsed.isoformat()
+        buckets[key] += count
+    return sorted(buckets.items(), key=lambda item: (item[0] == "其他", item[0]))
+
+
+class StatsRollup:
+    """持久化的统计汇总
+
+    Args:
+        path: 汇总文件路径（通常是 ~/.pyhelper/stats.json）
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.position: Optional[Tuple[int, int]] = None  # 对应的日志位置，None 表示未建立
+        self._reset()
+
+    def _reset(self) -> None:
+        self.total = 0
+        self.statuses: Counter = Counter()
+        self.tags: Counter = Counter()
+        self.days: Counter = Counter()
+
+    # =====================
+    # 更新
+    # =====================
+
+    def add(self, note: dict, sign: int = 1) -> None:
+        """计入一条笔记（sign=-1 时扣除）"""
+        self.total += sign
+        self._bump(self.statuses, note.get("status", "draft"), sign)
+        self._bump(self.days, note.get("created_at", ""), sign)
+        for tag in note.get("tags") or []:
+            self._bump(self.tags, tag, sign)
+
+    def remove(self, note: dict) -> None:
+        """扣除一条笔记（修改前的旧版本或被删除的笔记）"""
+        self.add(note, -1)
+
+    @staticmethod
+    def _bump(counter: Counter, key: str, sign: int) -> None:
+        counter[key] += sign
+        if counter[key] <= 0:
+            del counter[key]  # 计数归零的键不保留，汇总文件只和现有的标签/日期数量有关
+
+    def rebuild(self, notes: Iterable[dict], position: Tuple[int, int]) -> None:
+        """一遍扫描全部笔记重建汇总并保存"""
+        self._reset()
+        for note in notes:
+            self.total += 1
+            self.statuses[note.get("status", "draft")] += 1
+            self.days[note.get("created_at", "")] += 1
+            self.tags.update(note.get("tags") or [])
+        self.position = position
+        self.save()
+
+    # =====================
+    # 查询
+    # =====================
+
+    def summary(self, top: int = 5) -> dict:
+        """总数、各状态数量和最热门的 top 个标签（次数相同时先出现的在前）"""
+        result = {"total": self.total}
+        for status in STATUSES:
+            result[status] = self.statuses.get(status, 0)
+        result["top_tags"] = dict(heapq.nlargest(top, self.tags.items(), key=itemgetter(1)))
+        return result
+
+    def buckets(self, period: str) -> List[Tuple[str, int]]:
+        """按天/周/月的新增笔记数"""
+        return bucket_counts(self.days, period)
+
+    # =====================
+    # 持久化
+    # =====================
+
+    def load(self) -> bool:
+        """从磁盘加载汇总
+
+        Returns:
+            True 如果加载成功；文件不存在、损坏或版本不符时返回 False
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"统计汇总损坏，将重建：{e}")
+            return False
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return False
+
+        try:
+            total = int(data["total"])
+            statuses = Counter(data["statuses"])
+            tags = Counter(data["tags"])
+            days = Counter(data["days"])
+            position = tuple(data["position"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"统计汇总损坏，将重建：{e!r}")
+            return False
+
+        self.total, self.statuses, self.tags, self.days = total, statuses, tags, days
+        self.position = position
+        return True
+
+    def save(self) -> None:
+        """把汇总原子地写回磁盘"""
+        data = {
+            "version": self.VERSION,
+            "position": list(self.position or (0, 0)),
+            "total": self.total,
+            "statuses": self.statuses,
+            "tags": self.tags,
+            "days": self.days,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,635 @@
+"""
+storage.py - PyHelper 笔记存储引擎
+
+职责：把笔记保存在 ~/.pyhelper/ 下，并让"添加一条笔记"不再需要读写全部数据
+
+旧版本每次 add 都要解析整个 notes.json、追加一条、再整体写回，
+笔记越多越慢。本模块改成三个文件：
+
+  notes.jsonl      追加写日志：每行一条记录（写入或删除），只追加不修改
+  notes.idx.json   偏移索引：笔记 ID → 该笔记最新版本在日志中的字节偏移
+  notes.json.bak   旧格式 notes.json 迁移后留下的备份
+
+- 添加笔记：在日志末尾追加一行，不读取已有数据
+- 按 ID 查找 / 修改状态：查索引得到偏移，seek 过去读一行
+- 批量导入：整批记录用 begin/commit 包住，只 fsync 一次，要么全部生效要么全部丢弃
+- 压缩：旧版本和已删除记录超过一半时，把有效笔记重写成新日志
+- 并发：所有写操作持有 notes.lock 文件锁，多个进程同时写入时依次排队；
+  整体重写（压缩、迁移、replace_all）先写临时文件、fsync 后再原子重命名
+
+日志记录格式：
+  {"op": "put", "note": {...}}     # 新增或更新（整条笔记）
+  {"op": "del", "id": "..."}       # 删除
+  {"op": "begin", "batch": N}            # 批量写入开始（N 是这一行的偏移）
+  {"op": "put", "batch": N, "note": {...}}
+  {"op": "commit", "batch": N}           # 批量写入提交
+
+本模块只处理字典，Note 对象的转换由调用方（14_pyhelper_v1.py）负责。
+
+导入方式：
+  from pyhelper.storage import NoteStore
+"""
+
+import json
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pyhelper.locking import file_lock
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_OPS = ("begin", "commit")
+
+
+def record_note_id(record: dict) -> str:
+    """取出日志记录对应的笔记 ID
+
+    Raises:
+        KeyError: 记录格式不正确
+    """
+    if record["op"] == "put":
+        return record["note"]["id"]
+    if record["op"] == "del":
+        return record["id"]
+    raise KeyError(f"未知的操作：{record['op']}")
+
+
+def _encode(record: dict) -> bytes:
+    """日志记录 → 一行 UTF-8 JSON"""
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class NoteStore:
+    """追加写日志 + 偏移索引的笔记存储
+
+    索引按需加载：只追加笔记时完全不读索引；需要按 ID 查找时才加载，
+    并且只扫描索引记录之后新追加的那部分日志。
+
+    写操作（append/append_many/update/delete/replace_all/compact）在 locked() 内进行；
+    读操作不加锁，日志只追加、整体替换是原子重命名，读到的总是某个完整版本。
+
+    Args:
+        data_dir: 数据目录（通常是 ~/.pyhelper）
+    """
+
+    LOG_NAME = "notes.jsonl"
+    INDEX_NAME = "notes.idx.json"
+    LEGACY_NAME = "notes.json"
+    LOCK_NAME = "notes.lock"
+    INDEX_VERSION = 1
+
+    # 日志里至少有这么多条记录，才考虑压缩
+    COMPACT_MIN_RECORDS = 1000
+    # 无效记录（旧版本 + 删除标记）占比超过该值时压缩
+    COMPACT_GARBAGE_RATIO = 0.5
+    # 加载索引时追赶的记录数超过该值，就把索引写回磁盘
+    CHECKPOINT_RECORDS = 1000
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        self.log_path = self.data_dir / self.LOG_NAME
+        self.index_path = self.data_dir / self.INDEX_NAME
+        self.legacy_path = self.data_dir / self.LEGACY_NAME
+        self.lock_path = self.data_dir / self.LOCK_NAME
+
+        self._offsets: Optional[Dict[str, int]] = None  # 笔记 ID → 偏移
+        self._log_inode = 0  # 索引对应的日志文件 inode（压缩后会变）
+        self._indexed_size = 0  # 索引已覆盖的日志字节数
+        self._records = 0  # 索引已覆盖的日志记录数（含旧版本和删除标记）
+        self._ready = False
+        self._lock_depth = 0  # locked() 的嵌套层数（同一实例内可重入）
+
+    # =====================
+    # 初始化与迁移
+    # =====================
+
+    def _ensure_ready(self) -> None:
+        """确保数据目录存在，并在第一次使用时迁移旧的 notes.json"""
+        if self._ready:
+            return
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        if self.legacy_path.exists() and not self.log_path.exists():
+            with self.locked():
+                # 拿到锁后再检查一次：另一个进程可能已经迁移完了
+                if self.legacy_path.exists() and not self.log_path.exists():
+                    self.migrate()
+        self._ready = True
+
+    @contextmanager
+    def locked(self):
+        """持有存储的写锁（跨进程；同一实例内可重入）
+
+        拿到锁后先让内存中的索引追上其他进程的写入（日志被压缩过则重新加载），
+        之后的读改写（修改状态、删除、压缩）都基于最新数据。
+        """
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.lock_path):
+            self._lock_depth = 1
+            try:
+                self._refresh_index()
+                yield
+            finally:
+                self._lock_depth = 0
+
+    def migrate(self) -> int:
+        """把旧格式的 notes.json（整个 JSON 数组）迁移成日志
+
+        迁移成功后 notes.json 重命名为 notes.json.bak；
+        如果旧文件已损坏，保留原文件不动，避免覆盖用户数据。
+
+        Returns:
+            迁移的笔记数量
+        """
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"无法迁移 {self.legacy_path}：{e}")
+            return 0
+
+        if not isinstance(data, list):
+            logger.error(f"无法迁移 {self.legacy_path}：顶层不是数组")
+            return 0
+
+        count = self._rewrite(item for item in data if isinstance(item, dict) and "id" in item)
+        backup = self.legacy_path.with_name(self.LEGACY_NAME + ".bak")
+        os.replace(self.legacy_path, backup)
+        logger.info(f"已把 {count} 条笔记从 {self.legacy_path.name} 迁移到 {self.LOG_NAME}")
+        return count
+
+    # =====================
+    # 写入
+    # =====================
+
+    def append(self, note: dict) -> None:
+        """追加一条笔记（新增或整条更新），只写日志末尾
+
+        Args:
+            note: 笔记字典，必须包含 "id"
+        """
+        if "id" not in note:
+            raise ValueError("笔记缺少 id 字段")
+        with self.locked():
+            self._append_record({"op": "put", "note": note}, note["id"])
+
+    def delete(self, note_id: str) -> bool:
+        """删除笔记（追加一条删除标记）
+
+        Returns:
+            True 如果笔记存在并已删除
+        """
+        with self.locked():
+            self._load_index()
+            if note_id not in self._offsets:
+                return False
+            self._append_record({"op": "del", "id": note_id}, note_id)
+            self.maybe_compact()
+        return True
+
+    def update(self, note_id: str, **changes) -> Optional[dict]:
+        """修改笔记的部分字段（如 status），写入整条新版本
+
+        Returns:
+            修改后的笔记字典；笔记不存在时返回 None
+        """
+        with self.locked():
+            note = self.get(note_id)
+            if note is None:
+                return None
+            note.update(changes)
+            self.append(note)
+            self.maybe_compact()
+        return note
+
+    def replace_all(self, notes: Iterable[dict]) -> int:
+        """用给定笔记整体替换存储内容（兼容旧的 save_notes）
+
+        Returns:
+            写入的笔记数量
+        """
+        self._ready = True
+        with self.locked():
+            return self._rewrite(notes)
+
+    def _append_record(self, record: dict, note_id: str) -> None:
+        """把一条记录追加到日志末尾，并同步内存中的索引"""
+        self._ensure_ready()
+        line = _encode(record)
+
+        with open(self.log_path, "a+b") as f:
+            offset = self._seek_append_offset(f)
+            f.write(line)
+            inode = os.fstat(f.fileno()).st_ino
+
+        # 索引还没加载时不必维护，下次加载会从日志末尾追上来
+        if self._offsets is None:
+            return
+        if self._indexed_size == 0:
+            self._log_inode = inode  # 加载索引时日志还不存在
+        if self._indexed_size != offset:
+            # 其他进程也追加过记录，或者刚补了换行：从索引位置追上来
+            self._scan_tail()
+            return
+        if record["op"] == "put":
+            self._offsets[note_id] = offset
+        else:
+            self._offsets.pop(note_id, None)
+        self._indexed_size = offset + len(line)
+        self._records += 1
+
+    def append_many(self, notes: Iterable[dict]) -> int:
+        """批量追加笔记（新增或整条更新）
+
+        整批记录夹在 begin/commit 两条标记之间流式写入，最后只 fsync 一次。
+        读取时没有 commit 的批次会被整体丢弃，所以中途崩溃或出错
+        不会留下"导入了一半"的数据。整批写入期间持有写锁，
+        其他进程的追加会排在这一批之后，不会把批次打断。
+
+        Returns:
+            写入的笔记数量
+        """
+        self._ensure_ready()
+        count = 0
+        with self.locked(), open(self.log_path, "a+b") as f:
+            offset = self._seek_append_offset(f)
+            # 索引已加载且正好覆盖到批次开头时，边写边记下每条 put 的偏移，
+            # 写完直接更新索引，不必再把刚写的整批读回来解析
+            track = self._offsets is not None and self._indexed_size == offset
+            written: List[Tuple[str, int]] = []
+            # 批次号用 begin 行的偏移，同一个日志文件里不会重复
+            try:
+                line = _encode({"op": "begin", "batch": offset})
+                f.write(line)
+                end = offset + len(line)
+                for note in notes:
+                    if "id" not in note:
+                        raise ValueError("笔记缺少 id 字段")
+                    line = _encode({"op": "put", "batch": offset, "note": note})
+                    f.write(line)
+                    if track:
+                        written.append((note["id"], end))
+                    end += len(line)
+                    count += 1
+                if count == 0:
+                    f.truncate(offset)
+                    return 0
+                line = _encode({"op": "commit", "batch": offset})
+                f.write(line)
+                end += len(line)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                # 撤掉这一批已经写出的部分（truncate 会先刷出缓冲区）
+                f.truncate(offset)
+                raise
+
+            if track:
+                if self._indexed_size == 0:
+                    self._log_inode = os.fstat(f.fileno()).st_ino  # 加载索引时日志还不存在
+                self._offsets.update(written)
+                self._indexed_size = end
+                self._records += count + 2  # 加上 begin、commit 两行标记
+            elif self._offsets is not None:
+                self._scan_tail()
+        return count
+
+    def _seek_append_offset(self, f) -> int:
+        """把文件指针移到日志末尾，返回新记录的起始偏移
+
+        上次写入中途崩溃可能留下半行：先补一个换行，让新记录独占一行。
+        """
+        offset = f.seek(0, os.SEEK_END)
+        if offset > 0:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+                offset += 1
+        return offset
+
+    # =====================
+    # 读取
+    # =====================
+
+    def get(self, note_id: str) -> Optional[dict]:
+        """按 ID 查找笔记：查索引 + 一次 seek
+
+        Returns:
+            笔记字典；不存在时返回 None
+        """
+        self._load_index()
+        if note_id not in self._offsets:
+            return None
+        with self._open_log() as f:
+            offset = self._offsets.get(note_id)
+            if offset is None:
+                return None
+            f.seek(offset)
+            return json.loads(f.readline())["note"]
+
+    def iter_notes(self) -> Iterator[dict]:
+        """按添加顺序逐条产出每条笔记的最新版本（不会一次性载入全部笔记）"""
+        self._load_index()
+        if not self._offsets:
+            return
+        with self._open_log() as f:
+            offsets = list(self._offsets.values())
+            for offset in offsets:
+                # 偏移落在缓冲区内时 seek 不会触发系统调用，顺序读时接近流式
+                f.seek(offset)
+                yield json.loads(f.readline())["note"]
+
+    @contextmanager
+    def _open_log(self):
+        """打开日志用于按偏移读取，保证内存中的索引对应的就是打开的这个文件
+
+        读取不持锁：其他进程压缩日志时会换成一个新文件（inode 不同），
+        旧偏移用在新文件上会读到别的笔记或半行。打开后发现 inode 变了，
+        就重新加载索引再打开；已经打开的文件不受之后的压缩影响。
+        """
+        while True:
+            with open(self.log_path, "rb") as f:
+                if os.fstat(f.fileno()).st_ino == self._log_inode:
+                    yield f
+                    return
+            logger.info("日志已被其他进程压缩或替换，重新加载索引")
+            self._offsets = None
+            self._load_index()
+
+    def __contains__(self, note_id: str) -> bool:
+        self._load_index()
+        return note_id in self._offsets
+
+    def __len__(self) -> int:
+        self._load_index()
+        return len(self._offsets)
+
+    # =====================
+    # 索引
+    # =====================
+
+    def _load_index(self) -> None:
+        """加载偏移索引，并扫描索引之后新追加的日志"""
+        if self._offsets is not None:
+            return
+        self._ensure_ready()
+
+        self._offsets, self._indexed_size, self._records = {}, 0, 0
+        if not self.log_path.exists():
+            return
+
+        log_stat = self.log_path.stat()
+        self._log_inode = log_stat.st_ino
+        saved = self._read_index_file()
+        if (
+            saved is not None
+            and saved.get("version") == self.INDEX_VERSION
+            and saved.get("log_inode") == log_stat.st_ino
+            and saved.get("log_size", 0) <= log_stat.st_size
+        ):
+            self._offsets = saved["offsets"]
+            self._indexed_size = saved["log_size"]
+            self._records = saved["records"]
+        else:
+            logger.info("索引缺失或已过期，重新扫描日志")
+
+        scanned = self._scan_tail()
+        if scanned >= self.CHECKPOINT_RECORDS:
+            self._write_index_file()
+
+    def _refresh_index(self) -> None:
+        """让已加载的索引追上其他进程的写入（在写锁内调用）"""
+        if self._offsets is None:
+            return
+        try:
+            log_stat = self.log_path.stat()
+        except FileNotFoundError:
+            log_stat = None
+        if log_stat is None or log_stat.st_ino != self._log_inode:
+            # 日志被其他进程压缩或替换：旧偏移全部失效，下次用到时重新加载
+            self._offsets = None
+        elif log_stat.st_size > self._indexed_size:
+            self._scan_tail()
+
+    def _scan_tail(self) -> int:
+        """从索引覆盖的位置扫描到日志末尾，更新索引
+
+        Returns:
+            扫描到的记录数
+        """
+        scanned = 0
+        if self._indexed_size == 0 and self.log_path.exists():
+            self._log_inode = self.log_path.stat().st_ino
+        for offset, end, record in self._iter_log(self._indexed_size):
+            if record is not None:
+                if record["op"] == "put":
+                    self._offsets[record_note_id(record)] = offset
+                else:
+                    self._offsets.pop(record_note_id(record), None)
+            self._indexed_size = end
+            self._records += 1
+            scanned += 1
+        return scanned
+
+    def _iter_log(self, start: int) -> Iterator[Tuple[int, int, Optional[dict]]]:
+        """从 start 开始逐行读取日志
+
+        批量写入的记录在读到同一批次的 commit 之后才一起产出；
+        被其他记录打断的批次（写入中途崩溃，之后又有别的写入）整体作废，
+        文件末尾尚未提交的批次不产出。
+
+        Yields:
+            (行起始偏移, 行结束偏移, 记录)；put/del 之外的行（损坏的行、批量标记）记录为 None
+        """
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            offset = start
+            batch = None  # 尚未提交的批次：[(offset, end, record), ...]
+            batch_id = None
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # 末尾的半行（写入中途崩溃），不算作记录
+                    break
+                end = offset + len(line)
+                record = self._parse_line(line, offset)
+                op = record["op"] if record else None
+
+                if batch is not None:
+                    in_batch = record is not None and record.get("batch") == batch_id
+                    if in_batch and op == "put":
+                        batch.append((offset, end, record))
+                        offset = end
+                        continue
+                    if in_batch and op == "commit":
+                        yield from batch
+                        yield offset, end, None
+                        batch = None
+                        offset = end
+                        continue
+                    logger.warning(f"丢弃未提交的批量写入（偏移 {batch[0][0]}）")
+                    for batch_offset, batch_end, _ in batch:
+                        yield batch_offset, batch_end, None
+                    batch = None
+
+                if op == "begin":
+                    batch = [(offset, end, None)]
+                    batch_id = record.get("batch")
+                elif op in ("put", "del") and "batch" not in record:
+                    yield offset, end, record
+                else:
+                    # 损坏的行、孤立的 commit、不属于当前批次的批量记录
+                    yield offset, end, None
+                offset = end
+
+    @staticmethod
+    def _parse_line(line: bytes, offset: int) -> Optional[dict]:
+        """解析一行日志；损坏的行返回 None"""
+        try:
+            record = json.loads(line)
+            if record["op"] not in BATCH_OPS:
+                record_note_id(record)
+            return record
+        except (ValueError, KeyError, TypeError) as e:
+            if line.strip():
+                logger.warning(f"跳过损坏的日志记录（偏移 {offset}）：{e}")
+            return None
+
+    # =====================
+    # 变更订阅（供搜索索引等派生数据增量更新）
+    # =====================
+
+    def position(self) -> Tuple[int, int]:
+        """当前日志位置：(日志文件 inode, 日志长度)
+
+        压缩或整体替换后日志是一个新文件，inode 会变化，
+        派生数据据此判断能否从上次的位置增量追赶。
+        """
+        self._ensure_ready()
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            return (0, 0)
+        return (stat.st_ino, stat.st_size)
+
+    def changes_since(
+        self, position: Tuple[int, int]
+    ) -> Optional[Tuple[List[dict], Tuple[int, int]]]:
+        """读取某个位置之后追加的日志记录
+
+        Args:
+            position: 之前由 position() 得到的位置
+
+        Returns:
+            记录列表（{"op": "put", "note": ...} 或 {"op": "del", "id": ...}），
+            以及读到的新位置；日志已被压缩/替换、无法增量追赶时返回 None
+        """
+        inode, size = position
+        current_inode, current_size = self.position()
+        if size > current_size or (size > 0 and inode != current_inode):
+            return None
+        if size == current_size:
+            return [], (current_inode, size)
+
+        records = []
+        end = size
+        for _, end, record in self._iter_log(size):
+            if record is not None:
+                records.append(record)
+        return records, (current_inode, end)
+
+    def _read_index_file(self) -> Optional[dict]:
+        """读取保存的偏移索引；文件不存在、损坏或结构不对时返回 None"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not (
+            isinstance(saved, dict)
+            and isinstance(saved.get("offsets"), dict)
+            and isinstance(saved.get("log_size"), int)
+            and isinstance(saved.get("records"), int)
+        ):
+            return None
+        return saved
+
+    def _write_index_file(self) -> None:
+        """把索引原子地写回磁盘（先写临时文件再重命名）"""
+        data = {
+            "version": self.INDEX_VERSION,
+            "log_inode": self._log_inode,
+            "log_size": self._indexed_size,
+            "records": self._records,
+            "offsets": self._offsets,
+        }
+        tmp_path = self.index_path.with_name(f".{self.INDEX_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    # =====================
+    # 压缩
+    # =====================
+
+    def maybe_compact(self) -> bool:
+        """无效记录太多时压缩日志
+
+        Returns:
+            True 如果执行了压缩
+        """
+        with self.locked():
+            self._load_index()
+            garbage = self._records - len(self._offsets)
+            if self._records < self.COMPACT_MIN_RECORDS:
+                return False
+            if garbage / self._records <= self.COMPACT_GARBAGE_RATIO:
+                return False
+            self.compact()
+        return True
+
+    def compact(self) -> int:
+        """只保留每条笔记的最新版本，重写日志
+
+        Returns:
+            压缩后的笔记数量
+        """
+        with self.locked():
+            self._load_index()
+            logger.info(f"压缩日志：{self._records} 条记录 → {len(self._offsets)} 条笔记")
+            return self._rewrite(self.iter_notes())
+
+    def _rewrite(self, notes: Iterable[dict]) -> int:
+        """把笔记写成一份新日志，原子替换旧日志，并写出新索引（在写锁内调用）"""
+        offsets: Dict[str, int] = {}
+        tmp_path = self.log_path.with_name(f".{self.LOG_NAME}.{os.getpid()}.tmp")
+        offset = records = 0
+        with open(tmp_path, "wb") as f:
+            for note in notes:
+                line = (json.dumps({"op": "put", "note": note}, ensure_ascii=False) + "\n").encode("utf-8")
+                f.write(line)
+                # 重复 ID 保留最后一个版本，与日志语义一致
+                offsets.pop(note["id"], None)
+                offsets[note["id"]] = offset
+                offset += len(line)
+                records += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.log_path)
+
+        self._log_inode = self.log_path.stat().st_ino
+        self._offsets = offsets
+        self._indexed_size = offset
+        self._records = records
+        self._write_index_file()
+        return len(offsets)
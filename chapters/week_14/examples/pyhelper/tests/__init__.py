@@ -0,0 +1,7 @@
+"""
+PyHelper 测试包
+
+运行所有测试：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/ -v
+"""
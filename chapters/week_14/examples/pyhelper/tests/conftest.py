@@ -0,0 +1,28 @@
+"""
+共享 fixture 定义
+
+本文件定义了多个测试文件共享的 fixture。
+pytest 会自动发现 conftest.py 中的 fixture。
+
+运行方式：
+  pytest tests/ -v
+"""
+
+import pytest
+
+
+@pytest.fixture
+def sample_notes():
+    """
+    提供示例笔记（与 Note.to_dict() 的格式一致）
+
+    返回包含 3 条笔记的列表，用于多个测试共享
+    """
+    return [
+        {"id": "20260201-090000", "content": "学了异常处理", "tags": ["Python", "基础"],
+         "created_at": "2026-02-01", "status": "draft"},
+        {"id": "20260208-090000", "content": "学了 pytest fixture", "tags": ["测试"],
+         "created_at": "2026-02-08", "status": "published"},
+        {"id": "20260215-090000", "content": "JSON 序列化", "tags": [],
+         "created_at": "2026-02-15", "status": "archived"},
+    ]
@@ -0,0 +1,189 @@
+"""
+多进程同时写入的压力测试
+
+本测试文件演示：
+1. 多个进程同时追加、修改、删除笔记，并不断触发日志压缩，没有任何写入丢失
+2. 批量写入不会被其他进程的追加打断
+3. 多个 `pyhelper add` 同时运行，笔记和 ID 都不重复
+4. 重建搜索索引时不会把另一个进程写到一半的批次记成已索引
+5. 另一个进程压缩日志（换成新文件）后，已加载索引的读取方仍然读到正确的笔记
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_concurrency.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+
+# 导入被测模块
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper.storage import NoteStore
+
+EXAMPLES_DIR = Path(__file__).parent.parent.parent
+SCRIPT = EXAMPLES_DIR / "14_pyhelper_v1.py"
+
+WORKERS = 6
+NOTES_PER_WORKER = 60
+
+# 每个工作进程：追加自己的笔记、全部改成 published、删掉其中五分之一；
+# 压缩阈值调得很低，让压缩（整体重写日志）和其他进程的追加不断交错
+WORKER = """
+import sys
+sys.path.insert(0, {examples!r})
+from pyhelper.storage import NoteStore
+
+NoteStore.COMPACT_MIN_RECORDS = 20
+store = NoteStore({data_dir!r})
+worker = {worker}
+ids = [f"w{{worker}}-{{i:03d}}" for i in range({count})]
+for note_id in ids:
+    store.append({{"id": note_id, "content": note_id, "tags": [], "status": "draft"}})
+for note_id in ids:
+    assert store.update(note_id, status="published") is not None, note_id
+for note_id in ids[::5]:
+    assert store.delete(note_id), note_id
+if worker == 0:
+    batch = [{{"id": f"batch-{{i:03d}}", "content": "批量", "tags": []}} for i in range({count})]
+    store.append_many(batch)
+"""
+
+
+def run_workers(data_dir):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER.format(
+                examples=str(EXAMPLES_DIR), data_dir=str(data_dir),
+                worker=worker, count=NOTES_PER_WORKER)],
+            stderr=subprocess.PIPE, text=True,
+        )
+        for worker in range(WORKERS)
+    ]
+    for proc in procs:
+        _, err = proc.communicate(timeout=120)
+        assert proc.returncode == 0, err
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    """测试并发追加/修改/删除/压缩/批量写入后，每条笔记都是最终状态"""
+    run_workers(tmp_path)
+
+    notes = {note["id"]: note for note in NoteStore(tmp_path).iter_notes()}
+    expected = {
+        f"w{worker}-{i:03d}"
+        for worker in range(WORKERS)
+        for i in range(NOTES_PER_WORKER)
+        if i % 5
+    } | {f"batch-{i:03d}" for i in range(NOTES_PER_WORKER)}
+
+    assert set(notes) == expected
+    assert all(notes[i]["status"] == "published" for i in expected if i.startswith("w"))
+    # 压缩确实发生过：日志记录数远小于写入次数
+    lines = (tmp_path / NoteStore.LOG_NAME).read_text(encoding="utf-8").splitlines()
+    assert len(lines) < WORKERS * NOTES_PER_WORKER * 2
+
+
+def test_concurrent_cli_adds(tmp_path):
+    """测试多个 `pyhelper add` 同时运行：笔记不丢失，ID 不重复"""
+    env = dict(os.environ, HOME=str(tmp_path))
+    procs = [
+        subprocess.Popen(
+            [sys.executable, str(SCRIPT), "add", f"并发笔记 {i}"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        for i in range(12)
+    ]
+    for proc in procs:
+        _, err = proc.communicate(timeout=120)
+        assert proc.returncode == 0, err
+
+    notes = list(NoteStore(tmp_path / ".pyhelper").iter_notes())
+    assert sorted(n["content"] for n in notes) == sorted(f"并发笔记 {i}" for i in range(12))
+    assert len({n["id"] for n in notes}) == 12
+
+
+def test_reads_after_compaction_by_another_store(tmp_path):
+    """测试另一个实例压缩日志后，get/iter_notes 不会把旧偏移用在新文件上"""
+    reader = NoteStore(tmp_path)
+    for i in range(20):
+        reader.append({"id": f"n{i:02d}", "content": f"第 {i} 条", "tags": [], "status": "draft"})
+    for i in range(0, 20, 2):
+        reader.update(f"n{i:02d}", status="published")
+    assert reader.get("n05")["content"] == "第 5 条"  # 索引已加载
+
+    writer = NoteStore(tmp_path)
+    writer.delete("n00")
+    writer.compact()
+
+    assert reader.get("n05")["content"] == "第 5 条"
+    assert reader.get("n04")["status"] == "published"
+    assert reader.get("n00") is None
+    assert [note["id"] for note in reader.iter_notes()] == [f"n{i:02d}" for i in range(1, 20)]
+
+
+# 慢速批量写入：第一条笔记足够长，写出后已经落到文件里，批次却还没有 commit
+SLOW_BATCH = """
+import sys, time
+from pathlib import Path
+sys.path.insert(0, {examples!r})
+from pyhelper.storage import NoteStore
+
+def notes():
+    yield {{"id": "batch-1", "content": "批次笔记 " + "长" * 10000, "tags": []}}
+    Path({flag!r}).touch()
+    time.sleep(1)
+    yield {{"id": "batch-2", "content": "批次笔记", "tags": []}}
+
+NoteStore({data_dir!r}).append_many(notes())
+"""
+
+
+def test_index_rebuild_waits_for_running_batch(tmp_path):
+    """测试搜索索引过期重建时，另一个进程的批次写到一半也不会被漏掉"""
+    env = dict(os.environ, HOME=str(tmp_path))
+    data_dir = tmp_path / ".pyhelper"
+    flag = tmp_path / "started"
+    writer = subprocess.Popen(
+        [sys.executable, "-c", SLOW_BATCH.format(
+            examples=str(EXAMPLES_DIR), data_dir=str(data_dir), flag=str(flag))],
+        stderr=subprocess.PIPE, text=True,
+    )
+    deadline = time.monotonic() + 60
+    while not flag.exists():
+        assert writer.poll() is None and time.monotonic() < deadline
+        time.sleep(0.01)
+
+    # 索引文件不存在：第一次搜索走逐条扫描 + 重建，第二次走增量同步
+    for _ in range(2):
+        result = subprocess.run(
+            [sys.executable, str(SCRIPT), "search", "批次"],
+            env=env, capture_output=True, text=True, check=True,
+        )
+    _, err = writer.communicate(timeout=60)
+    assert writer.returncode == 0, err
+    assert "batch-1" in result.stdout and "batch-2" in result.stdout
+
+
+def test_plan_file_written_atomically(tmp_path):
+    """测试 plan generate 通过临时文件 + 重命名写入，不留下临时文件"""
+    notes_dir = tmp_path / "notes"
+    notes_dir.mkdir()
+    (notes_dir / "week_01.md").write_text("# Week 01：变量\n\n## 变量\n\n学习变量。", encoding="utf-8")
+    output = tmp_path / "out" / "plan.json"
+    env = dict(os.environ, HOME=str(tmp_path))
+
+    subprocess.run(
+        [sys.executable, str(SCRIPT), "plan", "generate", "-n", str(notes_dir), "-o", str(output)],
+        env=env, check=True, capture_output=True,
+    )
+
+    assert isinstance(json.loads(output.read_text(encoding="utf-8")), list)
+    assert [p.name for p in output.parent.iterdir()] == ["plan.json"]
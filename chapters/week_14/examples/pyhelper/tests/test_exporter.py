@@ -0,0 +1,122 @@
+"""
+exporter.py 的 pytest 测试
+
+本测试文件演示：
+1. 各种导出格式的内容（JSON 数组与 json.dump 的输出一致）
+2. gzip 压缩输出，导出的 JSON Lines 可以直接导回
+3. 流式导出：内存占用与笔记数量无关
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_exporter.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import csv
+import gzip
+import json
+import os
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+# 导入被测模块
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper.exporter import WRITERS, open_output
+from pyhelper.importer import iter_records, open_source
+
+
+def export(notes, path, fmt, compress=False):
+    newline = "" if fmt == "csv" else None
+    with open_output(path, compress, newline) as f:
+        return WRITERS[fmt](iter(notes), f)
+
+
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_json_matches_json_dump(tmp_path, sample_notes, count):
+    """测试逐条写出的 JSON 数组与 json.dump(indent=2) 完全一致"""
+    notes = sample_notes[:count]
+    notes[:1] = [dict(n, content="多行\n内容 \"引号\"") for n in notes[:1]]
+    path = tmp_path / "out.json"
+
+    assert export(notes, path, "json") == count
+    assert path.read_text(encoding="utf-8") == json.dumps(notes, ensure_ascii=False, indent=2)
+
+
+def test_csv(tmp_path, sample_notes):
+    """测试 CSV：表头 + 每条笔记一行，标签用逗号连接"""
+    path = tmp_path / "out.csv"
+    export(sample_notes, path, "csv")
+
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["ID", "Content", "Tags", "Created", "Status"]
+    assert rows[1] == ["20260201-090000", "学了异常处理", "Python,基础", "2026-02-01", "draft"]
+    assert len(rows) == 4
+
+
+def test_markdown(tmp_path, sample_notes):
+    """测试 Markdown：状态图标和标签"""
+    path = tmp_path / "out.md"
+    export(sample_notes, path, "markdown")
+    text = path.read_text(encoding="utf-8")
+
+    assert text.startswith("# 学习笔记\n\n## ○ 学了异常处理")
+    assert "## ✓ 学了 pytest fixture" in text
+    assert "**标签**: Python, 基础" in text
+    assert text.count("---") == 3
+
+
+def test_gzip_jsonl_round_trip(tmp_path, sample_notes):
+    """测试压缩的 JSON Lines 可以被导入模块直接读回"""
+    path = tmp_path / "out.jsonl.gz"
+    export(sample_notes, path, "jsonl", compress=True)
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == sample_notes
+    with open_source(str(path)) as f:
+        assert [data for _, data, _ in iter_records(f)] == sample_notes
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl", "csv", "markdown"])
+def test_constant_memory(tmp_path, fmt):
+    """测试导出大量笔记时，内存峰值远小于导出的数据量"""
+    def notes():
+        for i in range(20_000):
+            yield {"id": f"n{i}", "content": f"第 {i} 条笔记 " * 20,
+                   "tags": ["导出"], "created_at": "2026-02-01", "status": "draft"}
+
+    tracemalloc.start()
+    try:
+        export(notes(), tmp_path / f"out.{fmt}", fmt)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # 流式导出只需要输出缓冲区（1 MB）加一条笔记
+    size = (tmp_path / f"out.{fmt}").stat().st_size
+    assert size > 8 * 1024 * 1024
+    assert peak < size / 4
+
+
+def test_cli_export_compress(tmp_path, sample_notes):
+    """测试 export --compress 自动加 .gz，导出的笔记可以原样导回"""
+    script = Path(__file__).parent.parent.parent / "14_pyhelper_v1.py"
+    env = dict(os.environ, HOME=str(tmp_path / "home"))
+
+    def run(*args, stdin=None):
+        return subprocess.run([sys.executable, str(script), *args], env=env,
+                              input=stdin, capture_output=True, text=True, check=True)
+
+    run("import", "-", stdin=json.dumps(sample_notes))
+    result = run("export", "--format", "jsonl", "-o", str(tmp_path / "backup.jsonl"), "--compress")
+
+    assert "已导出 3 条笔记" in result.stdout
+    with gzip.open(tmp_path / "backup.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == sample_notes
@@ -0,0 +1,174 @@
+"""
+ids.py 的 pytest 测试
+
+本测试文件演示：
+1. 同一秒内生成的 ID 互不相同且递增（时钟回拨、夏令时结束时也是）
+2. 多个进程同时生成 ID（文件锁保护的计数器）不会重复
+3. ULID 的格式和进程内单调性
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_ids.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+# 导入被测模块
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper.ids import (
+    CROCKFORD, TimestampIdGenerator, UlidGenerator, iter_ids, make_id_generator,
+)
+
+PACKAGE_DIR = Path(__file__).parent.parent.parent
+
+
+class FakeClock:
+    """可以手动拨动的时钟"""
+
+    def __init__(self, now=1_770_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_same_second_ids_are_unique(tmp_path):
+    """测试同一秒内的 ID 带递增的计数"""
+    clock = FakeClock()
+    gen = TimestampIdGenerator(tmp_path / "ids.state", clock)
+
+    ids = [gen.next_id() for _ in range(3)]
+
+    assert len(set(ids)) == 3
+    assert ids == sorted(ids)
+    assert [i[-4:] for i in ids] == ["0000", "0001", "0002"]
+
+    clock.now += 1
+    assert gen.next_id().endswith("-0000")
+
+
+def test_clock_going_backwards(tmp_path):
+    """测试时钟回拨时 ID 仍然递增"""
+    clock = FakeClock()
+    gen = TimestampIdGenerator(tmp_path / "ids.state", clock)
+    first = gen.next_id()
+
+    clock.now -= 3600
+    assert gen.next_id() > first
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    """把本地时区切换到有夏令时的 America/New_York"""
+    if not Path("/usr/share/zoneinfo/America/New_York").exists():
+        pytest.skip("系统没有时区数据")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_daylight_saving_fall_back(tmp_path, new_york):
+    """测试夏令时结束、本地时间回退一小时后 ID 仍然递增"""
+    clock = FakeClock(1_793_512_799)  # 2026-11-01 01:59:59 EDT
+    gen = TimestampIdGenerator(tmp_path / "ids.state", clock)
+    before = gen.next_id()
+
+    clock.now += 30  # 01:00:29 EST
+    after = gen.next_id()
+
+    assert before == "20261101-015959-0000"
+    assert after == "20261101-015959-0001"
+
+
+def test_corrupted_state_is_ignored(tmp_path):
+    """测试状态文件损坏（或是旧格式）时当作没有状态"""
+    clock = FakeClock()
+    state = tmp_path / "ids.state"
+    gen = TimestampIdGenerator(state, clock)
+    expected = f"{gen.format_time(int(clock.now))}-0000"
+
+    for content in ["乱码", "x 3", "20260201-090000 x", "1770000000 3", "a b c"]:
+        state.write_text(content, encoding="utf-8")
+        assert gen.next_id() == expected
+
+
+def test_counter_overflow_borrows_next_second(tmp_path):
+    """测试同一秒超过计数上限时借用下一秒"""
+    clock = FakeClock()
+    gen = TimestampIdGenerator(tmp_path / "ids.state", clock)
+
+    ids = gen.reserve(10_001)
+
+    assert len(set(ids)) == 10_001
+    assert ids == sorted(ids)
+    assert ids[-1] == f"{TimestampIdGenerator.format_time(int(clock.now) + 1)}-0000"
+    # 之后（同一秒）生成的 ID 接着借来的那一秒继续
+    assert gen.next_id() > ids[-1]
+
+
+def test_state_shared_between_instances(tmp_path):
+    """测试两个生成器共享同一个状态文件（模拟两个进程）"""
+    clock = FakeClock()
+    a = TimestampIdGenerator(tmp_path / "ids.state", clock)
+    b = TimestampIdGenerator(tmp_path / "ids.state", clock)
+
+    assert [a.next_id(), b.next_id(), a.next_id()] == sorted({
+        a.format_time(int(clock.now)) + f"-{i:04d}" for i in range(3)
+    })
+
+
+def test_concurrent_processes(tmp_path):
+    """测试多个进程同时生成 ID 不会重复"""
+    code = (
+        "import sys; "
+        f"sys.path.insert(0, {str(PACKAGE_DIR)!r}); "
+        "from pyhelper.ids import TimestampIdGenerator; "
+        f"gen = TimestampIdGenerator({str(tmp_path / 'ids.state')!r}); "
+        "print('\\n'.join(gen.next_id() for _ in range(200)))"
+    )
+    procs = [
+        subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+        for _ in range(6)
+    ]
+    ids = []
+    for proc in procs:
+        out, _ = proc.communicate(timeout=60)
+        ids.extend(out.split())
+
+    assert len(ids) == 1200
+    assert len(set(ids)) == 1200
+
+
+def test_ulid():
+    """测试 ULID：26 个 Crockford 字符，开头是时间，同一毫秒内递增"""
+    clock = FakeClock()
+    gen = UlidGenerator(clock, randbits=lambda n: b"\xff" * n)
+
+    first, second = gen.next_id(), gen.next_id()  # 第二个让随机部分溢出，借用下一毫秒
+
+    assert len(first) == 26 and set(first) <= set(CROCKFORD)
+    assert first < second
+    ms = sum(CROCKFORD.index(c) << (5 * (9 - i)) for i, c in enumerate(first[:10]))
+    assert ms == int(clock.now * 1000)
+
+
+def test_iter_ids_and_factory(tmp_path):
+    """测试按批预留和按名称创建"""
+    gen = make_id_generator("timestamp", tmp_path / "ids.state")
+    ids = iter_ids(gen, block=2)
+
+    assert len({next(ids) for _ in range(5)}) == 5
+    assert isinstance(make_id_generator("ulid", tmp_path / "x"), UlidGenerator)
+    with pytest.raises(ValueError):
+        make_id_generator("uuid", tmp_path / "x")
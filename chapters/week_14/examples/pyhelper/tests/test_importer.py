@@ -0,0 +1,143 @@
+"""
+importer.py 和 `pyhelper import` 的 pytest 测试
+
+本测试文件演示：
+1. JSON Lines / JSON 数组的流式读取（元素跨越读取块也能解析）
+2. 损坏的行单独报告，不影响其余记录
+3. 命令行批量导入：校验、去重、整批写入
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_importer.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# 导入被测模块
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper import importer
+from pyhelper.importer import iter_records
+from pyhelper.storage import NoteStore
+
+SCRIPT = Path(__file__).parent.parent.parent / "14_pyhelper_v1.py"
+
+
+@pytest.fixture(params=[7, 64 * 1024], ids=["small-chunks", "default-chunks"])
+def chunk_size(request, monkeypatch):
+    """用很小的读取块，覆盖元素被切在两个块之间的情况"""
+    monkeypatch.setattr(importer, "CHUNK_SIZE", request.param)
+
+
+def read(text, fmt="auto"):
+    return list(iter_records(io.StringIO(text), fmt))
+
+
+def test_json_lines(chunk_size, sample_notes):
+    """测试 JSON Lines：空行忽略，坏行单独报告"""
+    lines = [json.dumps(note, ensure_ascii=False) for note in sample_notes]
+    text = "\n".join([lines[0], "", "{坏数据", lines[1], lines[2]])
+
+    records = read(text)
+
+    assert [data for _, data, error in records if error is None] == sample_notes
+    assert [where for where, _, error in records if error] == ["第 3 行"]
+
+
+def test_json_array(chunk_size, sample_notes):
+    """测试 JSON 数组（例如 export --format json 的输出）"""
+    text = json.dumps(sample_notes + [1, True], ensure_ascii=False, indent=2)
+
+    records = read(text)
+
+    assert [data for _, data, _ in records] == sample_notes + [1, True]
+    assert records[0][0] == "第 1 个元素"
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", ""])
+def test_empty_input(text):
+    """测试空数组和空文件"""
+    assert read(text) == []
+
+
+@pytest.mark.parametrize("text", ["[{}", "[{} {}]", "[{}, {坏}]"])
+def test_broken_json_array(chunk_size, text):
+    """测试数组本身格式错误时抛出 ValueError"""
+    with pytest.raises(ValueError):
+        read(text, "json")
+
+
+def run_cli(home, *args, stdin=None):
+    env = dict(os.environ, HOME=str(home))
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), *args],
+        env=env,
+        input=stdin,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_cli_import(tmp_path):
+    """测试批量导入：补齐缺失字段、跳过重复和无效记录"""
+    source = tmp_path / "lectures.jsonl"
+    records = [
+        {"content": "第一讲 变量", "tags": ["讲义"]},
+        {"content": "第二讲 函数"},
+        {"content": "  第一讲 变量  "},                     # 内容重复
+        {"id": "fixed-id", "content": "第三讲 列表", "status": "published"},
+        {"id": "fixed-id", "content": "第三讲 列表（改）"},  # ID 重复
+        {"content": "坏状态", "status": "unknown"},
+        {"tags": ["没有内容"]},
+    ]
+    source.write_text(
+        "\n".join(json.dumps(r, ensure_ascii=False) for r in records), encoding="utf-8")
+
+    result = run_cli(tmp_path, "import", str(source))
+
+    assert result.returncode == 0, result.stdout
+    assert "已导入 3 条笔记" in result.stdout
+    assert "跳过重复：2 条" in result.stdout
+    assert "跳过无效：2 条" in result.stdout
+
+    notes = list(NoteStore(tmp_path / ".pyhelper").iter_notes())
+    assert [n["content"] for n in notes] == ["第一讲 变量", "第二讲 函数", "第三讲 列表"]
+    assert len({n["id"] for n in notes}) == 3
+    assert notes[2]["status"] == "published"
+    assert notes[0]["status"] == "draft" and notes[0]["created_at"]
+
+    # 再导入一次：全部是重复
+    again = run_cli(tmp_path, "add", "--from-file", str(source))
+    assert "已导入 0 条笔记" in again.stdout
+    assert len(list(NoteStore(tmp_path / ".pyhelper").iter_notes())) == 3
+    # 重复记录在日志里只有一条汇总，不逐条记录
+    log = (tmp_path / ".pyhelper" / "pyhelper.log").read_text(encoding="utf-8")
+    assert "重复的笔记 fixed-id" not in log
+    assert "导入时跳过 5 条重复的笔记" in log
+
+
+def test_cli_import_from_stdin(tmp_path, sample_notes):
+    """测试从标准输入导入 JSON 数组"""
+    result = run_cli(tmp_path, "import", "-", stdin=json.dumps(sample_notes))
+
+    assert "已导入 3 条笔记" in result.stdout
+    assert list(NoteStore(tmp_path / ".pyhelper").iter_notes()) == sample_notes
+    assert "学了异常处理" in run_cli(tmp_path, "search", "异常").stdout
+
+
+def test_cli_add_requires_content_or_file(tmp_path):
+    """测试 add 既没有内容也没有 --from-file 时报错"""
+    result = run_cli(tmp_path, "add")
+
+    assert result.returncode == 1
+    assert "--from-file" in result.stdout
@@ -0,0 +1,108 @@
+"""
+note_table.py 的 pytest 测试
+
+本测试文件演示：
+1. 按列存放的笔记可以原样取回（与 Note.to_dict() 格式一致）
+2. 按状态过滤直接在列上完成，标签名只保存一次
+3. 列式存放比逐条保存字典省内存
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_note_table.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+# 导入被测模块
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper.note_table import NoteTable
+
+
+@pytest.fixture
+def table(sample_notes):
+    return NoteTable.from_notes(sample_notes)
+
+
+def test_round_trip(table, sample_notes):
+    """测试逐行取回的笔记与写入时一致"""
+    assert len(table) == 3
+    assert list(table) == sample_notes
+    assert table[1] == sample_notes[1]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_unusual_created_at_is_kept(sample_notes):
+    """测试不是 YYYY-MM-DD 的创建时间原样保留"""
+    notes = [dict(sample_notes[0], created_at="20260201"),
+             dict(sample_notes[1], created_at="上周")]
+    table = NoteTable.from_notes(notes)
+
+    assert [row["created_at"] for row in table] == ["20260201", "上周"]
+
+
+def test_unknown_status_is_rejected(sample_notes):
+    """测试未知状态被拒绝"""
+    with pytest.raises(ValueError):
+        NoteTable().append(dict(sample_notes[0], status="deleted"))
+
+
+def test_filter_by_status(table):
+    """测试按状态过滤"""
+    assert table.indices_by_status("published") == [1]
+    assert table.indices_by_status("draft") == [0]
+    assert NoteTable().indices_by_status("archived") == []
+
+
+def test_tags_are_interned(sample_notes):
+    """测试标签名只保存一次，每条笔记保存标签编号"""
+    notes = sample_notes + [
+        dict(sample_notes[0], id="n4", tags=["测试", "Python"]),
+        dict(sample_notes[0], id="n5", tags=["测试"]),
+    ]
+    table = NoteTable.from_notes(notes)
+
+    assert table.tag_names == ["Python", "基础", "测试"]
+    assert table.tags(3) == ["测试", "Python"]
+    assert table.tags(2) == []
+    assert list(table.tag_values) == [0, 1, 2, 2, 0, 2]
+
+
+def test_find(table, sample_notes):
+    """测试按 ID 查行号（追加后也能找到）"""
+    assert table.find("20260208-090000") == 1
+    table.append(dict(sample_notes[0], id="new"))
+    assert table.find("new") == 3
+    assert table.find("missing") is None
+
+
+def test_uses_less_memory_than_dicts():
+    """测试列式存放的内存远小于逐条保存的字典"""
+    lines = [
+        json.dumps({"id": f"n{i:08d}", "content": f"第 {i} 条笔记", "tags": ["a", "b"],
+                    "created_at": "2026-02-01", "status": "draft"}, ensure_ascii=False)
+        for i in range(20_000)
+    ]
+
+    tracemalloc.start()
+    dicts = [json.loads(line) for line in lines]
+    dict_bytes, _ = tracemalloc.get_traced_memory()
+    del dicts
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = NoteTable.from_notes(json.loads(line) for line in lines)
+    table_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert table_bytes * 3 < dict_bytes
+    assert table.nbytes() <= table_bytes
@@ -0,0 +1,193 @@
+"""
+search_index.py 的 pytest 测试
+
+本测试文件演示：
+1. 中文按字/相邻两字、英文按 1~3 个字符的片段分词
+2. AND / OR / 子串查询，与逐条扫描的 search_notes 语义一致
+3. 从笔记日志增量更新，日志压缩后识别为过期
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_search_index.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+# 导入被测模块
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper.search_index import SearchIndex, parse_query, tokenize
+from pyhelper.storage import NoteStore
+
+
+def make_note(note_id, content, tags=None, status="draft"):
+    return {"id": note_id, "content": content, "tags": tags or [],
+            "created_at": "2026-02-01", "status": status}
+
+
+@pytest.fixture
+def index(tmp_path, sample_notes):
+    """包含示例笔记的索引"""
+    index = SearchIndex(tmp_path / "search_index.json")
+    index.rebuild(sample_notes, (0, 0))
+    return index
+
+
+def search(index, notes, query):
+    """查询并用 matches() 确认候选，返回笔记 ID"""
+    by_id = {note["id"]: note for note in notes}
+    return [i for i in index.search(query) if index.matches(query, by_id[i])]
+
+
+def test_tokenize():
+    """测试中英文分词"""
+    assert tokenize("异常处理") == {"异", "常", "处", "理", "异常", "常处", "处理"}
+    assert tokenize("JSON") == {"j", "s", "o", "n", "js", "so", "on", "jso", "son"}
+    assert tokenize("学 3.11") == {"学", "3", "1", "11"}
+
+
+def test_parse_query():
+    """测试查询解析"""
+    assert parse_query("a b OR c") == [["a", "b"], ["c"]]
+    assert parse_query("pyt*") == [["pyt"]]
+    assert parse_query("  ") == []
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("异常", ["20260201-090000"]),
+    ("pytest", ["20260208-090000"]),
+    ("PYTE", ["20260208-090000"]),                      # 不区分大小写
+    ("ython", ["20260201-090000"]),                     # 子串，不必从词首开始
+    ("test", ["20260208-090000"]),
+    ("st fix", ["20260208-090000"]),
+    ("c++", []),                                        # 标点也要原样出现
+    ("py*", ["20260201-090000", "20260208-090000"]),    # 标签 Python 和内容 pytest
+    ("学了 fixture", ["20260208-090000"]),               # AND
+    ("学了 序列化", []),
+    ("序列化 OR 异常", ["20260201-090000", "20260215-090000"]),
+    ("基础", ["20260201-090000"]),                       # 只出现在标签里
+    ("了异", ["20260201-090000"]),
+    ("异处", []),                                        # 单字都在，但不相邻
+    ("yt.", []),
+    ("", ["20260201-090000", "20260208-090000", "20260215-090000"]),
+])
+def test_search(index, sample_notes, query, expected):
+    """测试查询结果（按添加顺序）"""
+    assert search(index, sample_notes, query) == expected
+
+
+def test_search_matches_scan(tmp_path):
+    """测试索引查询与逐条子串扫描的结果一致"""
+    rng = random.Random(14)
+    words = ["python", "pytest", "json", "csv", "logging", "argparse"]
+    chars = "异常处理测试文件代码收敛学习笔记"
+    notes = []
+    for i in range(300):
+        text = " ".join(rng.choice(words) for _ in range(3))
+        text += "".join(rng.choice(chars) for _ in range(6))
+        notes.append(make_note(f"n{i}", text, [rng.choice(words)]))
+    index = SearchIndex(tmp_path / "idx.json")
+    index.rebuild(notes, (0, 0))
+
+    for query in ["py", "json 异常", "csv OR 收敛", "代码 log", "学习笔记", "arg* 处理 OR js",
+                  "thon", "gging", "on 常", "s.", "e"]:
+        expected = [n["id"] for n in notes if index.matches(query, n)]
+        assert expected == [
+            n["id"] for n in notes
+            if any(all(term.rstrip("*").lower() in (n["content"] + "\n" + n["tags"][0]).lower()
+                       for term in group.split())
+                   for group in query.split(" OR "))
+        ]
+        assert search(index, notes, query) == expected
+
+
+def test_update_and_remove(index, sample_notes):
+    """测试修改内容和删除只影响相关的词"""
+    note = dict(sample_notes[0], content="学了倒排索引")
+    index.add(note)
+    index.remove("20260208-090000")
+    notes = [note] + sample_notes[1:]
+
+    assert search(index, notes, "异常") == []
+    assert search(index, notes, "倒排") == ["20260201-090000"]
+    assert search(index, notes, "pytest") == []
+    assert len(index) == 2
+
+
+def test_save_and_load(index, tmp_path, sample_notes):
+    """测试索引保存后重新加载"""
+    loaded = SearchIndex(tmp_path / "search_index.json")
+
+    assert loaded.load() is True
+    assert loaded.search("py") == index.search("py")
+    assert loaded.position == (0, 0)
+
+
+def test_update_after_load(index, tmp_path, sample_notes):
+    """测试从磁盘加载的索引也能增量修改和删除"""
+    index.remove("20260208-090000")
+    index.save()
+    loaded = SearchIndex(tmp_path / "search_index.json")
+    loaded.load()
+
+    loaded.add(dict(sample_notes[0], content="学了倒排索引"))
+    loaded.add(dict(sample_notes[2], status="published"))
+
+    assert loaded.search("异常") == []
+    assert loaded.search("倒排") == ["20260201-090000"]
+    assert loaded.search("序列化") == ["20260215-090000"]
+    assert loaded.search("") == ["20260201-090000", "20260215-090000"]
+
+
+def test_load_missing_or_corrupted(tmp_path):
+    """测试索引文件不存在或损坏"""
+    path = tmp_path / "search_index.json"
+    assert SearchIndex(path).load() is False
+    path.write_text("{坏数据", encoding="utf-8")
+    assert SearchIndex(path).load() is False
+    # 合法的 JSON，但不是索引的结构
+    for content in ["[]", "null", f'{{"version": {SearchIndex.VERSION}}}',
+                    f'{{"version": {SearchIndex.VERSION}, "ids": [], "digests": [], '
+                    f'"postings": {{}}, "position": 3}}']:
+        path.write_text(content, encoding="utf-8")
+        assert SearchIndex(path).load() is False
+
+
+def test_sync_from_store(tmp_path, sample_notes):
+    """测试索引从笔记日志增量追赶"""
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[0])
+    index = SearchIndex(tmp_path / "search_index.json")
+    index.rebuild(store.iter_notes(), store.position())
+
+    store.append(sample_notes[1])
+    store.update("20260201-090000", content="改成 json")
+    store.delete("20260208-090000")
+
+    assert index.sync(store) is True
+    assert index.search("pytest") == []
+    assert index.search("json") == ["20260201-090000"]
+    assert index.search("异常") == []
+    assert index.position == store.position()
+
+
+def test_sync_detects_compaction(tmp_path, sample_notes):
+    """测试日志被压缩（换了新文件）后索引判定为过期"""
+    store = NoteStore(tmp_path)
+    for note in sample_notes:
+        store.append(note)
+    index = SearchIndex(tmp_path / "search_index.json")
+
+    assert index.sync(store) is False  # 从未建立
+
+    index.rebuild(store.iter_notes(), store.position())
+    store.compact()
+
+    assert index.sync(store) is False
@@ -0,0 +1,159 @@
+"""
+sqlite_store.py 的 pytest 测试
+
+本测试文件演示：
+1. SQLite 后端与 JSON 后端接口一致
+2. FTS5 搜索与原来的逐条扫描结果相同
+3. 按状态过滤、统计走数据库查询
+4. 往大库里少量导入时逐条维护全文索引，不重建整张表
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_sqlite_store.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+from pathlib import Path
+
+import pytest
+
+# 导入被测模块
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper.sqlite_store import SQLiteNoteStore
+
+
+@pytest.fixture
+def store(tmp_path, sample_notes):
+    """写入示例笔记的 SQLite 存储"""
+    store = SQLiteNoteStore(tmp_path / "notes.db")
+    store.append_many(sample_notes)
+    yield store
+    store.close()
+
+
+def scan_search(notes, keyword):
+    """原来 search_notes 的逐条扫描语义，作为对照"""
+    keyword_lower = keyword.lower()
+    return [
+        note for note in notes
+        if keyword_lower in note["content"].lower()
+        or any(keyword_lower in tag.lower() for tag in note["tags"])
+    ]
+
+
+def test_round_trip(store, sample_notes):
+    """测试写入的笔记按添加顺序读回"""
+    assert list(store.iter_notes()) == sample_notes
+    assert len(store) == 3
+    assert store.get("20260208-090000") == sample_notes[1]
+    assert store.get("不存在") is None
+
+
+def test_update_keeps_order(store, sample_notes):
+    """测试修改状态后笔记仍在原来的位置"""
+    updated = store.update("20260201-090000", status="archived")
+
+    assert updated["status"] == "archived"
+    assert [n["id"] for n in store.iter_notes()] == [n["id"] for n in sample_notes]
+    assert store.update("不存在", status="draft") is None
+
+
+def test_delete(store):
+    """测试删除笔记（标签一并删除）"""
+    assert store.delete("20260201-090000") is True
+    assert store.delete("20260201-090000") is False
+    assert "20260201-090000" not in store
+    assert dict(store.top_tags()) == {"测试": 1}
+
+
+@pytest.mark.parametrize("keyword", [
+    "异常",             # 短关键词：LIKE
+    "pytest",           # 长关键词：FTS5
+    "PYTEST",           # 不区分大小写
+    "序列化",
+    "基础",             # 只出现在标签里
+    "Python",
+    "st fix",           # 跨单词的子串
+    '"',                # FTS 语法字符
+    "100%",             # LIKE 通配符
+    "不存在的内容",
+    "",
+])
+def test_search_matches_scan(store, sample_notes, keyword):
+    """测试搜索结果与逐条扫描一致"""
+    assert store.search(keyword) == scan_search(sample_notes, keyword)
+
+
+def test_search_sees_updates(store):
+    """测试修改内容后全文索引同步更新"""
+    note = store.get("20260215-090000")
+    note["content"] = "学了 SQLite 全文索引"
+    store.append(note)
+
+    assert [n["id"] for n in store.search("sqlite")] == ["20260215-090000"]
+    assert store.search("序列化") == []
+
+
+def test_iter_by_status(store):
+    """测试按状态过滤"""
+    assert [n["id"] for n in store.iter_by_status("published")] == ["20260208-090000"]
+    assert list(store.iter_by_status("deleted")) == []
+
+
+def test_stats_queries(store, sample_notes):
+    """测试状态计数、热门标签和每天新增"""
+    store.append({"id": "x", "content": "再学 pytest", "tags": ["测试"],
+                  "created_at": "2026-02-15", "status": "draft"})
+
+    assert store.count_by_status() == {"draft": 2, "published": 1, "archived": 1}
+    assert store.top_tags(2) == [("测试", 2), ("Python", 1)]
+    assert store.count_by_day() == {"2026-02-01": 1, "2026-02-08": 1, "2026-02-15": 2}
+
+
+def test_replace_all(store, sample_notes):
+    """测试整体替换"""
+    assert store.replace_all(sample_notes[:1]) == 1
+    assert list(store.iter_notes()) == sample_notes[:1]
+    assert store.search("pytest") == []
+
+
+def make_notes(prefix, count):
+    return [
+        {"id": f"{prefix}-{i}", "content": f"{prefix} 笔记 {i}", "tags": [prefix],
+         "created_at": "2026-02-01", "status": "draft"}
+        for i in range(count)
+    ]
+
+
+def test_small_import_does_not_rebuild_index(tmp_path):
+    """测试导入的笔记比已有的少时，不触发整表 rebuild，索引仍然正确"""
+    store = SQLiteNoteStore(tmp_path / "notes.db")
+    store.append_many(make_notes("旧笔记", 20))
+    statements = []
+    store.conn.set_trace_callback(statements.append)
+
+    store.append_many(make_notes("新笔记", 3))
+
+    assert not any("'rebuild'" in sql for sql in statements)
+    assert len(store.search("新笔记")) == 3
+    assert len(store.search("旧笔记")) == 20
+    store.close()
+
+
+def test_large_import_rebuilds_index(tmp_path):
+    """测试导入的笔记超过已有的数量时改为一次性 rebuild"""
+    store = SQLiteNoteStore(tmp_path / "notes.db")
+    store.append_many(make_notes("旧笔记", 3))
+    statements = []
+    store.conn.set_trace_callback(statements.append)
+
+    store.append_many(make_notes("新笔记", 10) + make_notes("旧笔记", 1))
+
+    assert sum("'rebuild'" in sql for sql in statements) == 1
+    assert len(store.search("新笔记")) == 10
+    assert len(store.search("旧笔记")) == 3
+    store.close()
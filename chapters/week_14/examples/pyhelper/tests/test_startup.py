@@ -0,0 +1,126 @@
+"""
+14_pyhelper_v1.py 启动速度的回归测试
+
+pyhelper 会在命令行提示符、编辑器钩子里被频繁调用，冷启动的每一毫秒都算数。
+本测试用 `python -X importtime` 检查 `pyhelper list`：
+1. 不导入只有其他子命令才需要的模块（csv、sqlite3、倒排索引……）
+2. 脚本自身引入的模块导入总耗时不超过预算
+3. 导入脚本、`--help` 不会创建 ~/.pyhelper 或打开日志文件
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_startup.py -v
+
+预算可以用环境变量 PYHELPER_IMPORT_BUDGET_MS 调整（较慢的机器上）。
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent.parent / "14_pyhelper_v1.py"
+
+# `pyhelper list` 自身引入的模块导入总耗时上限（毫秒）
+IMPORT_BUDGET_MS = float(os.environ.get("PYHELPER_IMPORT_BUDGET_MS", "80"))
+
+# `list` 用不到、必须延迟导入的模块
+LAZY_MODULES = [
+    "csv",
+    "datetime",
+    "sqlite3",
+    "pyhelper.search_index",
+    "pyhelper.sqlite_store",
+]
+
+
+def run_python(home, *args):
+    """用独立的 HOME 运行 Python（允许写 .pyc，和真实使用时一致）"""
+    env = dict(os.environ, HOME=str(home))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable, *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_importtime(stderr):
+    """解析 -X importtime 输出
+
+    Returns:
+        {模块名: (累计耗时微秒, 是否顶层导入)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(cumulative), not name.startswith("  "))
+    return modules
+
+
+@pytest.fixture(scope="module")
+def list_imports(tmp_path_factory):
+    """`pyhelper list` 和空解释器各自导入的模块"""
+    home = tmp_path_factory.mktemp("home")
+    # 第一次运行生成 .pyc，第二次才是要测的冷启动
+    run_python(home, str(SCRIPT), "list")
+    result = run_python(home, "-X", "importtime", str(SCRIPT), "list")
+    baseline = run_python(home, "-X", "importtime", "-c", "pass")
+    return parse_importtime(result.stderr), parse_importtime(baseline.stderr)
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_list_skips_lazy_modules(list_imports, module):
+    """测试 list 不导入其他子命令才需要的模块"""
+    imported, _ = list_imports
+    assert module not in imported
+
+
+def test_list_import_budget(list_imports):
+    """测试 list 的导入耗时在预算之内（不计解释器自身启动导入的模块）"""
+    imported, baseline = list_imports
+    own = {
+        name: cumulative
+        for name, (cumulative, top_level) in imported.items()
+        if top_level and name not in baseline
+    }
+    total_ms = sum(own.values()) / 1000
+    slowest = sorted(own.items(), key=lambda item: -item[1])[:5]
+    assert total_ms <= IMPORT_BUDGET_MS, f"导入耗时 {total_ms:.1f} ms，最慢：{slowest}"
+
+
+def test_import_has_no_side_effects(tmp_path):
+    """测试导入脚本不会创建 ~/.pyhelper"""
+    code = (
+        "import importlib.util, sys; "
+        f"sys.path.insert(0, {str(SCRIPT.parent)!r}); "
+        f"spec = importlib.util.spec_from_file_location('pyhelper_v1', {str(SCRIPT)!r}); "
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+    )
+    run_python(tmp_path, "-c", code)
+
+    assert not (tmp_path / ".pyhelper").exists()
+
+
+def test_help_has_no_side_effects(tmp_path):
+    """测试 --help 不会创建 ~/.pyhelper 或日志文件"""
+    result = run_python(tmp_path, str(SCRIPT), "--help")
+
+    assert "PyHelper" in result.stdout
+    assert not (tmp_path / ".pyhelper").exists()
+
+
+def test_list_still_works(tmp_path):
+    """测试延迟导入之后 add/list/search 照常工作"""
+    run_python(tmp_path, str(SCRIPT), "add", "学了延迟导入", "--tags", "startup")
+    result = run_python(tmp_path, str(SCRIPT), "list")
+
+    assert "学了延迟导入" in result.stdout
+    assert "学了延迟导入" in run_python(tmp_path, str(SCRIPT), "search", "延迟").stdout
+    assert (tmp_path / ".pyhelper" / "pyhelper.log").exists()
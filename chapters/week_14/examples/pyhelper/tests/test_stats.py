@@ -0,0 +1,134 @@
+"""
+stats.py 和 `pyhelper stats` 的 pytest 测试
+
+本测试文件演示：
+1. 一遍扫描建立汇总：状态、标签、每天新增
+2. 按天/周/月合并计数
+3. 写入笔记时增量更新汇总，结果与重新扫描一致
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_stats.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+# 导入被测模块
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper.stats import StatsRollup, bucket_counts
+
+SCRIPT = Path(__file__).parent.parent.parent / "14_pyhelper_v1.py"
+
+
+@pytest.fixture
+def rollup(tmp_path, sample_notes):
+    rollup = StatsRollup(tmp_path / "stats.json")
+    rollup.rebuild(sample_notes, (1, 100))
+    return rollup
+
+
+def test_summary(rollup):
+    """测试总数、各状态数量和热门标签"""
+    assert rollup.summary() == {
+        "total": 3, "draft": 1, "published": 1, "archived": 1,
+        "top_tags": {"Python": 1, "基础": 1, "测试": 1},
+    }
+    assert list(rollup.summary(top=1)["top_tags"]) == ["Python"]  # 次数相同时先出现的在前
+
+
+def test_add_and_remove(rollup, sample_notes):
+    """测试修改状态（扣旧版本、加新版本）和删除"""
+    rollup.add(dict(sample_notes[0], status="published"))
+    rollup.remove(sample_notes[0])
+    rollup.remove(sample_notes[1])
+
+    summary = rollup.summary()
+    assert (summary["total"], summary["draft"], summary["published"]) == (2, 0, 1)
+    assert summary["top_tags"] == {"Python": 1, "基础": 1}
+    assert "2026-02-08" not in rollup.days  # 计数归零的键被删掉
+
+
+def test_save_and_load(rollup, tmp_path):
+    """测试汇总保存后重新加载"""
+    loaded = StatsRollup(tmp_path / "stats.json")
+
+    assert loaded.load() is True
+    assert loaded.summary() == rollup.summary()
+    assert loaded.position == (1, 100)
+    assert StatsRollup(tmp_path / "missing.json").load() is False
+
+
+@pytest.mark.parametrize("content", [
+    "{坏数据", "[]", "null",
+    f'{{"version": {StatsRollup.VERSION}}}',
+    f'{{"version": {StatsRollup.VERSION}, "total": 1, "statuses": {{}}, '
+    f'"tags": {{}}, "days": {{}}, "position": 5}}',
+])
+def test_load_corrupted(tmp_path, content):
+    """测试汇总文件损坏、不是汇总的结构时判定为需要重建"""
+    path = tmp_path / "stats.json"
+    path.write_text(content, encoding="utf-8")
+    assert StatsRollup(path).load() is False
+
+
+@pytest.mark.parametrize("period, expected", [
+    ("day", [("2026-02-01", 2), ("2026-02-09", 1), ("2026-03-01", 1), ("其他", 1)]),
+    ("week", [("2026-W05", 1), ("2026-W06", 1), ("2026-W07", 1), ("2026-W09", 1), ("其他", 1)]),
+    ("month", [("2026-02", 3), ("2026-03", 1), ("其他", 1)]),
+])
+def test_bucket_counts(period, expected):
+    """测试按天/周/月合并（ISO 周，不是日期的归入"其他"）"""
+    days = {"2026-03-01": 1, "2026-02-01": 2, "上周": 1, "2026-02-09": 1}
+    if period == "week":
+        days = {"2026-02-01": 1, "2026-02-02": 1, "2026-02-09": 1, "2026-03-01": 1, "": 1}
+    assert bucket_counts(days, period) == expected
+
+
+def run_cli(home, *args):
+    env = dict(os.environ, HOME=str(home))
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), *args],
+        env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def stats_json(home):
+    output = run_cli(home, "stats", "--json", "--by", "day").stdout
+    return json.loads(output[output.index("{"):])
+
+
+def test_cli_stats_updated_incrementally(tmp_path, sample_notes):
+    """测试 add/status/import 增量更新汇总，结果与删掉汇总重新扫描一致"""
+    run_cli(tmp_path, "add", "第一条", "--tags", "a")
+    stats_json(tmp_path)  # 建立汇总
+    stats_file = tmp_path / ".pyhelper" / "stats.json"
+    log_file = tmp_path / ".pyhelper" / "notes.jsonl"
+
+    source = tmp_path / "notes.json"
+    notes = sample_notes + [{"content": "第二条", "tags": ["a", "b"]}]
+    source.write_text(json.dumps(notes, ensure_ascii=False), encoding="utf-8")
+    run_cli(tmp_path, "import", str(source))
+    note_id = json.loads(log_file.read_text(encoding="utf-8").splitlines()[0])["note"]["id"]
+    run_cli(tmp_path, "status", note_id, "published")
+
+    # 汇总已经跟上日志：stats 不需要重新扫描
+    saved = json.loads(stats_file.read_text(encoding="utf-8"))
+    assert saved["position"][1] == log_file.stat().st_size
+    warm = stats_json(tmp_path)
+
+    stats_file.unlink()
+    cold = stats_json(tmp_path)
+
+    assert warm == cold
+    assert (warm["total"], warm["published"]) == (5, 2)
+    assert warm["top_tags"]["a"] == 2
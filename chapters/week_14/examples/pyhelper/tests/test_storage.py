@@ -0,0 +1,246 @@
+"""
+storage.py 的 pytest 测试
+
+本测试文件演示：
+1. 追加写日志：添加笔记不重写已有数据
+2. 偏移索引：按 ID 查找、修改状态、删除
+3. 压缩和旧 notes.json 的自动迁移
+4. 批量写入：整批提交，中途失败不留下半批数据
+
+运行方式：
+  cd chapters/week_14/examples/pyhelper
+  pytest tests/test_storage.py -v
+
+预期输出：
+  所有测试通过（绿色小点）
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+# 导入被测模块
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pyhelper.storage import NoteStore
+
+
+def test_append_and_iter_notes(tmp_path, sample_notes):
+    """测试追加的笔记按添加顺序读回"""
+    store = NoteStore(tmp_path)
+    for note in sample_notes:
+        store.append(note)
+
+    assert list(NoteStore(tmp_path).iter_notes()) == sample_notes
+    assert len(store) == 3
+
+
+def test_append_does_not_rewrite_log(tmp_path, sample_notes):
+    """测试添加笔记只在日志末尾追加"""
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[0])
+    before = store.log_path.read_bytes()
+
+    NoteStore(tmp_path).append(sample_notes[1])
+
+    assert store.log_path.read_bytes().startswith(before)
+
+
+def test_get_by_id(tmp_path, sample_notes):
+    """测试按 ID 查找笔记"""
+    store = NoteStore(tmp_path)
+    for note in sample_notes:
+        store.append(note)
+
+    store = NoteStore(tmp_path)
+    assert store.get("20260208-090000") == sample_notes[1]
+    assert store.get("不存在") is None
+    assert "20260215-090000" in store
+
+
+def test_update_status_keeps_order(tmp_path, sample_notes):
+    """测试修改状态后笔记仍在原来的位置"""
+    store = NoteStore(tmp_path)
+    for note in sample_notes:
+        store.append(note)
+
+    updated = store.update("20260201-090000", status="published")
+
+    assert updated["status"] == "published"
+    notes = list(NoteStore(tmp_path).iter_notes())
+    assert [n["id"] for n in notes] == [n["id"] for n in sample_notes]
+    assert notes[0]["status"] == "published"
+
+
+def test_update_missing_note(tmp_path):
+    """测试修改不存在的笔记返回 None"""
+    assert NoteStore(tmp_path).update("不存在", status="draft") is None
+
+
+def test_delete(tmp_path, sample_notes):
+    """测试删除笔记"""
+    store = NoteStore(tmp_path)
+    for note in sample_notes:
+        store.append(note)
+
+    assert store.delete("20260208-090000") is True
+    assert store.delete("20260208-090000") is False
+    assert [n["id"] for n in NoteStore(tmp_path).iter_notes()] == [
+        "20260201-090000", "20260215-090000"
+    ]
+
+
+def test_index_catches_up_with_other_writers(tmp_path, sample_notes):
+    """测试索引加载后，另一个实例追加的笔记也能查到"""
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[0])
+    assert len(store) == 1
+
+    NoteStore(tmp_path).append(sample_notes[1])
+    store.append(sample_notes[2])
+
+    assert store.get("20260208-090000") == sample_notes[1]
+    assert len(store) == 3
+
+
+def test_stale_index_is_rebuilt(tmp_path, sample_notes):
+    """测试索引文件损坏时重新扫描日志"""
+    store = NoteStore(tmp_path)
+    store.replace_all(sample_notes)
+    store.index_path.write_text("不是 JSON", encoding="utf-8")
+
+    assert list(NoteStore(tmp_path).iter_notes()) == sample_notes
+
+
+@pytest.mark.parametrize("content", [
+    "[]", "null", '{{"version": 1}}',
+    '{{"version": 1, "log_inode": {inode}, "log_size": "10", "records": 3, "offsets": {{}}}}',
+    '{{"version": 1, "log_inode": {inode}, "log_size": 10, "records": 3, "offsets": []}}',
+    '{{"version": 1, "log_inode": {inode}, "log_size": 10, "records": 3}}',
+])
+def test_index_file_with_wrong_structure_is_rebuilt(tmp_path, sample_notes, content):
+    """测试索引文件是合法 JSON 但结构不对时，同样重新扫描日志"""
+    store = NoteStore(tmp_path)
+    store.replace_all(sample_notes)
+    inode = store.log_path.stat().st_ino
+    store.index_path.write_text(content.format(inode=inode), encoding="utf-8")
+
+    assert list(NoteStore(tmp_path).iter_notes()) == sample_notes
+
+
+def test_torn_last_line_is_ignored(tmp_path, sample_notes):
+    """测试写入中途崩溃留下的半行不影响读取和后续追加"""
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[0])
+    with open(store.log_path, "ab") as f:
+        f.write(b'{"op": "put", "note": {"id": "x"')
+
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[1])
+
+    assert list(NoteStore(tmp_path).iter_notes()) == sample_notes[:2]
+
+
+def test_compact_drops_old_versions(tmp_path, sample_notes, monkeypatch):
+    """测试无效记录过多时自动压缩"""
+    monkeypatch.setattr(NoteStore, "COMPACT_MIN_RECORDS", 4)
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[0])
+    for status in ["published", "archived", "draft"]:
+        store.update("20260201-090000", status=status)
+
+    lines = store.log_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["note"]["status"] == "draft"
+    assert NoteStore(tmp_path).get("20260201-090000")["status"] == "draft"
+
+
+def test_migrate_legacy_notes_json(tmp_path, sample_notes):
+    """测试旧的 notes.json 在第一次使用时自动迁移"""
+    legacy = tmp_path / "notes.json"
+    legacy.write_text(json.dumps(sample_notes, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    store = NoteStore(tmp_path)
+
+    assert list(store.iter_notes()) == sample_notes
+    assert not legacy.exists()
+    assert (tmp_path / "notes.json.bak").exists()
+
+
+def test_corrupted_legacy_file_is_kept(tmp_path):
+    """测试损坏的 notes.json 不会被迁移覆盖"""
+    legacy = tmp_path / "notes.json"
+    legacy.write_text("[{坏数据", encoding="utf-8")
+
+    assert list(NoteStore(tmp_path).iter_notes()) == []
+    assert legacy.read_text(encoding="utf-8") == "[{坏数据"
+
+
+def test_append_requires_id(tmp_path):
+    """测试缺少 id 的笔记被拒绝"""
+    with pytest.raises(ValueError):
+        NoteStore(tmp_path).append({"content": "没有 ID"})
+
+
+def test_append_many(tmp_path, sample_notes):
+    """测试批量写入整批可见，并能被新的实例读回"""
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[0])
+
+    assert store.append_many(iter(sample_notes[1:])) == 2
+    assert list(store.iter_notes()) == sample_notes
+    assert list(NoteStore(tmp_path).iter_notes()) == sample_notes
+
+
+def test_append_many_updates_loaded_index_without_rereading(tmp_path, sample_notes, monkeypatch):
+    """测试索引已加载时，批量写入直接记下偏移，不把刚写的记录读回来"""
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[0])
+    assert len(store) == 1  # 加载索引
+
+    monkeypatch.setattr(NoteStore, "_iter_log", lambda self, start: pytest.fail("不应重新扫描日志"))
+    updated = dict(sample_notes[0], status="published")
+    assert store.append_many([updated] + sample_notes[1:]) == 3
+    monkeypatch.undo()
+
+    fresh = NoteStore(tmp_path)
+    fresh._load_index()
+    assert store._offsets == fresh._offsets
+    assert (store._indexed_size, store._records) == (fresh._indexed_size, fresh._records)
+    assert list(store.iter_notes()) == [updated] + sample_notes[1:]
+
+
+def test_append_many_failure_leaves_no_trace(tmp_path, sample_notes):
+    """测试批量写入中途出错时，已写出的部分被撤掉"""
+    store = NoteStore(tmp_path)
+    store.append(sample_notes[0])
+    size = store.log_path.stat().st_size
+
+    def notes():
+        yield sample_notes[1]
+        raise RuntimeError("输入中断")
+
+    with pytest.raises(RuntimeError):
+        store.append_many(notes())
+
+    assert store.log_path.stat().st_size == size
+    assert list(NoteStore(tmp_path).iter_notes()) == sample_notes[:1]
+
+
+def test_uncommitted_batch_is_ignored(tmp_path, sample_notes):
+    """测试崩溃留下的未提交批次被忽略，之后的写入照常可见"""
+    store = NoteStore(tmp_path)
+    store.append_many(sample_notes[:1])
+    # 模拟写到一半时进程被杀：只有 begin 和部分 put，没有 commit
+    with open(store.log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "begin", "batch": 1}) + "\n")
+        f.write(json.dumps({"op": "put", "batch": 1, "note": sample_notes[1]}) + "\n")
+
+    assert [n["id"] for n in NoteStore(tmp_path).iter_notes()] == ["20260201-090000"]
+
+    NoteStore(tmp_path).append(sample_notes[2])
+
+    assert [n["id"] for n in NoteStore(tmp_path).iter_notes()] == [
+        "20260201-090000", "20260215-090000"]
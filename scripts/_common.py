@@ -9,6 +9,7 @@ from __future__ import annotations
 import os
 import re
 import sys
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -95,8 +96,27 @@ def read_current_week(root: Path | None = None) -> str | None:
 # YAML helpers
 # ---------------------------------------------------------------------------
 
+# Process-wide registry of parsed YAML documents, keyed by resolved path and
+# validated against (mtime_ns, size) on every lookup.  The parsed objects are
+# shared between callers: treat them as read-only, or call invalidate_yaml()
+# after mutating one and writing it back to disk.
+_YAML_CACHE: dict[Path, tuple[int, int, Any]] = {}
+_YAML_CACHE_LOCK = threading.Lock()
+
+
+def _yaml_loader() -> Any:
+    """Return the fastest safe PyYAML loader (libyaml's ``CSafeLoader`` when built in)."""
+    import yaml  # type: ignore
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 def load_yaml(path: Path) -> Any:
-    """Load a YAML file, raising ``RuntimeError`` with a helpful message on failure."""
+    """Load a YAML file, raising ``RuntimeError`` with a helpful message on failure.
+
+    Results are memoised per process; a file is only re-parsed when its
+    modification time or size changes (or after :func:`invalidate_yaml`).
+    """
     try:
         import yaml  # type: ignore
     except ModuleNotFoundError:
@@ -105,15 +125,44 @@ def load_yaml(path: Path) -> Any:
             "  python3 -m pip install -r requirements-dev.txt\n"
             "  (or: bash scripts/setup_env.sh)"
         )
+    key = Path(path).resolve()
+    try:
+        st = key.stat()
+    except FileNotFoundError:
+        raise RuntimeError(f"missing required file: {path}")
+
+    with _YAML_CACHE_LOCK:
+        cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
     try:
-        raw = path.read_text(encoding="utf-8")
+        raw = key.read_text(encoding="utf-8")
     except FileNotFoundError:
         raise RuntimeError(f"missing required file: {path}")
     try:
-        return yaml.safe_load(raw)
+        data = yaml.load(raw, Loader=_yaml_loader())
     except Exception as e:  # pragma: no cover – PyYAML exception types vary
         raise RuntimeError(f"failed to parse YAML ({path}): {e}")
 
+    with _YAML_CACHE_LOCK:
+        _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def invalidate_yaml(path: Path | None = None) -> None:
+    """Drop the memoised parse of *path* (or of every file when *path* is None).
+
+    Call this after writing a YAML file that may have been loaded earlier in
+    the same process — the mtime check alone can miss a rewrite that keeps
+    the size and lands within the filesystem's timestamp granularity.
+    """
+    with _YAML_CACHE_LOCK:
+        if path is None:
+            _YAML_CACHE.clear()
+        else:
+            _YAML_CACHE.pop(Path(path).resolve(), None)
+
 
 def dump_yaml(data: Any) -> str:
     """Dump data to a YAML string (unicode-safe, preserves key order)."""
@@ -13,7 +13,7 @@ import sys
 from datetime import date
 from pathlib import Path
 
-from _common import dump_yaml, load_yaml, normalize_week, repo_root
+from _common import dump_yaml, invalidate_yaml, load_yaml, normalize_week, repo_root
 
 
 # ---------------------------------------------------------------------------
@@ -29,6 +29,8 @@ def _merge_terms_into_glossary(root: Path, week: str) -> None:
     glossary = load_yaml(glossary_path) or []
     if not isinstance(terms, list) or not isinstance(glossary, list):
         raise RuntimeError("TERMS.yml and shared/glossary.yml must both be YAML lists")
+    # load_yaml() returns a shared memoised object; extend a copy instead.
+    glossary = list(glossary)
 
     glossary_terms: set[str] = set()
     for entry in glossary:
@@ -48,6 +50,7 @@ def _merge_terms_into_glossary(root: Path, week: str) -> None:
     if changed:
         glossary.sort(key=lambda x: x.get("term_zh", "") if isinstance(x, dict) else "")
         glossary_path.write_text(dump_yaml(glossary), encoding="utf-8")
+        invalidate_yaml(glossary_path)
 
 
 def _extract_title_from_chapter(chapter_path: Path, fallback: str) -> str:
@@ -4,13 +4,15 @@
 Usage:
     python3 scripts/validate_book.py --mode fast
     python3 scripts/validate_book.py --mode release --strict --verbose
+    python3 scripts/validate_book.py --mode release --jobs 4
 """
 from __future__ import annotations
 
 import argparse
+import os
 import re
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from _common import (
@@ -21,6 +23,7 @@ from _common import (
     set_verbose,
     verbose,
 )
+from validate_week import run_checks
 
 
 # ---------------------------------------------------------------------------
@@ -116,18 +119,35 @@ def _extract_chapter_heading(chapter_path: Path) -> str | None:
 # Validation runners
 # ---------------------------------------------------------------------------
 
-def _run_validate_week(root: Path, week: str, mode: str, errors: list[str]) -> None:
-    cmd = [sys.executable, str(root / "scripts" / "validate_week.py"), "--week", week, "--mode", mode]
-    verbose(f"running: {' '.join(cmd)}")
-    proc = subprocess.run(cmd, cwd=root, text=True, capture_output=True)
-    if proc.returncode != 0:
-        add_error(errors, f"validate_week failed for {week} (mode={mode})")
-        if proc.stdout.strip():
-            add_error(errors, "validate_week stdout:\n" + proc.stdout.rstrip())
-        if proc.stderr.strip():
-            add_error(errors, "validate_week stderr:\n" + proc.stderr.rstrip())
+def _validate_week_in_process(root: Path, week: str, mode: str, use_cache: bool) -> list[str]:
+    """Run ``validate_week`` checks for one week, turning crashes into error lines."""
+    try:
+        return run_checks(root, week, mode, use_cache=use_cache)
+    except Exception as e:  # a broken week must not take the whole book run down
+        return [f"- unexpected error while validating {week}: {type(e).__name__}: {e}"]
+
+
+def _run_validate_weeks(
+    root: Path, weeks: list[str], mode: str, jobs: int, use_cache: bool, errors: list[str]
+) -> None:
+    """Validate *weeks* in-process over a thread pool and report results in week order.
+
+    The file/YAML checks are I/O bound and run on the pool's threads; the
+    release-mode pytest gate already runs as a child process, so several
+    weeks' pytest runs proceed in parallel as separate processes.
+    """
+    if jobs <= 1 or len(weeks) <= 1:
+        results = [_validate_week_in_process(root, week, mode, use_cache) for week in weeks]
     else:
-        verbose(f"validate_week OK: {week}")
+        with ThreadPoolExecutor(max_workers=min(jobs, len(weeks))) as pool:
+            results = list(pool.map(lambda w: _validate_week_in_process(root, w, mode, use_cache), weeks))
+
+    for week, week_errors in zip(weeks, results):
+        if week_errors:
+            add_error(errors, f"validate_week failed for {week} (mode={mode})")
+            errors.extend(f"  {e}" for e in week_errors)
+        else:
+            verbose(f"validate_week OK: {week}")
 
 
 def _check_glossary(root: Path, expected_weeks: set[str], errors: list[str], warnings: list[str]) -> None:
@@ -183,6 +203,14 @@ def main() -> int:
     parser.add_argument("--mode", choices=["fast", "release"], default="fast")
     parser.add_argument("--strict", action="store_true", help="Treat warnings as errors.")
     parser.add_argument("--verbose", "-v", action="store_true", help="Print details for each check")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=os.cpu_count() or 1,
+        help="Number of weeks validated concurrently (default: CPU count; 1 = sequential)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Ignore and do not update cached validate_week results (.cache/validate/)",
+    )
     args = parser.parse_args()
 
     if args.verbose:
@@ -224,9 +252,9 @@ def main() -> int:
     )
 
     validate_mode = "idle" if args.mode == "fast" else "release"
-    for week in existing_weeks:
-        _run_validate_week(root, week, validate_mode, errors)
+    _run_validate_weeks(root, existing_weeks, validate_mode, args.jobs, not args.no_cache, errors)
 
+    for week in existing_weeks:
         chapter_path = root / "chapters" / week / "CHAPTER.md"
         heading = _extract_chapter_heading(chapter_path)
         if heading and week in toc_weeks:
@@ -10,13 +10,22 @@ Usage:
     python3 scripts/validate_week.py --week week_01 --mode release
     python3 scripts/validate_week.py --week 06 --mode drafting --verbose
     python3 scripts/validate_week.py --week 01 --mode idle
+    python3 scripts/validate_week.py --week 01 --mode release --no-cache
+
+Results are cached per check in .cache/validate/ keyed by the content of the
+files each check reads; unchanged checks replay their previous result.
 """
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import json
+import os
 import subprocess
 import sys
 from pathlib import Path
+from typing import Any, Callable
 
 from _common import (
     add_error,
@@ -238,6 +247,28 @@ def _check_anchors(errors: list[str], root: Path, week: str) -> None:
                 )
 
 
+def _anchor_inputs(root: Path, week: str) -> list[str]:
+    """Return the test files referenced by ANCHORS.yml verifications (for the cache key).
+
+    ``_check_anchors`` resolves a verification both against the week directory
+    and against the repo root, so the root-relative candidates must be inputs
+    too.  Unparseable files yield no extra inputs; the check reports them.
+    """
+    try:
+        anchors = load_yaml(root / "chapters" / week / "ANCHORS.yml")
+    except RuntimeError:
+        return []
+    if not isinstance(anchors, list):
+        return []
+    inputs: list[str] = []
+    for entry in anchors:
+        verification = entry.get("verification") if isinstance(entry, dict) else None
+        nodeid = _maybe_extract_pytest_nodeid(verification) if isinstance(verification, str) else None
+        if nodeid:
+            inputs.append(nodeid.split("::", 1)[0])
+    return sorted(set(inputs))
+
+
 def _check_qa_blocking(errors: list[str], qa_report_path: Path) -> None:
     text = qa_report_path.read_text(encoding="utf-8")
     lines = text.splitlines()
@@ -447,6 +478,237 @@ def _run_pytest(errors: list[str], root: Path, week: str) -> None:
         verbose("pytest passed")
 
 
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+#
+# Every check below declares the files it reads (paths relative to the repo
+# root; directories are hashed recursively).  The cache key of a check is a
+# digest of those inputs plus the mode and the source of this script and of
+# _common.py (whose helpers, e.g. load_yaml, the checks rely on), so an
+# edit to a chapter, to shared/*.yml or to the checks themselves invalidates
+# exactly the affected entries.  Entries live in .cache/validate/<week>.json
+# and store the check's error lines (an empty list means "passed").
+#
+# pytest's outcome also depends on the interpreter and the installed packages
+# (optional dependencies un-skip tests, timing budgets vary by Python), so
+# checks listed in _ENVIRONMENT_CHECKS additionally key on an environment
+# fingerprint: sys.version, sys.executable and every installed distribution.
+
+CACHE_DIR = Path(".cache") / "validate"
+
+_IGNORED_DIR_NAMES = {"__pycache__", ".pytest_cache"}
+
+_ENVIRONMENT_CHECKS = {"pytest"}
+
+
+@functools.lru_cache(maxsize=None)
+def _environment_digest() -> str:
+    """Return a digest of the interpreter and installed distributions (computed once)."""
+    from importlib import metadata
+
+    h = hashlib.sha256()
+    h.update(f"{sys.version}\0{sys.executable}\0".encode("utf-8"))
+    dists = sorted(
+        f"{dist.metadata['Name'] or ''}=={dist.version}".lower()
+        for dist in metadata.distributions()
+    )
+    h.update("\n".join(dists).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _hash_path(path: Path, memo: dict[Path, str]) -> str:
+    """Return a content digest for a file or directory tree (memoised in *memo*)."""
+    if path in memo:
+        return memo[path]
+    h = hashlib.sha256()
+    if path.is_file():
+        h.update(b"F")
+        h.update(path.read_bytes())
+    elif path.is_dir():
+        h.update(b"D")
+        for p in sorted(path.rglob("*")):
+            rel = p.relative_to(path)
+            if p.is_dir() or _IGNORED_DIR_NAMES.intersection(rel.parts) or p.suffix == ".pyc":
+                continue
+            h.update(rel.as_posix().encode("utf-8") + b"\0")
+            h.update(hashlib.sha256(p.read_bytes()).digest())
+    else:
+        h.update(b"missing")
+    memo[path] = h.hexdigest()
+    return memo[path]
+
+
+def _cache_key(root: Path, mode: str, name: str, inputs: list[str], memo: dict[Path, str]) -> str:
+    h = hashlib.sha256()
+    script = Path(__file__).resolve()
+    h.update(_hash_path(script, memo).encode("ascii"))
+    h.update(_hash_path(script.with_name("_common.py"), memo).encode("ascii"))
+    h.update(f"{mode}\0{name}\0".encode("utf-8"))
+    if name in _ENVIRONMENT_CHECKS:
+        h.update(_environment_digest().encode("ascii"))
+    for rel in inputs:
+        h.update(f"{rel}\0{_hash_path(root / rel, memo)}\0".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _load_cache(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_cache(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Check runner
+# ---------------------------------------------------------------------------
+
+def _guard_yaml(errors: list[str], fn: Callable[[], None]) -> None:
+    """Run *fn*, reporting a ``load_yaml`` ``RuntimeError`` as a regular error line."""
+    try:
+        fn()
+    except RuntimeError as e:
+        add_error(errors, str(e).strip())
+
+
+def _plan_checks(root: Path, week: str, mode: str) -> list[tuple[str, list[str], Callable[[list[str]], None]]]:
+    """Return ``(name, inputs, run)`` for every check that applies to *mode*, in report order."""
+    week_dir = root / "chapters" / week
+    week_rel = f"chapters/{week}"
+    chapter = week_dir / "CHAPTER.md"
+    chapter_rel = f"{week_rel}/CHAPTER.md"
+
+    checks: list[tuple[str, list[str], Callable[[list[str]], None]]] = []
+
+    # --- File existence (mode-aware) ---
+    checks.append(("required_paths", [week_rel], lambda e: _check_required_paths(e, week_dir, root, mode)))
+
+    # --- CHAPTER.md content checks ---
+    checks.append(("chapter_dod", [chapter_rel], lambda e: _check_chapter_dod(e, chapter)))
+    checks.append(("chapter_content", [chapter_rel], lambda e: _check_chapter_content(e, chapter, mode)))
+
+    # --- Examples (skip for drafting) ---
+    if mode != "drafting":
+        checks.append(("examples", [f"{week_rel}/examples"], lambda e: _check_examples_exist(e, week_dir, root)))
+
+    # --- Solution customization (release only) ---
+    if mode == "release":
+        solution_rel = f"{week_rel}/starter_code/solution.py"
+        checks.append(
+            ("solution", [solution_rel], lambda e: _check_solution_customized(e, root / solution_rel, mode))
+        )
+
+    # --- Pedagogical checks (release only) ---
+    checks.append(("pyhelper_section", [chapter_rel], lambda e: _check_pyhelper_section(e, chapter, mode)))
+    checks.append(
+        ("characters", [chapter_rel, "shared/characters.yml"], lambda e: _check_characters(e, chapter, root, mode))
+    )
+
+    def concept_map(e: list[str]) -> None:
+        try:
+            _check_concept_budget(e, root, week, mode)
+            _check_review_bridges(e, chapter, root, week, mode)
+        except RuntimeError as exc:
+            add_error(e, str(exc).strip())
+
+    checks.append(("concept_map", [chapter_rel, "shared/concept_map.yml"], concept_map))
+
+    # --- YAML checks (TERMS for all non-drafting; ANCHORS for release only) ---
+    terms_inputs = [f"{week_rel}/TERMS.yml", "shared/glossary.yml"]
+    if mode == "drafting":
+        # In drafting mode, check TERMS.yml only if it exists
+        if (week_dir / "TERMS.yml").is_file():
+            checks.append(("terms", terms_inputs, lambda e: _guard_yaml(e, lambda: _check_terms(e, root, week))))
+    else:
+        # idle/release: require TERMS.yml
+        def terms(e: list[str]) -> None:
+            if (week_dir / "TERMS.yml").is_file():
+                _guard_yaml(e, lambda: _check_terms(e, root, week))
+            else:
+                add_error(e, f"missing required file: {(week_dir / 'TERMS.yml').relative_to(root)}")
+
+        checks.append(("terms", terms_inputs, terms))
+        if mode == "release":
+            # Anchor verifications may point at any test file of the week, or
+            # at a repo-relative path outside it.
+            anchors_inputs = [week_rel, *_anchor_inputs(root, week)]
+            checks.append(
+                ("anchors", anchors_inputs, lambda e: _guard_yaml(e, lambda: _check_anchors(e, root, week)))
+            )
+
+    # --- QA blocking (idle/release only) ---
+    if mode in ("idle", "release"):
+        qa_path = week_dir / "QA_REPORT.md"
+
+        def qa_blocking(e: list[str]) -> None:
+            if qa_path.is_file():
+                _check_qa_blocking(e, qa_path)
+
+        checks.append(("qa_blocking", [f"{week_rel}/QA_REPORT.md"], qa_blocking))
+
+    # --- pytest (release only) ---
+    if mode == "release":
+        checks.append(("pytest", [week_rel, "chapters/conftest.py"], lambda e: _run_pytest(e, root, week)))
+
+    return checks
+
+
+def run_checks(root: Path, week: str, mode: str, use_cache: bool = True) -> list[str]:
+    """Run every gate for *mode* against ``chapters/<week>/`` and return the error lines.
+
+    *week* must already be normalised (``week_XX``).  This is the in-process
+    entry point used by ``validate_book.py``; :func:`main` only adds argument
+    parsing and reporting on top of it.
+
+    With *use_cache*, checks whose inputs are unchanged since the last run
+    replay their stored result instead of running again.
+    """
+    errors: list[str] = []
+    week_dir = root / "chapters" / week
+    if not week_dir.is_dir():
+        add_error(errors, f"missing week dir: chapters/{week}/ (run scripts/new_week.py first)")
+        return errors
+
+    verbose(f"validating {week} (mode={mode})")
+
+    cache_path = root / CACHE_DIR / f"{week}.json"
+    cache = _load_cache(cache_path) if use_cache else {}
+    memo: dict[Path, str] = {}
+    dirty = False
+
+    for name, inputs, run in _plan_checks(root, week, mode):
+        entry_name = f"{mode}:{name}"
+        key = _cache_key(root, mode, name, inputs, memo) if use_cache else ""
+        entry = cache.get(entry_name)
+        if use_cache and isinstance(entry, dict) and entry.get("key") == key:
+            verbose(f"cached result reused: {name}")
+            errors.extend(entry.get("errors", []))
+            continue
+
+        check_errors: list[str] = []
+        run(check_errors)
+        errors.extend(check_errors)
+        if use_cache:
+            cache[entry_name] = {"key": key, "errors": check_errors}
+            dirty = True
+
+    if dirty:
+        try:
+            _save_cache(cache_path, cache)
+        except OSError as e:
+            verbose(f"could not write validation cache {cache_path}: {e}")
+
+    return errors
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -465,6 +727,10 @@ def main() -> int:
         ),
     )
     parser.add_argument("--verbose", "-v", action="store_true", help="Print details for each check")
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help=f"Ignore and do not update cached check results ({CACHE_DIR}/)",
+    )
     args = parser.parse_args()
 
     if args.verbose:
@@ -477,66 +743,7 @@ def main() -> int:
         print(f"error: {e}", file=sys.stderr)
         return 2
 
-    errors: list[str] = []
-    week_dir = root / "chapters" / week
-    if not week_dir.is_dir():
-        add_error(errors, f"missing week dir: chapters/{week}/ (run scripts/new_week.py first)")
-    else:
-        verbose(f"validating {week} (mode={args.mode})")
-
-        # --- File existence (mode-aware) ---
-        _check_required_paths(errors, week_dir, root, args.mode)
-
-        # --- CHAPTER.md content checks ---
-        _check_chapter_dod(errors, week_dir / "CHAPTER.md")
-        _check_chapter_content(errors, week_dir / "CHAPTER.md", args.mode)
-
-        # --- Examples (skip for drafting) ---
-        if args.mode != "drafting":
-            _check_examples_exist(errors, week_dir, root)
-
-        # --- Solution customization (release only) ---
-        if args.mode == "release":
-            _check_solution_customized(errors, week_dir / "starter_code" / "solution.py", args.mode)
-
-        # --- Pedagogical checks (release only) ---
-        _check_pyhelper_section(errors, week_dir / "CHAPTER.md", args.mode)
-        _check_characters(errors, week_dir / "CHAPTER.md", root, args.mode)
-        try:
-            _check_concept_budget(errors, root, week, args.mode)
-            _check_review_bridges(errors, week_dir / "CHAPTER.md", root, week, args.mode)
-        except RuntimeError as e:
-            add_error(errors, str(e).strip())
-
-        # --- YAML checks (TERMS for all non-drafting; ANCHORS for release only) ---
-        if args.mode == "drafting":
-            # In drafting mode, check TERMS.yml only if it exists
-            try:
-                if (week_dir / "TERMS.yml").is_file():
-                    _check_terms(errors, root, week)
-            except RuntimeError as e:
-                add_error(errors, str(e).strip())
-        else:
-            # idle/release: require TERMS.yml
-            try:
-                if (week_dir / "TERMS.yml").is_file():
-                    _check_terms(errors, root, week)
-                else:
-                    add_error(errors, f"missing required file: {(week_dir / 'TERMS.yml').relative_to(root)}")
-                if args.mode == "release":
-                    _check_anchors(errors, root, week)
-            except RuntimeError as e:
-                add_error(errors, str(e).strip())
-
-        # --- QA blocking (idle/release only) ---
-        if args.mode in ("idle", "release"):
-            qa_path = week_dir / "QA_REPORT.md"
-            if qa_path.is_file():
-                _check_qa_blocking(errors, qa_path)
-
-        # --- pytest (release only) ---
-        if args.mode == "release":
-            _run_pytest(errors, root, week)
+    errors = run_checks(root, week, args.mode, use_cache=not args.no_cache)
 
     if errors:
         print(f"[validate-week] FAILED (mode={args.mode})", file=sys.stderr)
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+build_site.py 性能基准
+
+生成合成的 chapters/ 目录（可以比真实书稿大得多），分阶段计时站点构建流水线，
+把结果写成 JSON，便于在不同提交之间对比、及早发现转义器等环节的性能回退。
+
+计时的阶段:
+    toc_parse          TOCParser.parse
+    escape_mdx         对每周 CHAPTER.md 调用 escape_mdx_content
+    generate_<name>    ContentGenerator 的各个 generate_* 方法（不使用转义缓存）
+    write              把生成的页面写入空目录（SiteBuilder._write_file）
+    build_full         完整构建（--force，串行）
+    build_noop         输入没有变化时的增量构建
+
+用法:
+    python benchmarks/bench_build_site.py --preset smoke
+    python benchmarks/bench_build_site.py --preset large --output benchmarks/results/large.json
+    python benchmarks/bench_build_site.py --weeks 40 --min-kb 50 --max-kb 500 --repeat 5
+    python benchmarks/bench_build_site.py --preset book --compare benchmarks/results/base.json --threshold 1.2
+"""
+
+import argparse
+import json
+import logging
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+SITE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SITE_DIR / 'scripts'))
+
+from build_site import (  # noqa: E402
+    ContentGenerator,
+    SiteBuilder,
+    TOCParser,
+    escape_mdx_content,
+)
+
+
+# =============================================================================
+# 预设规模
+# =============================================================================
+
+PRESETS = {
+    # 与真实书稿规模相当，适合每次提交前跑
+    'smoke': {'weeks': 14, 'min_kb': 10, 'max_kb': 60, 'code_files': 6, 'repeat': 3},
+    # 章节更长、大小差异更大
+    'book': {'weeks': 14, 'min_kb': 10, 'max_kb': 500, 'code_files': 12, 'repeat': 3},
+    # 大型书稿：200 周，单章最大 2 MB
+    'large': {'weeks': 200, 'min_kb': 10, 'max_kb': 2048, 'code_files': 12, 'repeat': 1},
+}
+
+PHASES = [
+    ('阶段一：入门基础', 0.25),
+    ('阶段二：工程进阶', 0.25),
+    ('阶段三：AI 时代的工程', 0.25),
+    ('阶段四：综合实战', 0.25),
+]
+
+GENERATORS = [
+    'generate_week_index',
+    'generate_chapter',
+    'generate_assignment',
+    'generate_rubric',
+    'generate_code',
+    'generate_anchors',
+    'generate_terms',
+]
+
+
+# =============================================================================
+# 合成书稿
+# =============================================================================
+
+# 正文片段：刻意包含大量花括号、尖括号、LaTeX、内联代码和 HTML 标签，
+# 覆盖 escape_mdx_content 的各条规则
+PROSE_SNIPPETS = [
+    '小北把 `print(f"{name}")` 改成了 {name}，结果页面直接报错。老潘说：MDX 会把 {name} 当成表达式。',
+    'Java 里的 List<String> 和 Map<K, V> 在 Python 里对应 list[str] 和 dict；<> 叫菱形操作符。',
+    '成绩 <60 分算不及格，60 <= score < 90 算良好，score >= 90 算优秀。',
+    '接口路径写成 /api/tasks/{taskId}，参数 {id} 会在运行时替换；配置 {"mu": 0, "sigma": 10} 也很常见。',
+    '格式化时可以写 {value:.2f} 或 {row[\'mean\']}，占位符 {当前年份} 会在发布前替换。',
+    '行内公式 $a_{i} + b_{j}$ 与 $\\frac{1}{n}\\sum_{i=1}^{n} x_i$ 都不能被转义。',
+    '<details><summary>展开看答案 {answer}</summary>\n\n答案是 `{x for x in range(3)}`。<br>\n\n</details>',
+    '环境变量 ${HOME} 和 ${PATH} 在 shell 里展开，</Foo> 这样的闭合标签会被转义。',
+    '阿码问：`<class \'str\'>` 是什么？老潘答：这是 type() 的输出。<br/>换行用 <br> 即可。',
+    '| 运算 | 示例 | 说明 |\n|------|------|------|\n| 比较 | `a <= b` | 小于等于 {a} |\n| 泛型 | List<T> | 类型参数 <hr> |',
+]
+
+LATEX_BLOCK = '$$\n\\bar{{x}} = \\frac{{1}}{{n}} \\sum_{{i=1}}^{{n}} x_{{i}} + {k}\n$$'
+
+CODE_BLOCK = '''```python
+def summarize_{k}(records: dict[str, list[int]]) -> dict:
+    """统计每个学生的平均分 {{name: avg}}"""
+    result = {{}}
+    for name, scores in records.items():
+        result[name] = sum(scores) / len(scores) if scores else 0
+        print(f"{{name}}: {{result[name]:.2f}} <= 100")
+    url = "https://example.com/api/{{id}}"
+    return {{k: v for k, v in result.items() if v >= 60}}
+```'''
+
+
+def _chapter_text(rng: random.Random, week: int, target_bytes: int) -> str:
+    """生成大约 target_bytes 字节的章节正文"""
+    parts = [f'# Week {week:02d}：合成章节\n']
+    size = len(parts[0].encode('utf-8'))
+    section = 0
+    while size < target_bytes:
+        roll = rng.random()
+        if roll < 0.08:
+            section += 1
+            part = f'\n## {section}. 第 {section} 节 {{section_{section}}}\n'
+        elif roll < 0.22:
+            part = CODE_BLOCK.format(k=rng.randrange(1000))
+        elif roll < 0.28:
+            part = LATEX_BLOCK.format(k=rng.randrange(1000))
+        else:
+            part = ' '.join(rng.choice(PROSE_SNIPPETS) for _ in range(rng.randint(1, 4)))
+        parts.append(part)
+        size += len(part.encode('utf-8')) + 2
+    return '\n\n'.join(parts) + '\n'
+
+
+def _code_file(rng: random.Random, index: int) -> str:
+    """生成一个示例代码文件"""
+    lines = [f'"""示例 {index}：{{name}} 与 List<str>"""', '']
+    for k in range(rng.randint(3, 12)):
+        lines.append(CODE_BLOCK.format(k=k).split('\n', 1)[1].rsplit('\n', 1)[0])
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def _yaml_str(text: str) -> str:
+    return json.dumps(text, ensure_ascii=False)
+
+
+def generate_book(root: Path, weeks: int, min_kb: int, max_kb: int, code_files: int, seed: int = 0) -> dict:
+    """在 root 下生成 chapters/ 和 shared/，返回书稿的规模信息"""
+    rng = random.Random(seed)
+    chapters_dir = root / 'chapters'
+    shared_dir = root / 'shared'
+    chapters_dir.mkdir(parents=True)
+    shared_dir.mkdir(parents=True)
+
+    toc = ['# 目录', '']
+    week = 0
+    for phase_index, (phase_name, share) in enumerate(PHASES):
+        count = weeks - week if phase_index == len(PHASES) - 1 else max(1, round(weeks * share))
+        toc.extend([f'## {phase_name}', '', '| 周次 | 章节 | 你会做出什么 |', '|------|------|------|'])
+        for _ in range(count):
+            week += 1
+            if week > weeks:
+                break
+            toc.append(f'| {week:02d} | [合成章节 {week} <{week}>](week_{week:02d}/CHAPTER.md) | 示例 |')
+        toc.append('')
+    (chapters_dir / 'TOC.md').write_text('\n'.join(toc), encoding='utf-8')
+    (chapters_dir / 'SYLLABUS.md').write_text(_chapter_text(rng, 0, 8 * 1024), encoding='utf-8')
+
+    total_bytes = 0
+    for number in range(1, weeks + 1):
+        week_dir = chapters_dir / f'week_{number:02d}'
+        (week_dir / 'examples').mkdir(parents=True)
+        (week_dir / 'tests').mkdir()
+        # 大小按对数均匀分布：大部分章节较小，少数章节很大
+        target = int(1024 * min_kb * (max_kb / min_kb) ** rng.random())
+        chapter = _chapter_text(rng, number, target)
+        (week_dir / 'CHAPTER.md').write_text(chapter, encoding='utf-8')
+        (week_dir / 'ASSIGNMENT.md').write_text(_chapter_text(rng, number, 4 * 1024), encoding='utf-8')
+        (week_dir / 'RUBRIC.md').write_text(_chapter_text(rng, number, 2 * 1024), encoding='utf-8')
+        total_bytes += len(chapter.encode('utf-8'))
+
+        anchors, terms = [], []
+        for k in range(8):
+            anchors.extend([
+                f'- id: w{number:02d}-anchor-{k}',
+                f'  claim: {_yaml_str(rng.choice(PROSE_SNIPPETS)[:80])}',
+                f'  evidence: {_yaml_str("examples/01.py 第 " + str(k) + " 行输出 <class " + repr("str") + ">")}',
+                f'  verification: {_yaml_str("运行后检查 {result} >= 0")}',
+                '',
+            ])
+            terms.extend([
+                f'- term_zh: "术语 {number}-{k}"',
+                f'  term_en: "term {number} {k}"',
+                f'  definition_zh: {_yaml_str(rng.choice(PROSE_SNIPPETS)[:100])}',
+                '',
+            ])
+        (week_dir / 'ANCHORS.yml').write_text('\n'.join(anchors), encoding='utf-8')
+        (week_dir / 'TERMS.yml').write_text('\n'.join(terms), encoding='utf-8')
+
+        for k in range(code_files):
+            (week_dir / 'examples' / f'{k + 1:02d}_example.py').write_text(_code_file(rng, k), encoding='utf-8')
+        (week_dir / 'tests' / 'test_examples.py').write_text(_code_file(rng, 0), encoding='utf-8')
+
+    glossary = []
+    for k in range(200):
+        glossary.extend([
+            f'- term_zh: "全书术语 {k}"',
+            f'  term_en: "glossary term {k}"',
+            f'  definition_zh: {_yaml_str(rng.choice(PROSE_SNIPPETS)[:100])}',
+            '',
+        ])
+    (shared_dir / 'glossary.yml').write_text('\n'.join(glossary), encoding='utf-8')
+    (shared_dir / 'book_project.md').write_text(_chapter_text(rng, 0, 8 * 1024), encoding='utf-8')
+    (shared_dir / 'style_guide.md').write_text(_chapter_text(rng, 0, 8 * 1024), encoding='utf-8')
+    (root / 'README.md').write_text(_chapter_text(rng, 0, 4 * 1024), encoding='utf-8')
+
+    return {'weeks': weeks, 'chapter_bytes': total_bytes}
+
+
+# =============================================================================
+# 计时
+# =============================================================================
+
+def _time(func: Callable[[], Any], repeat: int) -> list[float]:
+    """运行 func repeat 次，返回每次的耗时（秒）"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def _summary(runs: list[float], **extra: Any) -> dict:
+    return {'min_s': min(runs), 'median_s': statistics.median(runs), 'runs': runs, **extra}
+
+
+def run_benchmarks(root: Path, repeat: int, logger: logging.Logger) -> dict[str, dict]:
+    """对 root 下的合成书稿逐阶段计时"""
+    chapters_dir = root / 'chapters'
+    shared_dir = root / 'shared'
+    results: dict[str, dict] = {}
+
+    # TOC 解析（TOCParser 会累积 phases，每次都新建实例）
+    results['toc_parse'] = _summary(_time(lambda: TOCParser(chapters_dir, logger).parse(), repeat))
+    weeks = [week for phase in TOCParser(chapters_dir, logger).parse() for week in phase.weeks]
+
+    # 转义器单独计时
+    chapters = [(chapters_dir / f'week_{w.number:02d}' / 'CHAPTER.md').read_text(encoding='utf-8') for w in weeks]
+    results['escape_mdx'] = _summary(
+        _time(lambda: [escape_mdx_content(text) for text in chapters], repeat),
+        bytes=sum(len(text.encode('utf-8')) for text in chapters),
+    )
+
+    # 各个生成函数（每次运行都用新的 ContentGenerator，避免转义缓存掩盖真实耗时）
+    pages: list[tuple[str, str]] = []
+    for name in GENERATORS:
+        def render(name=name):
+            generator = ContentGenerator(chapters_dir, shared_dir, logger)
+            return [''.join(getattr(generator, name)(week)) for week in weeks]
+        results[f'generate_{name[len("generate_"):]}'] = _summary(_time(render, repeat))
+        pages.extend((f'{name}_{i}.mdx', content) for i, content in enumerate(render()))
+
+    # 写入（每次写到新的空目录）
+    def write_pages():
+        out = Path(tempfile.mkdtemp(dir=root))
+        builder = SiteBuilder(out, chapters_dir, shared_dir, root, logger)
+        for filename, content in pages:
+            builder._write_file(out / filename, content)
+        shutil.rmtree(out)
+    results['write'] = _summary(_time(write_pages, repeat), bytes=sum(len(c.encode('utf-8')) for _, c in pages))
+
+    # 端到端构建
+    site_dir = root / 'site'
+
+    def build(force: bool):
+        builder = SiteBuilder(site_dir, chapters_dir, shared_dir, root, logger, force=force, jobs=1)
+        if not builder.build():
+            raise RuntimeError('站点构建失败')
+    results['build_full'] = _summary(_time(lambda: build(force=True), repeat))
+    results['build_noop'] = _summary(_time(lambda: build(force=False), repeat))
+    return results
+
+
+# =============================================================================
+# 结果对比
+# =============================================================================
+
+# 绝对差值小于这个值（秒）的变化视为噪声，不算回退
+NOISE_FLOOR_S = 0.005
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """打印与基线的对比表（输出到标准错误），返回超过阈值的回退阶段"""
+    regressions = []
+    out = sys.stderr
+    print(f"\n{'阶段':<24}{'基线(s)':>12}{'当前(s)':>12}{'比值':>8}", file=out)
+    for stage, result in current['results'].items():
+        base = baseline.get('results', {}).get(stage)
+        if not base:
+            print(f"{stage:<24}{'-':>12}{result['min_s']:>12.4f}{'-':>8}", file=out)
+            continue
+        ratio = result['min_s'] / base['min_s'] if base['min_s'] else float('inf')
+        regressed = ratio > threshold and result['min_s'] - base['min_s'] > NOISE_FLOOR_S
+        flag = '  <-- 回退' if regressed else ''
+        print(f"{stage:<24}{base['min_s']:>12.4f}{result['min_s']:>12.4f}{ratio:>8.2f}{flag}", file=out)
+        if regressed:
+            regressions.append(stage)
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=SITE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+# =============================================================================
+# 命令行
+# =============================================================================
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='build_site.py 性能基准（合成书稿）')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='smoke', help='预设规模 (默认: smoke)')
+    parser.add_argument('--weeks', type=int, help='周数（覆盖预设）')
+    parser.add_argument('--min-kb', type=int, help='最小章节大小 KB（覆盖预设）')
+    parser.add_argument('--max-kb', type=int, help='最大章节大小 KB（覆盖预设）')
+    parser.add_argument('--code-files', type=int, help='每周示例代码文件数（覆盖预设）')
+    parser.add_argument('--repeat', type=int, help='每个阶段重复次数，取最小值（覆盖预设）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('--output', type=str, help='结果 JSON 输出路径 (默认: 打印到标准输出)')
+    parser.add_argument('--compare', type=str, help='与之前保存的结果 JSON 对比')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='对比时允许的最大耗时比值，超过则退出码为 1 (默认: 1.25)')
+    parser.add_argument('--keep', action='store_true', help='保留生成的合成书稿目录')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = dict(PRESETS[args.preset])
+    for key in ('weeks', 'min_kb', 'max_kb', 'code_files', 'repeat'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+
+    logger = logging.getLogger('bench_build_site')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    root = Path(tempfile.mkdtemp(prefix='bench_build_site_'))
+    try:
+        print(f"生成合成书稿: {config['weeks']} 周，章节 {config['min_kb']}-{config['max_kb']} KB -> {root}",
+              file=sys.stderr)
+        corpus = generate_book(root, config['weeks'], config['min_kb'], config['max_kb'],
+                               config['code_files'], seed=args.seed)
+        print("开始计时...", file=sys.stderr)
+        results = run_benchmarks(root, config['repeat'], logger)
+    finally:
+        if args.keep:
+            print(f"合成书稿保留在: {root}", file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'preset': args.preset,
+            'config': config,
+            'seed': args.seed,
+            'corpus': corpus,
+        },
+        'results': results,
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(text + '\n', encoding='utf-8')
+        print(f"结果已写入: {output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n性能回退（> {args.threshold:.2f}x）: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
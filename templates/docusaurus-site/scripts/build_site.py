@@ -15,18 +15,35 @@ build_site.py - Docusaurus 站点内容生成脚本
     --site-dir SITE_DIR    站点目录 (默认: site)
     --chapters-dir DIR     chapters 目录 (默认: chapters)
     --shared-dir DIR       shared 目录 (默认: shared)
+    --force                忽略增量构建清单，重新生成所有页面
+    --jobs N, -j N         并行生成每周页面的进程数 (默认: CPU 核数；1 表示串行)
+    --escape-cache FILE    转义结果缓存文件，在多次构建之间复用 (默认: 只在本次构建内缓存)
+    --profile              输出各阶段、每周和每个生成函数的耗时与读写字节数
+    --profile-trace FILE   Chrome trace-event 计时文件 (默认: <site-dir>/.build_trace.json)
+    --profile-stage NAME   用 cProfile 分析指定阶段，隐含 --profile 和 --jobs 1
     --verbose              详细输出
 """
 
 import argparse
+import cProfile
+import codecs
+import hashlib
+import json
 import logging
+import io
 import os
+import pstats
 import re
 import shutil
 import sys
-from dataclasses import dataclass, field
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 import yaml
 
@@ -93,6 +110,138 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
     return logging.getLogger(__name__)
 
 
+# =============================================================================
+# 构建计时与 I/O 统计
+# =============================================================================
+
+# 本进程读取的输入字节数和写入站点的字节数（子进程各有一份，按页面交回主进程）
+IO_STATS = {'read': 0, 'written': 0}
+
+
+def _read_text(path: Path) -> str:
+    """以 UTF-8 读取文本文件（与 Path.read_text 相同），并计入 IO_STATS"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+        IO_STATS['read'] += os.fstat(f.fileno()).st_size
+    return text
+
+
+class BuildProfiler:
+    """构建过程计时
+
+    用 stage() 包住构建的各个阶段，记录墙钟时间和期间读写的字节数。事件按 cat 分类：
+    stage（构建步骤）、week（每周）、generator（单个页面的生成，串行时包含写入）、
+    write（主进程写入子进程生成的页面）。
+
+    结束后 log_summary 输出汇总表，write_trace 输出 Chrome trace-event 格式的 JSON
+    （可在 chrome://tracing 或 https://ui.perfetto.dev 中打开）。
+    cprofile_stage 指定阶段名时，用 cProfile 记录该阶段（多次出现时累加）。
+
+    未启用时 stage() 什么也不做。
+    """
+
+    def __init__(self, enabled: bool = False, cprofile_stage: Optional[str] = None):
+        self.enabled = enabled
+        self.cprofile_stage = cprofile_stage
+        self.events: list[dict[str, Any]] = []
+        self.origin = time.perf_counter()
+        self._cprofile: Optional[cProfile.Profile] = None
+
+    @contextmanager
+    def stage(self, name: str, cat: str = 'stage', **args: Any):
+        """记录一个阶段"""
+        if not self.enabled:
+            yield
+            return
+        profile = None
+        if name == self.cprofile_stage:
+            profile = self._cprofile = self._cprofile or cProfile.Profile()
+        read, written = IO_STATS['read'], IO_STATS['written']
+        start = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            args['bytes_read'] = IO_STATS['read'] - read
+            args['bytes_written'] = IO_STATS['written'] - written
+            self.add_event(name, cat, start, time.perf_counter() - start, **args)
+
+    def add_event(self, name: str, cat: str, start: float, duration: float,
+                  pid: Optional[int] = None, **args: Any) -> None:
+        """添加一个事件（start 为 time.perf_counter() 的读数；子进程的事件带上子进程 pid）"""
+        if not self.enabled:
+            return
+        self.events.append({
+            'name': name,
+            'cat': cat,
+            'ph': 'X',
+            'ts': round((start - self.origin) * 1e6),
+            'dur': round(duration * 1e6),
+            'pid': pid or os.getpid(),
+            'tid': pid or os.getpid(),
+            'args': args,
+        })
+
+    def write_trace(self, path: Path) -> None:
+        """写出 Chrome trace-event 格式的 JSON"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'traceEvents': self.events, 'displayTimeUnit': 'ms'}
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+    def log_summary(self, logger: logging.Logger, top: int = 10) -> None:
+        """输出汇总表：构建步骤、每个生成函数、最慢的几周和最慢的几个页面"""
+        def ms(us: int) -> str:
+            return f'{us / 1000:10.1f}'
+
+        def kb(n: int) -> str:
+            return f'{n / 1024:10.1f}'
+
+        stages = [e for e in self.events if e['cat'] == 'stage']
+        pages = [e for e in self.events if e['cat'] == 'generator']
+
+        logger.info("\n构建计时")
+        logger.info(f"  {'阶段':<24}{'耗时(ms)':>10}{'读取(KB)':>10}{'写入(KB)':>10}")
+        for e in stages:
+            logger.info(f"  {e['name']:<24}{ms(e['dur'])}{kb(e['args']['bytes_read'])}{kb(e['args']['bytes_written'])}")
+
+        by_generator: dict[str, list[int]] = {}
+        by_week: dict[int, int] = {}
+        for e in pages:
+            by_generator.setdefault(e['name'], []).append(e['dur'])
+            if 'week' in e['args']:
+                by_week[e['args']['week']] = by_week.get(e['args']['week'], 0) + e['dur']
+
+        logger.info(f"\n  {'生成函数':<24}{'总计(ms)':>10}{'次数':>6}{'最长(ms)':>10}")
+        for name, durations in sorted(by_generator.items(), key=lambda item: -sum(item[1])):
+            logger.info(f"  {name:<24}{ms(sum(durations))}{len(durations):>6}{ms(max(durations))}")
+
+        if by_week:
+            logger.info(f"\n  {'最慢的周':<24}{'耗时(ms)':>10}")
+            for week, dur in sorted(by_week.items(), key=lambda item: -item[1])[:top]:
+                logger.info(f"  {f'Week {week:02d}':<24}{ms(dur)}")
+
+        logger.info(f"\n  {'最慢的页面':<40}{'耗时(ms)':>10}{'读取(KB)':>10}")
+        for e in sorted(pages, key=lambda e: -e['dur'])[:top]:
+            label = e['args'].get('page', e['name'])
+            logger.info(f"  {label:<40}{ms(e['dur'])}{kb(e['args'].get('bytes_read', 0))}")
+
+    def log_cprofile(self, logger: logging.Logger, path: Optional[Path] = None, limit: int = 25) -> None:
+        """输出 cprofile_stage 的 cProfile 结果（按累计时间排序），并可保存为 .prof 文件"""
+        if self._cprofile is None:
+            if self.cprofile_stage:
+                logger.warning(f"没有名为 {self.cprofile_stage} 的阶段，未生成 cProfile 结果")
+            return
+        if path:
+            self._cprofile.dump_stats(str(path))
+            logger.info(f"cProfile 结果已保存: {path}")
+        stream = io.StringIO()
+        pstats.Stats(self._cprofile, stream=stream).sort_stats('cumulative').print_stats(limit)
+        logger.info(f"\ncProfile: {self.cprofile_stage}\n{stream.getvalue()}")
+
+
 # =============================================================================
 # TOC 解析器
 # =============================================================================
@@ -122,7 +271,7 @@ class TOCParser:
             return self._create_default_phases()
         
         self.logger.info(f"解析 TOC.md: {toc_path}")
-        content = toc_path.read_text(encoding='utf-8')
+        content = _read_text(toc_path)
         
         current_phase: Optional[PhaseInfo] = None
         
@@ -253,7 +402,7 @@ class YAMLParser:
             return []
         
         try:
-            content = yaml.safe_load(file_path.read_text(encoding='utf-8'))
+            content = yaml.safe_load(_read_text(file_path))
             anchors = []
             
             if isinstance(content, list):
@@ -278,7 +427,7 @@ class YAMLParser:
             return []
         
         try:
-            content = yaml.safe_load(file_path.read_text(encoding='utf-8'))
+            content = yaml.safe_load(_read_text(file_path))
             terms = []
             
             if isinstance(content, list):
@@ -323,11 +472,15 @@ class CodeCollector:
     # 排除的文件扩展名（编译产物、二进制文件等）
     EXCLUDED_EXTENSIONS = {'.class', '.jar', '.war', '.nar', '.ear', '.zip', '.tar.gz', '.rar'}
     
-    def __init__(self, logger: logging.Logger):
+    # 超过这个大小（字节）的文件只显示开头部分，避免把数据文件、锁文件整个内联到页面里
+    MAX_INLINE_BYTES = 100 * 1024
+    
+    def __init__(self, logger: logging.Logger, max_inline_bytes: int = MAX_INLINE_BYTES):
         self.logger = logger
+        self.max_inline_bytes = max_inline_bytes
     
     def collect_files(self, directory: Path) -> dict[str, list[dict]]:
-        """收集目录中的代码文件"""
+        """收集目录中的代码文件（只收集文件信息，内容用 read_content 按需读取）"""
         result = {
             'examples': [],
             'starter_code': [],
@@ -356,34 +509,62 @@ class CodeCollector:
         files = []
 
         try:
-            for item in sorted(directory.rglob('*')):
-                if item.is_file():
-                    # 跳过隐藏文件
-                    if item.name.startswith('.'):
-                        continue
-                    # 跳过排除的扩展名（编译产物、二进制文件等）
-                    if item.suffix.lower() in self.EXCLUDED_EXTENSIONS:
-                        continue
-
-                    rel_path = item.relative_to(directory)
-                    content = self._read_file_content(item)
-
-                    files.append({
-                        'path': str(rel_path),
-                        'name': item.name,
-                        'content': content,
-                        'language': self._detect_language(item)
-                    })
+            files.extend(self.iter_directory_files(directory))
         except Exception as e:
             self.logger.warning(f"收集文件失败: {directory} - {e}")
 
         return files
     
+    def iter_directory_files(self, directory: Path) -> Iterator[dict]:
+        """按路径顺序逐个产出目录中的文件信息（不读取文件内容）"""
+        for item in sorted(directory.rglob('*')):
+            if not item.is_file():
+                continue
+            # 跳过隐藏文件
+            if item.name.startswith('.'):
+                continue
+            # 跳过排除的扩展名（编译产物、二进制文件等）
+            if item.suffix.lower() in self.EXCLUDED_EXTENSIONS:
+                continue
+
+            yield {
+                'path': str(item.relative_to(directory)),
+                'name': item.name,
+                'file': item,
+                'size': item.stat().st_size,
+                'language': self._detect_language(item)
+            }
+    
+    def read_content(self, file_info: dict) -> tuple[str, bool]:
+        """读取文件内容，返回 (内容, 是否被截断)
+
+        超过 max_inline_bytes 的文件只读取开头 max_inline_bytes 个字节（不是字符，
+        中文源码每个字符占 3 字节），并截到最后一个完整的行。
+        """
+        file_path = file_info['file']
+        if file_info['size'] <= self.max_inline_bytes:
+            return self._read_file_content(file_path), False
+        try:
+            with open(file_path, 'rb') as f:
+                head = f.read(self.max_inline_bytes)
+            IO_STATS['read'] += len(head)
+            cut = head.rfind(b'\n')
+            if cut > 0:
+                head = head[:cut].removesuffix(b'\r')
+            # 没有换行时可能截在多字节字符中间：增量解码器会丢掉末尾不完整的字节
+            text = codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        except UnicodeDecodeError:
+            return "[Binary file - content not displayed]", False
+        except Exception as e:
+            return f"[Error reading file: {e}]", False
+        # 与文本模式读取一致：统一换行符
+        return text.replace('\r\n', '\n').replace('\r', '\n'), True
+    
     def _read_file_content(self, file_path: Path) -> str:
         """读取文件内容"""
         try:
             # 尝试以文本方式读取
-            return file_path.read_text(encoding='utf-8')
+            return _read_text(file_path)
         except UnicodeDecodeError:
             # 二进制文件
             return "[Binary file - content not displayed]"
@@ -413,6 +594,461 @@ class CodeCollector:
         return language_map.get(ext, 'text')
 
 
+# =============================================================================
+# MDX 转义
+# =============================================================================
+#
+# ContentGenerator._escape_mdx_content 的实现。处理分三段：
+#   1. 保护：把代码块、LaTeX、内联代码和合法标签换成占位符（每一类只做一次线性扫描，
+#      字符串只在扫描结束时拼接一次）
+#   2. 转义：在只剩“普通文本 + 占位符”的字符串上依次执行转义规则
+#   3. 恢复：一次正则替换把占位符（包括嵌套的占位符）还原成原文
+# 所有正则都在模块加载时编译好。
+
+# MDX 组件和常用 HTML 标签（这些不应该被转义）。按固定顺序处理，保证输出可复现。
+MDX_PROTECTED_TAGS = ('Tabs', 'TabItem', 'details', 'summary', 'br', 'code', 'pre', 'kbd', 'sub', 'sup')
+MDX_HTML_TAGS = ('div', 'span', 'p', 'a', 'img', 'table', 'tr', 'td', 'th', 'thead', 'tbody',
+                 'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'em',
+                 'b', 'i', 'u', 's', 'del', 'ins', 'iframe', 'video', 'audio', 'source',
+                 'input', 'form', 'button', 'label', 'select', 'option', 'hr', 'small')
+# 需要写成 <tag /> 的自闭合标签（在 MDX 表格中尤其重要）
+MDX_SELF_CLOSING_TAGS = ('br', 'hr', 'img', 'input', 'meta', 'link', 'area', 'base', 'col',
+                         'embed', 'param', 'source', 'track', 'wbr')
+
+_FENCE_START_RE = re.compile(r'^```', re.MULTILINE)
+_INLINE_CODE_RE = re.compile(r'(?<!`)`(?!`)([^`\n]+)(?<!`)`(?!`)')
+# 每个标签三种形式：<tag ...>...</tag>（开始标签 + 结束标签字面量）、<tag ... />、<tag ...>
+_TAG_PATTERNS = tuple(
+    (tag, (
+        (re.compile(rf'<{tag}\b[^>]*>'), f'</{tag}>'),
+        re.compile(rf'<{tag}\b[^>]*/>'),
+        re.compile(rf'<{tag}\b[^<>]*>'),
+    ))
+    for tag in MDX_PROTECTED_TAGS + MDX_HTML_TAGS
+)
+
+_EMPTY_ANGLE_RE = re.compile(r'(?<!&)<>')
+_GENERIC_RE = re.compile(r'<([A-Za-z][A-Za-z0-9_]*\s*,\s*[A-Za-z][^>]*)>')
+_SINGLE_TAG_RE = re.compile(r'<([A-Za-z0-9_]+)>')
+_LT_NUMBER_RE = re.compile(r'<(\d+)(?=[^\d>])')
+_CLOSING_TAG_RE = re.compile(r'</([A-Za-z0-9_]+)>')
+_SHELL_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+_PATH_PARAM_RE = re.compile(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
+_FSTRING_FORMAT_RE = re.compile(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*):[^}]+\}')
+_FSTRING_INDEX_RE = re.compile(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*)\[[^\]]+\]\}')
+_COMPLEX_BRACES_RE = re.compile(r'(?<!\\)\{([a-zA-Z0-9_\'":,\s.\[\]%+-]{3,50})\}')
+_COMPLEX_BRACES_SAFE_RE = re.compile(r'^[a-zA-Z0-9_\'":,\s.\[\]%+-]+$')
+_UNICODE_BRACES_RE = re.compile(r'(?<!\\)\{([\u4e00-\u9fff\u3400-\u4dbf\w\s]+)\}')
+_REMAINING_BRACES_RE = re.compile(r'(?<!\\)\{([^{}\n\\]{1,30})\}')
+
+_SELF_CLOSING_ALT = '|'.join(MDX_SELF_CLOSING_TAGS)
+_SELF_CLOSING_RE = re.compile(rf'<({_SELF_CLOSING_ALT})\b([^<>]*[^/])?>')
+_SELF_CLOSING_SLASH_RE = re.compile(rf'<({_SELF_CLOSING_ALT})\b\s*/\s*>')
+
+
+class _Placeholders:
+    """占位符登记表：保存被保护的原文，并负责最后的还原"""
+
+    def __init__(self):
+        # 使用唯一的占位符前缀避免与正文冲突
+        self.prefix = f"__MDX_PROTECTED_{uuid.uuid4().hex[:8]}__"
+        self.items: list[str] = []
+        self._pattern = re.compile(re.escape(self.prefix) + r'_(\d+)_')
+
+    def add(self, text: str) -> str:
+        """登记一段原文，返回对应的占位符"""
+        self.items.append(text)
+        return f"{self.prefix}_{len(self.items) - 1}_"
+
+    def restore(self, text: str) -> str:
+        """还原所有占位符；被保护的原文里如果还有占位符（嵌套保护），一并还原"""
+        def expand(match: re.Match) -> str:
+            return self._pattern.sub(expand, self.items[int(match.group(1))])
+        return self._pattern.sub(expand, text)
+
+
+def _iter_code_fences(text: str):
+    """依次产出代码块的 (start, end)
+
+    代码块以行首的 ``` 开始，到下一个 \\n``` 为止（包含结尾的 ```）。
+    遇到没有结尾的代码块时停止，其后的内容按普通文本处理。
+    """
+    pos = 0
+    while True:
+        start_match = _FENCE_START_RE.search(text, pos)
+        if not start_match:
+            return
+        start = start_match.start()
+        end = text.find('\n```', start + 3)
+        if end == -1:
+            return
+        pos = end + 4
+        yield start, pos
+
+
+def _protect_code_blocks(text: str, placeholders: _Placeholders) -> str:
+    """用占位符替换所有代码块"""
+    parts = []
+    pos = 0
+    for start, end in _iter_code_fences(text):
+        parts.append(text[pos:start])
+        parts.append(placeholders.add(text[start:end]))
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _protect_latex_math(text: str, placeholders: _Placeholders) -> str:
+    """用占位符替换 $$...$$ 块和同一行内的 $...$ 公式"""
+    parts = []
+    pos = 0
+    n = len(text)
+    while True:
+        start = text.find('$', pos)
+        if start == -1:
+            break
+        parts.append(text[pos:start])
+        # $$...$$ 块（可以跨行）
+        if text.startswith('$$', start):
+            end = text.find('$$', start + 2)
+            if end == -1:
+                pos = start
+                break
+            parts.append(placeholders.add(text[start:end + 2]))
+            pos = end + 2
+            continue
+        # 行内 $...$：紧跟在 $ 后面的 $ 不算开头；结尾不能是 $$ 的开始，也不能跨行
+        end = text.find('$', start + 1) if start == 0 or text[start - 1] != '$' else -1
+        if (end == -1
+                or (end + 1 < n and text[end + 1] == '$')
+                or text.find('\n', start, end) != -1):
+            parts.append('$')
+            pos = start + 1
+            continue
+        parts.append(placeholders.add(text[start:end + 1]))
+        pos = end + 1
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _iter_paired_tags(text: str, open_pattern: re.Pattern, close_tag: str):
+    """依次产出 <tag ...>...</tag> 的 (start, end)
+
+    与正则 <tag\b[^>]*>.*?</tag>（DOTALL）的匹配结果相同，但结束标签用 str.find 查找：
+    <br>、<hr> 这类从不闭合的标签不会让每个开始标签都扫描到文末。
+    """
+    pos = 0
+    while True:
+        start_match = open_pattern.search(text, pos)
+        if not start_match:
+            return
+        end = text.find(close_tag, start_match.end())
+        if end == -1:
+            # 后面的开始标签结束得更晚，同样找不到结束标签
+            return
+        pos = end + len(close_tag)
+        yield start_match.start(), pos
+
+
+def _protect_spans(text: str, spans: list[tuple[int, int]], placeholders: _Placeholders) -> str:
+    """用占位符替换 text 中的若干个不重叠区间
+
+    占位符从最后一个区间开始编号。编号决定占位符长度，而 {1,30} 这类规则对长度敏感，
+    保持这个顺序才能与原先逐个替换的结果一致。
+    """
+    if not spans:
+        return text
+    added = [placeholders.add(text[start:end]) for start, end in reversed(spans)]
+    parts = []
+    pos = 0
+    for (start, end), placeholder in zip(spans, reversed(added)):
+        parts.append(text[pos:start])
+        parts.append(placeholder)
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _protect_pattern(text: str, pattern: re.Pattern, placeholders: _Placeholders) -> str:
+    """用占位符替换 pattern 的所有匹配"""
+    return _protect_spans(text, [m.span() for m in pattern.finditer(text)], placeholders)
+
+
+def _escape_plain_text(content: str) -> str:
+    """转义看起来像 JSX 标签或 JS 表达式的文本（此时合法标签已被占位符保护）"""
+    # 3.1 空尖括号 <>（菱形操作符）
+    content = _EMPTY_ANGLE_RE.sub('&lt;&gt;', content)
+    # 3.2 泛型类型参数 <T, K>、<String, Integer>
+    content = _GENERIC_RE.sub(lambda m: f'&lt;{m.group(1)}&gt;', content)
+    # 3.3 单个泛型参数 <String>、<6>
+    content = _SINGLE_TAG_RE.sub(lambda m: f'&lt;{m.group(1)}&gt;', content)
+    # 3.4 比较表达式中的 <数字（如 <60 分）
+    content = _LT_NUMBER_RE.sub(lambda m: f'&lt;{m.group(1)}', content)
+    # 3.4b 比较运算符 <= 和 >=
+    content = content.replace('<=', '&lt;=').replace('>=', '&gt;=')
+    # 3.5 闭合标签 </Word>
+    content = _CLOSING_TAG_RE.sub(lambda m: f'&lt;/{m.group(1)}&gt;', content)
+    # 3.6 ${...} 格式的 shell 变量（用 HTML 实体转义 $ { }）
+    content = _SHELL_VAR_RE.sub(lambda m: f'&#36;&#123;{m.group(1)}&#125;', content)
+
+    # 3.7 REST API 路径参数 {id}、{taskId}（纯数字保持原样，可能是对象字面量）
+    def escape_path_param(match):
+        inner = match.group(1)
+        return match.group(0) if inner.isdigit() else f'\\{{{inner}}}'
+
+    content = _PATH_PARAM_RE.sub(escape_path_param, content)
+    # 3.8 f-string 占位符 {var:.2f}、{var[key]}
+    content = _FSTRING_FORMAT_RE.sub(lambda m: f'\\{{{m.group(1)}}}', content)
+    content = _FSTRING_INDEX_RE.sub(lambda m: f'\\{{{m.group(1)}}}', content)
+
+    # 3.8b 字典/配置形式 {'mu': 0, 'sigma': 10}（只转义由安全字符组成的内容）
+    def escape_complex_braces(match):
+        inner = match.group(1)
+        if _COMPLEX_BRACES_SAFE_RE.match(inner):
+            return f'\\{{{inner}}}'
+        return match.group(0)
+
+    content = _COMPLEX_BRACES_RE.sub(escape_complex_braces, content)
+    # 3.9 包含中文等 Unicode 字符的占位符 {当前年份}
+    content = _UNICODE_BRACES_RE.sub(lambda m: f'\\{{{m.group(1)}}}', content)
+
+    # 3.10 兜底：剩余的简单 {xxx}（1-30 个字符）
+    def escape_remaining_braces(match):
+        inner = match.group(1)
+        if '\\' not in inner and len(inner) <= 30:
+            return f'\\{{{inner}}}'
+        return match.group(0)
+
+    return _REMAINING_BRACES_RE.sub(escape_remaining_braces, content)
+
+
+def _escape_urls_in_code_blocks(text: str) -> str:
+    """转义代码块内 URL 中的冒号，避免 MDX 的 URL 解析问题"""
+    parts = []
+    pos = 0
+    for start, end in _iter_code_fences(text):
+        parts.append(text[pos:start])
+        parts.append(text[start:end].replace('http://', 'http&#58;//').replace('https://', 'https&#58;//'))
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def escape_mdx_content(content: str) -> str:
+    """转义 MDX 内容中可能被误认为 JSX 标签或表达式的语法
+
+    代码块、LaTeX 公式、内联代码和合法的 MDX/HTML 标签保持原样；
+    其余文本中的 <Tag>、<=、{var} 等会被转义。整体耗时与文本长度成线性关系。
+    """
+    placeholders = _Placeholders()
+
+    # 步骤0: 保护代码块、LaTeX 公式和内联代码
+    content = _protect_code_blocks(content, placeholders)
+    content = _protect_latex_math(content, placeholders)
+    content = _protect_pattern(content, _INLINE_CODE_RE, placeholders)
+
+    # 步骤1-2: 保护合法的 MDX 组件和 HTML 标签（只处理文本中出现过的标签）
+    for tag, ((open_pattern, close_tag), self_closing, bare) in _TAG_PATTERNS:
+        if '<' + tag not in content:
+            continue
+        content = _protect_spans(content, list(_iter_paired_tags(content, open_pattern, close_tag)), placeholders)
+        content = _protect_pattern(content, self_closing, placeholders)
+        content = _protect_pattern(content, bare, placeholders)
+
+    # 步骤3: 转义看起来像 JSX/泛型的标签和花括号表达式
+    content = _escape_plain_text(content)
+
+    # 步骤4: 恢复保护的内容
+    content = placeholders.restore(content)
+
+    # 步骤4.5: 对代码块内的 URL 进行转义
+    content = _escape_urls_in_code_blocks(content)
+
+    # 步骤5: 自闭合标签统一写成 <tag />（<br> -> <br />，<br/> -> <br />）
+    content = _SELF_CLOSING_RE.sub(lambda m: f'<{m.group(1)}{m.group(2) or ""} />', content)
+    content = _SELF_CLOSING_SLASH_RE.sub(lambda m: f'<{m.group(1)} />', content)
+    return content
+
+
+# =============================================================================
+# 转义结果缓存
+# =============================================================================
+
+class EscapeCache:
+    """转义结果的 LRU 缓存
+
+    以 (转义方式, 原文) 的 sha256 为键保存转义结果。同一段文本在多个页面、多周之间
+    重复出现时（共用的 starter code、术语表定义等）只转义一次。
+
+    缓存按字节数限制大小：所有转义结果合计不超过 max_bytes，超出时淘汰最久未使用的条目；
+    原文超过 max_entry_bytes 的（整章正文、大代码文件）不进缓存，直接转义——这类内容
+    几乎不会重复，而且页面没变时构建清单已经跳过了它们。
+
+    每个条目记录用到它的周（scope），并行构建时每个子进程只拿到本周用过的条目，
+    不必把整个缓存复制给每个子进程。
+
+    指定 path 时可以用 load/save 在多次构建之间复用缓存。文件中记录了 build_site.py
+    的哈希，脚本变化（转义规则可能已变）后旧缓存自动作废。
+    """
+
+    VERSION = 2
+    MAX_BYTES = 1024 * 1024
+    MAX_ENTRY_BYTES = 16 * 1024
+    _KEY_BYTES = 64  # 十六进制 sha256
+
+    def __init__(
+        self,
+        max_bytes: int = MAX_BYTES,
+        path: Optional[Path] = None,
+        logger: Optional[logging.Logger] = None,
+        record_new: bool = False,
+        max_entry_bytes: int = MAX_ENTRY_BYTES
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.path = path
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self.scope: Optional[int] = None  # 当前正在生成的周，None 表示全局页面
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._scopes: dict[str, set[int]] = {}
+        # 子进程中记录新增条目和用到的条目，交回主进程合并
+        self._new: Optional[dict[str, str]] = {} if record_new else None
+        self._used: set[str] = set()
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_size(value: str) -> int:
+        return EscapeCache._KEY_BYTES + len(value.encode('utf-8'))
+
+    def get(self, kind: str, content: str, escape: Any) -> str:
+        """返回 escape(content) 的结果，命中缓存时不再重新计算"""
+        if len(content) > self.max_entry_bytes:  # 字符数超过上限，字节数必然也超过
+            self.misses += 1
+            return escape(content)
+        data = f'{kind}\0{content}'.encode('utf-8')
+        if len(data) > self.max_entry_bytes:
+            self.misses += 1
+            return escape(content)
+        key = hashlib.sha256(data).hexdigest()
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            value = escape(content)
+            self._put(key, value)
+            if self._new is not None:
+                self._new[key] = value
+        self._mark_used(key)
+        return value
+
+    def _mark_used(self, key: str) -> None:
+        if self.scope is not None and key in self._entries:
+            scopes = self._scopes.setdefault(key, set())
+            if self.scope not in scopes:
+                scopes.add(self.scope)
+                self._dirty = True
+        if self._new is not None:
+            self._used.add(key)
+
+    def _put(self, key: str, value: str, scopes: Iterable[int] = ()) -> None:
+        old = self._entries.get(key)
+        if old is not None:
+            self.nbytes -= self._entry_size(old)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self.nbytes += self._entry_size(value)
+        if scopes:
+            self._scopes.setdefault(key, set()).update(scopes)
+        self._dirty = True
+        while self.nbytes > self.max_bytes and self._entries:
+            evicted, evicted_value = self._entries.popitem(last=False)
+            self.nbytes -= self._entry_size(evicted_value)
+            self._scopes.pop(evicted, None)
+
+    def items(self) -> list[tuple[str, str]]:
+        """按从旧到新的顺序返回所有条目"""
+        return list(self._entries.items())
+
+    def entries_for(self, scope: int) -> list[tuple[str, str]]:
+        """上次构建中第 scope 周用到的条目（交给生成这一周的子进程）"""
+        return [(key, value) for key, value in self._entries.items()
+                if scope in self._scopes.get(key, ())]
+
+    def take_new(self) -> tuple[dict[str, str], list[str]]:
+        """取出并清空上次调用以来 (新增的条目, 用到的键)"""
+        if self._new is None:
+            return {}, []
+        new, self._new = self._new, {}
+        used, self._used = list(self._used), set()
+        return new, used
+
+    def merge(self, entries: Iterable[tuple[str, str]], scope: Optional[int] = None) -> None:
+        """合并其他缓存（子进程或磁盘）中的条目"""
+        scopes = () if scope is None else (scope,)
+        for key, value in entries:
+            self._put(key, value, scopes)
+
+    def mark_used(self, keys: Iterable[str], scope: int) -> None:
+        """记录第 scope 周用到了这些条目（子进程的命中）"""
+        for key in keys:
+            if key in self._entries:
+                scopes = self._scopes.setdefault(key, set())
+                if scope not in scopes:
+                    scopes.add(scope)
+                    self._dirty = True
+
+    def load(self) -> None:
+        """从 path 读取缓存（不存在、格式不对或脚本已变化时视为空缓存）"""
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return
+        if (not isinstance(data, dict) or data.get('version') != self.VERSION
+                or data.get('generator') != _GENERATOR_DIGEST):
+            if self.logger:
+                self.logger.debug(f"  忽略过期的转义缓存: {self.path}")
+            return
+        for key, value, scopes in data.get('entries', []):
+            self._put(key, value, scopes)
+        self._dirty = False
+
+    def save(self) -> None:
+        """把缓存写回 path（内容没有变化时跳过）"""
+        if self.path is None or not self._dirty:
+            return
+        data = {
+            'version': self.VERSION,
+            'generator': _GENERATOR_DIGEST,
+            'entries': [
+                [key, value, sorted(self._scopes.get(key, ()))]
+                for key, value in self._entries.items()
+            ],
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f"  写入转义缓存失败: {self.path} - {e}")
+
+
+# build_site.py 自身的哈希：脚本变化后，构建清单和转义缓存中的旧记录都会失效
+_GENERATOR_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
 # =============================================================================
 # 内容生成器
 # =============================================================================
@@ -420,12 +1056,19 @@ class CodeCollector:
 class ContentGenerator:
     """MDX 内容生成器"""
     
-    def __init__(self, chapters_dir: Path, shared_dir: Path, logger: logging.Logger):
+    def __init__(
+        self,
+        chapters_dir: Path,
+        shared_dir: Path,
+        logger: logging.Logger,
+        escape_cache: Optional[EscapeCache] = None
+    ):
         self.chapters_dir = chapters_dir
         self.shared_dir = shared_dir
         self.logger = logger
         self.yaml_parser = YAMLParser(logger)
         self.code_collector = CodeCollector(logger)
+        self.escape_cache = escape_cache if escape_cache is not None else EscapeCache()
     
     # -------------------------------------------------------------------------
     # 每周页面生成
@@ -484,7 +1127,7 @@ class ContentGenerator:
         ]
         
         if chapter_path.exists():
-            content = chapter_path.read_text(encoding='utf-8')
+            content = _read_text(chapter_path)
             # 移除原有的 frontmatter
             content = self._escape_mdx_content(self._remove_frontmatter(content))
             lines.append(content)
@@ -513,7 +1156,7 @@ class ContentGenerator:
         ]
         
         if assignment_path.exists():
-            content = assignment_path.read_text(encoding='utf-8')
+            content = _read_text(assignment_path)
             content = self._escape_mdx_content(self._remove_frontmatter(content))
             lines.append(content)
         else:
@@ -543,7 +1186,7 @@ class ContentGenerator:
         ]
         
         if rubric_path.exists():
-            content = rubric_path.read_text(encoding='utf-8')
+            content = _read_text(rubric_path)
             content = self._escape_mdx_content(self._remove_frontmatter(content))
             lines.append(content)
         else:
@@ -560,6 +1203,13 @@ class ContentGenerator:
     
     def generate_code(self, week: WeekInfo) -> str:
         """生成代码页面 code.mdx"""
+        return ''.join(self.iter_code_page(week))
+    
+    def iter_code_page(self, week: WeekInfo) -> Iterator[str]:
+        """逐块生成代码页面 code.mdx
+
+        每次只读取、转义一个文件，调用方可以边生成边写入，内存占用不随代码目录的总大小增长。
+        """
         week_dir = self.chapters_dir / f'week_{week.number:02d}'
         code_files = self.code_collector.collect_files(week_dir)
         escaped_title = self._escape_yaml_title(week.title)
@@ -581,35 +1231,29 @@ class ContentGenerator:
         has_any_code = any(code_files.values())
         
         if not has_any_code:
-            lines.extend([
-                '> ⚠️ 本周暂无代码示例',
-                '',
-            ])
-            return '\n'.join(lines)
+            lines.append('> ⚠️ 本周暂无代码示例')
+            yield '\n'.join(lines) + '\n'
+            return
         
         lines.extend([
             '<Tabs>',
             '',
         ])
+        yield '\n'.join(lines) + '\n'
         
         # Examples Tab
-        lines.extend(self._generate_code_tab('Examples', code_files['examples'], 'examples'))
+        yield from self._iter_code_tab('Examples', code_files['examples'], 'examples')
         
         # Starter Code Tab
-        lines.extend(self._generate_code_tab('Starter Code', code_files['starter_code'], 'starter_code'))
+        yield from self._iter_code_tab('Starter Code', code_files['starter_code'], 'starter_code')
         
         # Tests Tab
-        lines.extend(self._generate_code_tab('Tests', code_files['tests'], 'tests'))
-        
-        lines.extend([
-            '</Tabs>',
-            '',
-        ])
+        yield from self._iter_code_tab('Tests', code_files['tests'], 'tests')
         
-        return '\n'.join(lines)
+        yield '</Tabs>\n'
     
-    def _generate_code_tab(self, label: str, files: list[dict], tab_value: str) -> list[str]:
-        """生成代码 Tab 内容"""
+    def _iter_code_tab(self, label: str, files: list[dict], tab_value: str) -> Iterator[str]:
+        """逐块生成代码 Tab 内容（每个文件一块）"""
         lines = [
             f'<TabItem value="{tab_value}" label="{label}">',
             '',
@@ -635,10 +1279,13 @@ class ContentGenerator:
             # 代码内容
             lines.append('## 代码内容')
             lines.append('')
+            yield '\n'.join(lines) + '\n'
             
             for file_info in files:
+                content, truncated = self.code_collector.read_content(file_info)
+                shown_lines = content.count('\n') + 1
                 # 对代码块内容中的 MDX 敏感字符进行转义
-                content = self._escape_mdx_content(file_info['content'])
+                content = self._escape_mdx_content(content)
                 
                 # 如果内容包含 ```，使用更长的围栏避免嵌套问题
                 if '```' in content:
@@ -646,21 +1293,29 @@ class ContentGenerator:
                 else:
                     fence = '```'
                 
-                lines.extend([
+                block = [
                     f'### {file_info["path"]}',
                     '',
                     f'{fence}{file_info["language"]}',
                     content,
                     fence,
                     '',
-                ])
+                ]
+                if truncated:
+                    size_kb = file_info['size'] / 1024
+                    block.extend([
+                        f'> ⚠️ 文件较大（{size_kb:.1f} KB），这里只显示前 {shown_lines} 行，'
+                        f'完整内容请查看仓库中的源文件。',
+                        '',
+                    ])
+                yield '\n'.join(block) + '\n'
+            lines = []
         
         lines.extend([
             '</TabItem>',
             '',
         ])
-        
-        return lines
+        yield '\n'.join(lines) + '\n'
     
     def generate_anchors(self, week: WeekInfo) -> str:
         """生成锚点页面 anchors.mdx"""
@@ -785,7 +1440,7 @@ class ContentGenerator:
         ]
         
         if readme_path.exists():
-            content = readme_path.read_text(encoding='utf-8')
+            content = _read_text(readme_path)
             content = self._escape_mdx_content(self._remove_frontmatter(content))
             lines.append(content)
         else:
@@ -818,7 +1473,7 @@ class ContentGenerator:
         ]
         
         if syllabus_path.exists():
-            content = syllabus_path.read_text(encoding='utf-8')
+            content = _read_text(syllabus_path)
             content = self._escape_mdx_content(self._remove_frontmatter(content))
             lines.append(content)
         else:
@@ -844,7 +1499,7 @@ class ContentGenerator:
         ]
         
         if project_path.exists():
-            content = project_path.read_text(encoding='utf-8')
+            content = _read_text(project_path)
             content = self._escape_mdx_content(self._remove_frontmatter(content))
             lines.append(content)
         else:
@@ -928,7 +1583,7 @@ class ContentGenerator:
         ]
         
         if style_path.exists():
-            content = style_path.read_text(encoding='utf-8')
+            content = _read_text(style_path)
             content = self._escape_mdx_content(self._remove_frontmatter(content))
             lines.append(content)
         else:
@@ -955,328 +1610,8 @@ class ContentGenerator:
     
     def _escape_mdx_content(self, content: str) -> str:
         """转义 MDX 内容中可能被误认为 JSX 标签的语法"""
-        import re
-        import uuid
-
-        # 使用唯一的占位符前缀避免冲突
-        placeholder_prefix = f"__MDX_PROTECTED_{uuid.uuid4().hex[:8]}__"
-        placeholders = {}
-        placeholder_id = 0
-
-        def make_placeholder():
-            nonlocal placeholder_id
-            ph = f"{placeholder_prefix}_{placeholder_id}_"
-            placeholder_id += 1
-            return ph
-
-        # 步骤0: 首先保护代码块（```...```），避免代码块内的内容被转义
-        # 同时对代码块内的 URL 进行特殊处理以避免 MDX 解析问题
-        def protect_code_blocks(text):
-            result = []
-            i = 0
-            while i < len(text):
-                # 查找代码块开始 - 必须在行首（或文件开头）
-                if text[i:i+3] == '```' and (i == 0 or text[i-1] == '\n'):
-                    # 找到代码块结束 - 查找 \n``` 后跟换行或文件结尾
-                    end_idx = text.find('\n```', i + 3)
-                    if end_idx == -1:
-                        # 没有找到结束，保持原样
-                        result.append(text[i:])
-                        break
-                    # 包含结束的 ``` 和后面的换行
-                    end_idx = end_idx + 4
-                    code_block = text[i:end_idx]
-                    placeholder = make_placeholder()
-                    # 存储原始代码块用于恢复
-                    placeholders[placeholder] = code_block
-                    result.append(placeholder)
-                    i = end_idx
-                else:
-                    result.append(text[i])
-                    i += 1
-            return ''.join(result)
-
-        content = protect_code_blocks(content)
-        self.logger.debug(f"After code block protection: {len(placeholders)} placeholders")
-
-        # 步骤0.3: 保护 LaTeX 数学公式（$$...$$ 和 $...$），避免公式中的 { } 被转义
-        def protect_latex_math(text):
-            result = []
-            i = 0
-            while i < len(text):
-                # 查找 $$...$$ 块（多行数学公式）
-                if text[i:i+2] == '$$':
-                    end_idx = text.find('$$', i + 2)
-                    if end_idx == -1:
-                        result.append(text[i:])
-                        break
-                    end_idx = end_idx + 2
-                    math_block = text[i:end_idx]
-                    placeholder = make_placeholder()
-                    placeholders[placeholder] = math_block
-                    result.append(placeholder)
-                    i = end_idx
-                # 查找行内 $...$ 公式（单行，不包含换行）
-                elif text[i] == '$' and (i == 0 or text[i-1] != '$'):
-                    # 找到下一个 $，但确保不是 $$ 的一部分
-                    end_idx = text.find('$', i + 1)
-                    if end_idx == -1 or end_idx == i + 1:
-                        result.append(text[i])
-                        i += 1
-                        continue
-                    # 确保不是 $$ 的开始
-                    if end_idx + 1 < len(text) and text[end_idx + 1] == '$':
-                        result.append(text[i])
-                        i += 1
-                        continue
-                    # 检查是否在同一行内
-                    newline_idx = text.find('\n', i, end_idx)
-                    if newline_idx != -1:
-                        # 跨行，不是有效的行内公式
-                        result.append(text[i])
-                        i += 1
-                        continue
-                    math_block = text[i:end_idx + 1]
-                    placeholder = make_placeholder()
-                    placeholders[placeholder] = math_block
-                    result.append(placeholder)
-                    i = end_idx + 1
-                else:
-                    result.append(text[i])
-                    i += 1
-            return ''.join(result)
-
-        content = protect_latex_math(content)
-        self.logger.debug(f"After LaTeX protection: {len(placeholders)} placeholders")
-
-        # 保护合法的 MDX 组件和 HTML 标签（这些不应该被转义）
-        protected_tags = ['Tabs', 'TabItem', 'details', 'summary', 'br', 'code', 'pre', 'kbd', 'sub', 'sup']
-
-        # 步骤0.5: 保护内联代码（`...`），避免内联代码内的内容被转义
-        # 匹配单个反引号包围的内容（不是代码块）
-        inline_code_pattern = r'(?<!`)`(?!`)([^`\n]+)(?<!`)`(?!`)'
-        matches = list(re.finditer(inline_code_pattern, content))
-        for match in reversed(matches):
-            placeholder = make_placeholder()
-            placeholders[placeholder] = match.group(0)
-            content = content[:match.start()] + placeholder + content[match.end():]
-
-        # 步骤1: 保护合法的 MDX 组件，用占位符替换
-        # 使用列表存储替换信息，避免在迭代时修改字符串
-        for tag in protected_tags:
-            # 匹配 <Tag ...>...</Tag>（包括跨行的）
-            pattern = rf'<{tag}\b[^>]*>.*?</{tag}>'
-            matches = list(re.finditer(pattern, content, re.DOTALL))
-            for match in reversed(matches):  # 从后往前替换，避免位置偏移
-                placeholder = make_placeholder()
-                placeholders[placeholder] = match.group(0)
-                content = content[:match.start()] + placeholder + content[match.end():]
-            
-            # 匹配自闭合 <Tag ... /> 或 <Tag>
-            pattern = rf'<{tag}\b[^>]*/>'
-            matches = list(re.finditer(pattern, content))
-            for match in reversed(matches):
-                placeholder = make_placeholder()
-                placeholders[placeholder] = match.group(0)
-                content = content[:match.start()] + placeholder + content[match.end():]
-            
-            # 匹配 <Tag>（自闭合但没有斜杠，如 <br>, <hr>）
-            pattern = rf'<{tag}\b[^<>]*>'
-            matches = list(re.finditer(pattern, content))
-            for match in reversed(matches):
-                placeholder = make_placeholder()
-                placeholders[placeholder] = match.group(0)
-                content = content[:match.start()] + placeholder + content[match.end():]
-        
-        # 步骤2: 保护已知的合法 HTML 标签（这些不应该被转义）
-        html_tags = {'div', 'span', 'p', 'a', 'img', 'table', 'tr', 'td', 'th', 'thead', 'tbody',
-                     'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'em',
-                     'b', 'i', 'u', 's', 'del', 'ins', 'iframe', 'video', 'audio', 'source',
-                     'input', 'form', 'button', 'label', 'select', 'option', 'hr', 'small'}
-        
-        for tag in html_tags:
-            # 匹配 <tag ...>...</tag>
-            pattern = rf'<{tag}\b[^>]*>.*?</{tag}>'
-            matches = list(re.finditer(pattern, content, re.DOTALL))
-            for match in reversed(matches):
-                placeholder = make_placeholder()
-                placeholders[placeholder] = match.group(0)
-                content = content[:match.start()] + placeholder + content[match.end():]
-            
-            # 匹配 <tag ... />
-            pattern = rf'<{tag}\b[^>]*/>'
-            matches = list(re.finditer(pattern, content))
-            for match in reversed(matches):
-                placeholder = make_placeholder()
-                placeholders[placeholder] = match.group(0)
-                content = content[:match.start()] + placeholder + content[match.end():]
-            
-            # 匹配 <tag>（自闭合但没有斜杠）
-            pattern = rf'<{tag}\b[^<>]*>'
-            matches = list(re.finditer(pattern, content))
-            for match in reversed(matches):
-                placeholder = make_placeholder()
-                placeholders[placeholder] = match.group(0)
-                content = content[:match.start()] + placeholder + content[match.end():]
-        
-        # 步骤3: 转义看起来像 JSX/泛型的标签
-        # 注意：此时所有合法标签已经被占位符保护
-        
-        # 3.1 转义空尖括号 <>（菱形操作符）
-        content = re.sub(r'(?<!&)<>', '&lt;&gt;', content)
-        
-        # 3.2 转义泛型类型参数 <T, K>、<String, Integer> 等
-        # 匹配 <字母,字母> 或 <字母, 字母> 等形式
-        def escape_generic(match):
-            inner = match.group(1)
-            # 如果内部包含逗号，且看起来像类型参数，则转义
-            return f'&lt;{inner}&gt;'
-        
-        # 匹配 <Type1, Type2> 或 <T, K extends Something> 等形式
-        content = re.sub(r'<([A-Za-z][A-Za-z0-9_]*\s*,\s*[A-Za-z][^>]*)>', escape_generic, content)
-        
-        # 3.3 转义单个泛型参数 <String>、<Integer>、<6> 等
-        def escape_single_tag(match):
-            tag = match.group(1)
-            # 任何看起来像标签的内容都转义
-            return f'&lt;{tag}&gt;'
-        
-        # 匹配 <Word> 形式的标签（包括 <6> 这种数字形式）
-        content = re.sub(r'<([A-Za-z0-9_]+)>', escape_single_tag, content)
-        
-        # 3.4 转义比较表达式中的 <数字（如 <60 分）
-        # 匹配 <数字 后跟非字母数字字符的情况
-        def escape_comparison(match):
-            return f'&lt;{match.group(1)}'
-        
-        content = re.sub(r'<(\d+)(?=[^\d>])', escape_comparison, content)
-        
-        # 3.4b 转义比较运算符 <= 和 >=
-        content = re.sub(r'<=', '&lt;=', content)
-        content = re.sub(r'>=', '&gt;=', content)
-        
-        # 3.5 转义闭合标签 </Word>
-        content = re.sub(r'</([A-Za-z0-9_]+)>', lambda m: f'&lt;/{m.group(1)}&gt;', content)
-        
-        # 3.6 转义 ${...} 格式的 shell 变量/占位符，避免被当作 JSX 表达式
-        # 所有 ${...} 格式都转义（它们通常是 shell 变量，不是 JS 表达式）
-        # 使用 HTML 实体转义 { 和 }
-        def escape_shell_var(match):
-            var_content = match.group(1)
-            # 转义 $ { } 为 HTML 实体
-            return f'&#36;&#123;{var_content}&#125;'
-        
-        content = re.sub(r'\$\{([^}]+)\}', escape_shell_var, content)
-        
-        # 3.7 转义 REST API 路径参数 {id}, {taskId} 等
-        # 这些会被误认为 JSX 表达式
-        # 匹配 {word} 格式，但排除纯数字（如 {1} 可能是合法对象字面量）
-        def escape_path_param(match):
-            inner = match.group(1)
-            # 如果是纯数字，不转义（可能是对象字面量）
-            if inner.isdigit():
-                return match.group(0)
-            # 其他情况转义
-            return f'\\{{{inner}}}'
-
-        # 匹配简单的 {identifier} 格式（不包括冒号，避免匹配 {PORT:8080} 这种 shell 变量默认值语法）
-        # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
-        content = re.sub(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*)\}', escape_path_param, content)
+        return self.escape_cache.get('mdx', content, escape_mdx_content)
 
-        # 3.8 转义 Python f-string 格式的占位符 {var:.2f}, {var:.1%}, {var[key]} 等
-        # 这些在正文中的占位符会被 MDX 误解析为 JSX 表达式
-        # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
-        def escape_fstring_placeholder(match):
-            inner = match.group(1)
-            return f'\\{{{inner}}}'
-
-        # 匹配 {var:format} 格式（如 {mean_effect:.2f}, {prob_positive:.1%}）
-        content = re.sub(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*):[^}]+\}', escape_fstring_placeholder, content)
-
-        # 匹配 {var[key]} 格式（如 {result['mean']}）
-        content = re.sub(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*)\[[^\]]+\]\}', escape_fstring_placeholder, content)
-
-        # 匹配 {dict_var} 格式（如 {'mu': 0, 'sigma': 10}）
-        # 注意：这个要小心，只匹配看起来像字典或配置的内容
-        # 实际上，这种格式太复杂，我们选择转义所有剩余的 {word...word} 格式
-        # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
-        def escape_complex_braces(match):
-            inner = match.group(1)
-            # 如果内部只包含字母、数字、下划线、引号、冒号、逗号、空格、点号等安全字符
-            if re.match(r'^[a-zA-Z0-9_\'":,\s.\[\]%+-]+$', inner):
-                return f'\\{{{inner}}}'
-            return match.group(0)
-
-        # 匹配更复杂的 {...} 格式（如 {'mu': 0, 'sigma': 10}）
-        content = re.sub(r'(?<!\\)\{([a-zA-Z0-9_\'":,\s.\[\]%+-]{3,50})\}', escape_complex_braces, content)
-
-        # 3.9 转义包含中文或其他 Unicode 字符的占位符（如 {当前年份}、{变量名}）
-        # 这些会被 MDX 误解析为 JSX 表达式
-        # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
-        def escape_unicode_placeholder(match):
-            inner = match.group(1)
-            return f'\\{{{inner}}}'
-
-        # 匹配包含中文字符的 {...} 格式
-        content = re.sub(r'(?<!\\)\{([\u4e00-\u9fff\u3400-\u4dbf\w\s]+)\}', escape_unicode_placeholder, content)
-
-        # 3.10 转义所有剩余的简单 {...} 格式（兜底规则）
-        # 匹配任何剩余的 {xxx} 格式（1-30个字符，不包含特殊字符）
-        # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
-        def escape_remaining_braces(match):
-            inner = match.group(1)
-            # 如果内部看起来像简单的文本（不含已转义的反斜杠）
-            if '\\' not in inner and len(inner) <= 30:
-                return f'\\{{{inner}}}'
-            return match.group(0)
-
-        content = re.sub(r'(?<!\\)\{([^{}\n\\]{1,30})\}', escape_remaining_braces, content)
-
-        # 步骤4: 恢复保护的标签
-        # 从后往前恢复，避免嵌套问题
-        for placeholder in sorted(placeholders.keys(), reverse=True):
-            original = placeholders[placeholder]
-            content = content.replace(placeholder, original)
-
-        # 步骤4.5: 对代码块内的 URL 进行转义，避免 MDX 的 URL 解析问题
-        # Docusaurus/MDX 在某些情况下会尝试解析代码块内的 URL，导致错误
-        # 使用零宽断言来匹配代码块内的 http:// 和 https://
-        def escape_urls_in_code_blocks(text):
-            result = []
-            i = 0
-            while i < len(text):
-                # 只匹配行首的 ```
-                if text[i:i+3] == '```' and (i == 0 or text[i-1] == '\n'):
-                    # 找到代码块结束
-                    end_idx = text.find('\n```', i + 3)
-                    if end_idx == -1:
-                        result.append(text[i:])
-                        break
-                    end_idx = end_idx + 4
-                    code_block = text[i:end_idx]
-                    # 转义 URL 中的冒号
-                    code_block = code_block.replace('http://', 'http&#58;//')
-                    code_block = code_block.replace('https://', 'https&#58;//')
-                    result.append(code_block)
-                    i = end_idx
-                else:
-                    result.append(text[i])
-                    i += 1
-            return ''.join(result)
-
-        content = escape_urls_in_code_blocks(content)
-
-        # 步骤5: 确保自闭合标签使用正确的格式（<br /> 而不是 <br>）
-        # 这在 MDX 表格中特别重要
-        self_closing_tags = ['br', 'hr', 'img', 'input', 'meta', 'link', 'area', 'base', 'col', 
-                            'embed', 'param', 'source', 'track', 'wbr']
-        for tag in self_closing_tags:
-            # 将 <tag> 转换为 <tag />，但避免重复转换 <tag />
-            content = re.sub(rf'<{tag}\b([^<>]*[^/])?>', rf'<{tag}\1 />', content)
-            content = re.sub(rf'<{tag}\b\s*/\s*>', rf'<{tag} />', content)  # 标准化已有斜杠的格式
-        
-        return content
-    
     def _escape_yaml_title(self, title: str) -> str:
         """转义 YAML 标题中的特殊字符
 
@@ -1318,6 +1653,10 @@ class ContentGenerator:
     
     def _escape_inline_text(self, text: str) -> str:
         """转义内联文本中的 MDX 敏感字符（用于表格等内联环境）"""
+        return self.escape_cache.get('inline', text, self._escape_inline_text_uncached)
+    
+    def _escape_inline_text_uncached(self, text: str) -> str:
+        """_escape_inline_text 的实际转义逻辑"""
         import re
         import uuid
 
@@ -1508,6 +1847,231 @@ class SidebarsGenerator:
         return lines
 
 
+# =============================================================================
+# 增量构建清单
+# =============================================================================
+
+class BuildManifest:
+    """增量构建清单
+
+    记录每个输出页面由哪些输入文件生成，以及生成时这些输入的内容哈希。
+    再次构建时，只有输入（或 build_site.py 本身）发生变化的页面才会重新生成。
+
+    清单保存在 site/.build_manifest.json，格式：
+        {
+          "version": 1,
+          "files": {"<输入文件>": {"mtime_ns": ..., "size": ..., "sha256": "..."}},
+          "pages": {"<输出页面>": {"key": "...", "files": ["<输入文件>", ...]}}
+        }
+
+    files 部分缓存了每个输入文件的哈希：mtime 和大小都没变时直接复用，
+    不必重新读取文件内容。
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, logger: logging.Logger):
+        self.path = path
+        self.logger = logger
+        self.files: dict[str, dict[str, Any]] = {}
+        self.pages: dict[str, dict[str, Any]] = {}
+        self._seen_pages: set[str] = set()
+        self._generator_digest = _GENERATOR_DIGEST
+
+    def load(self) -> None:
+        """读取上次构建的清单（不存在或格式不对时视为空清单）"""
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            self.logger.debug(f"  忽略不兼容的构建清单: {self.path}")
+            return
+        self.files = data.get('files') or {}
+        self.pages = data.get('pages') or {}
+
+    def save(self) -> None:
+        """保存清单，丢弃本次构建没有涉及的页面"""
+        pages = {k: v for k, v in self.pages.items() if k in self._seen_pages}
+        used_files: set[str] = set()
+        for entry in pages.values():
+            used_files.update(entry.get('files', []))
+        data = {
+            'version': self.VERSION,
+            'files': {k: v for k, v in self.files.items() if k in used_files},
+            'pages': pages,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换：构建中途被打断时，旧清单仍然完整
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding='utf-8')
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self.logger.warning(f"  写入构建清单失败: {self.path} - {e}")
+
+    def file_digest(self, path: Path) -> str:
+        """返回文件内容的 sha256（mtime 和大小未变时复用清单中的记录）"""
+        key = str(path)
+        try:
+            st = path.stat()
+        except OSError:
+            return 'missing'
+        cached = self.files.get(key)
+        if cached and cached.get('mtime_ns') == st.st_mtime_ns and cached.get('size') == st.st_size:
+            return cached['sha256']
+        data = path.read_bytes()
+        IO_STATS['read'] += len(data)
+        digest = hashlib.sha256(data).hexdigest()
+        self.files[key] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha256': digest}
+        return digest
+
+    def _expand(self, inputs: list[Path]) -> list[Path]:
+        """把输入中的目录展开为其下的所有文件（排序后，保证键稳定）"""
+        files: list[Path] = []
+        for item in inputs:
+            if item.is_dir():
+                files.append(item)
+                files.extend(sorted(p for p in item.rglob('*') if p.is_file()))
+            else:
+                files.append(item)
+        return files
+
+    def page_key(self, inputs: list[Path], extra: str = '') -> tuple[str, list[str]]:
+        """计算页面的构建键，返回 (键, 参与计算的文件列表)"""
+        h = hashlib.sha256()
+        h.update(self._generator_digest.encode('ascii'))
+        h.update(extra.encode('utf-8'))
+        files: list[str] = []
+        for item in self._expand(inputs):
+            if item.is_dir():
+                h.update(f'\0dir:{item}'.encode('utf-8'))
+                continue
+            h.update(f'\0{item}\0{self.file_digest(item)}'.encode('utf-8'))
+            files.append(str(item))
+        return h.hexdigest(), files
+
+    def is_fresh(self, output: Path, key: str) -> bool:
+        """输出文件存在且构建键与上次一致时返回 True"""
+        self._seen_pages.add(str(output))
+        entry = self.pages.get(str(output))
+        return bool(entry) and entry.get('key') == key and output.exists()
+
+    def record(self, output: Path, key: str, files: list[str]) -> None:
+        """记录页面本次的构建键"""
+        self._seen_pages.add(str(output))
+        self.pages[str(output)] = {'key': key, 'files': files}
+
+
+# =============================================================================
+# 并行生成
+# =============================================================================
+
+class _RecordCollector(logging.Handler):
+    """在子进程中收集日志，交给主进程按周的顺序输出"""
+
+    def __init__(self):
+        super().__init__()
+        self.records: list[tuple[int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.levelno, record.getMessage()))
+
+
+@dataclass
+class StagedFile:
+    """已经写入临时文件、等待替换到目标位置的页面"""
+    path: Path
+
+
+def _stage_chunks(target: Path, chunks: Iterable[str]) -> StagedFile:
+    """把分块生成的页面逐块写入 target 旁边的临时文件"""
+    tmp = target.with_name(f'.{target.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return StagedFile(tmp)
+
+
+def _same_file_content(a: Path, b: Path, block_size: int = 64 * 1024) -> bool:
+    """逐块比较两个文件的内容"""
+    try:
+        if a.stat().st_size != b.stat().st_size:
+            return False
+        with open(a, 'rb') as fa, open(b, 'rb') as fb:
+            while True:
+                block = fa.read(block_size)
+                if block != fb.read(block_size):
+                    return False
+                if not block:
+                    return True
+    except FileNotFoundError:
+        return False
+
+
+# 子进程中的转义缓存，由 _init_worker 创建；每个任务再合并主进程交来的本周条目
+_worker_escape_cache: Optional[EscapeCache] = None
+
+
+def _init_worker(max_bytes: int, max_entry_bytes: int) -> None:
+    """子进程初始化：创建空的转义缓存（大小限制与主进程相同）"""
+    global _worker_escape_cache
+    _worker_escape_cache = EscapeCache(max_bytes, record_new=True, max_entry_bytes=max_entry_bytes)
+
+
+def _render_week_pages(
+    chapters_dir: Path,
+    shared_dir: Path,
+    week: WeekInfo,
+    pages: list[tuple[Path, str]],
+    log_level: int,
+    cache_entries: list[tuple[str, str]] = ()
+) -> tuple[list, list[tuple[int, str]], dict[str, Any]]:
+    """子进程入口：生成某周的若干页面
+
+    pages 是 (输出路径, ContentGenerator 方法名) 列表。返回 (页面内容列表, 日志记录列表,
+    统计信息)。页面内容与 pages 一一对应：普通页面是字符串，分块生成的页面（code.mdx）
+    先写入临时文件，返回 StagedFile。最终文件由主进程写入。
+    cache_entries 是主进程缓存中这一周上次用到的转义结果。
+    统计信息包括转义缓存的增量（新条目和用到的键）和每个页面的计时 (方法名, 开始时间, 耗时, 读取字节数)。
+    """
+    collector = _RecordCollector()
+    logger = logging.getLogger(f'{__name__}.worker')
+    logger.handlers = [collector]
+    logger.propagate = False
+    logger.setLevel(log_level)
+    try:
+        cache = _worker_escape_cache or EscapeCache(record_new=True)
+        cache.merge(cache_entries)
+        cache.scope = week.number
+        hits, misses = cache.hits, cache.misses
+        generator = ContentGenerator(chapters_dir, shared_dir, logger, cache)
+        contents = []
+        timings = []
+        for path, name in pages:
+            read = IO_STATS['read']
+            start = time.perf_counter()
+            content = getattr(generator, name)(week)
+            contents.append(content if isinstance(content, str) else _stage_chunks(path, content))
+            timings.append((name, start, time.perf_counter() - start, IO_STATS['read'] - read))
+    finally:
+        logger.removeHandler(collector)
+    new_entries, used_keys = cache.take_new()
+    stats = {
+        'pid': os.getpid(),
+        'cache_entries': new_entries,
+        'cache_used': used_keys,
+        'cache_hits': cache.hits - hits,
+        'cache_misses': cache.misses - misses,
+        'timings': timings,
+    }
+    return contents, collector.records, stats
+
+
 # =============================================================================
 # 站点构建器
 # =============================================================================
@@ -1521,18 +2085,28 @@ class SiteBuilder:
         chapters_dir: Path,
         shared_dir: Path,
         repo_root: Path,
-        logger: logging.Logger
+        logger: logging.Logger,
+        force: bool = False,
+        jobs: int = 1,
+        escape_cache_path: Optional[Path] = None,
+        profiler: Optional[BuildProfiler] = None
     ):
         self.site_dir = site_dir
         self.chapters_dir = chapters_dir
         self.shared_dir = shared_dir
         self.repo_root = repo_root
         self.logger = logger
+        self.force = force
+        self.jobs = jobs
+        self.profiler = profiler or BuildProfiler()
         
         self.docs_dir = site_dir / 'docs'
         self.toc_parser = TOCParser(chapters_dir, logger)
-        self.content_generator = ContentGenerator(chapters_dir, shared_dir, logger)
+        self.escape_cache = EscapeCache(path=escape_cache_path, logger=logger)
+        self.content_generator = ContentGenerator(chapters_dir, shared_dir, logger, self.escape_cache)
         self.sidebars_generator = SidebarsGenerator(logger)
+        self.manifest = BuildManifest(site_dir / '.build_manifest.json', logger)
+        self.stats = {'generated': 0, 'written': 0, 'skipped': 0}
     
     def build(self) -> bool:
         """构建站点"""
@@ -1541,26 +2115,49 @@ class SiteBuilder:
         self.logger.info("=" * 60)
         
         try:
+            prof = self.profiler
+            with prof.stage('load_state'):
+                if not self.force:
+                    self.manifest.load()
+                # 转义缓存以内容哈希为键，--force 时也可以放心复用
+                self.escape_cache.load()
+
             # 1. 解析 TOC
             self.logger.info("\n[1/4] 解析 TOC.md...")
-            phases = self.toc_parser.parse()
+            with prof.stage('parse_toc'):
+                phases = self.toc_parser.parse()
             self.logger.info(f"  发现 {len(phases)} 个阶段")
             
             # 2. 创建目录结构
             self.logger.info("\n[2/4] 创建目录结构...")
-            self._create_directory_structure(phases)
+            with prof.stage('create_dirs'):
+                self._create_directory_structure(phases)
             
             # 3. 生成每周页面
             self.logger.info("\n[3/4] 生成每周页面...")
-            self._generate_week_pages(phases)
+            with prof.stage('week_pages'):
+                self._generate_week_pages(phases)
             
             # 4. 生成全局页面和 sidebars
             self.logger.info("\n[4/4] 生成全局页面和 sidebars...")
-            self._generate_global_pages()
-            self._generate_sidebars(phases)
+            with prof.stage('global_pages'):
+                self._generate_global_pages()
+            with prof.stage('sidebars'):
+                self._generate_sidebars(phases)
+            with prof.stage('save_state'):
+                self.manifest.save()
+                self.escape_cache.save()
             
             self.logger.info("\n" + "=" * 60)
             self.logger.info("站点构建完成！")
+            self.logger.info(
+                f"页面: 重新生成 {self.stats['generated']} 个（实际写入 {self.stats['written']} 个），"
+                f"跳过 {self.stats['skipped']} 个未变化的页面"
+            )
+            self.logger.debug(
+                f"转义缓存: 命中 {self.escape_cache.hits} 次，未命中 {self.escape_cache.misses} 次，"
+                f"共 {len(self.escape_cache)} 条"
+            )
             self.logger.info(f"输出目录: {self.site_dir.absolute()}")
             self.logger.info("=" * 60)
             
@@ -1585,36 +2182,147 @@ class SiteBuilder:
                 week_dir.mkdir(parents=True, exist_ok=True)
                 self.logger.debug(f"  创建目录: {week_dir}")
     
+    def _week_page_specs(self, week: WeekInfo) -> list[tuple[str, Any, list[Path]]]:
+        """返回某周每个页面的 (文件名, 生成函数, 输入文件) 列表"""
+        src = self.chapters_dir / f'week_{week.number:02d}'
+        gen = self.content_generator
+        code_inputs = [src / 'examples', src / 'starter_code']
+        code_inputs.append(src / 'tests' if (src / 'tests').exists() else src / 'starter_code' / 'src' / 'test')
+        return [
+            ('index.mdx', gen.generate_week_index, []),
+            ('chapter.mdx', gen.generate_chapter, [src / 'CHAPTER.md']),
+            ('assignment.mdx', gen.generate_assignment, [src / 'ASSIGNMENT.md']),
+            ('rubric.mdx', gen.generate_rubric, [src / 'RUBRIC.md']),
+            ('code.mdx', gen.iter_code_page, code_inputs),
+            ('anchors.mdx', gen.generate_anchors, [src / 'ANCHORS.yml']),
+            ('terms.mdx', gen.generate_terms, [src / 'TERMS.yml']),
+        ]
+
     def _generate_week_pages(self, phases: list[PhaseInfo]) -> None:
-        """生成每周页面"""
-        total_weeks = sum(len(phase.weeks) for phase in phases)
-        processed = 0
+        """生成每周页面（只重新生成输入发生变化的页面）
+
+        jobs > 1 时各周的页面在子进程中并行生成；日志和文件写入仍在主进程中
+        按周的顺序进行，输出与串行生成完全一致。
+        """
+        weeks = [week for phase in phases for week in phase.weeks]
+        
+        # 先在主进程中确定每周哪些页面需要重新生成（构建清单只在主进程维护）
+        plans = []
+        for week in weeks:
+            week_dir = self.docs_dir / 'weeks' / f'{week.number:02d}'
+            # 标题、阶段和 has_* 标记都会影响页面内容
+            week_extra = repr(asdict(week))
+            pages = []
+            for filename, generate, inputs in self._week_page_specs(week):
+                path = week_dir / filename
+                key, files, fresh = self._page_status(path, inputs, week_extra)
+                pages.append((path, generate.__name__, key, files, fresh))
+            plans.append((week, pages))
+        
+        prof = self.profiler
+        results = self._render_weeks(plans)
+        for processed, (week, pages) in enumerate(plans, 1):
+            self.logger.info(f"  [{processed}/{len(weeks)}] Week {week.number:02d}: {week.title}")
+            with prof.stage(f'Week {week.number:02d}', cat='week', week=week.number):
+                rendered = next(results)
+                self.escape_cache.scope = week.number
+                contents = iter(rendered or [])
+                for path, name, key, files, fresh in pages:
+                    if fresh:
+                        self.stats['skipped'] += 1
+                        self.logger.debug(f"  未变化，跳过: {path}")
+                    elif rendered is None:
+                        page = f'weeks/{week.number:02d}/{path.name}'
+                        with prof.stage(name, cat='generator', week=week.number, page=page):
+                            content = getattr(self.content_generator, name)(week)
+                            self._store_page(path, content, key, files)
+                    else:
+                        with prof.stage('write', cat='write', week=week.number, page=path.name):
+                            self._store_page(path, next(contents), key, files)
+        self.escape_cache.scope = None
+    
+    def _render_weeks(self, plans: list[tuple[WeekInfo, list]]):
+        """按周的顺序逐个产出子进程生成的页面内容
+
+        并行时把各周提交到进程池，再按提交顺序取回结果，输出子进程收集到的日志，
+        并合并转义缓存和计时。串行时每周产出 None，由调用方直接生成页面。
+        """
+        tasks = [(week, [(path, name) for path, name, _, _, fresh in pages if not fresh]) for week, pages in plans]
+        busy = sum(1 for _, names in tasks if names)
         
-        for phase in phases:
-            for week in phase.weeks:
-                processed += 1
-                self.logger.info(f"  [{processed}/{total_weeks}] Week {week.number:02d}: {week.title}")
-                
-                week_dir = self.docs_dir / 'weeks' / f'{week.number:02d}'
-                
-                # 生成各页面
-                self._write_file(week_dir / 'index.mdx', self.content_generator.generate_week_index(week))
-                self._write_file(week_dir / 'chapter.mdx', self.content_generator.generate_chapter(week))
-                self._write_file(week_dir / 'assignment.mdx', self.content_generator.generate_assignment(week))
-                self._write_file(week_dir / 'rubric.mdx', self.content_generator.generate_rubric(week))
-                self._write_file(week_dir / 'code.mdx', self.content_generator.generate_code(week))
-                self._write_file(week_dir / 'anchors.mdx', self.content_generator.generate_anchors(week))
-                self._write_file(week_dir / 'terms.mdx', self.content_generator.generate_terms(week))
+        if self.jobs <= 1 or busy <= 1:
+            for _ in tasks:
+                yield None
+            return
+        
+        log_level = self.logger.getEffectiveLevel()
+        cache = self.escape_cache
+        with ProcessPoolExecutor(
+            max_workers=min(self.jobs, busy),
+            initializer=_init_worker,
+            initargs=(cache.max_bytes, cache.max_entry_bytes)
+        ) as pool:
+            futures = [
+                pool.submit(_render_week_pages, self.chapters_dir, self.shared_dir, week, names, log_level,
+                            cache.entries_for(week.number))
+                if names else None
+                for week, names in tasks
+            ]
+            for (week, names), future in zip(tasks, futures):
+                if future is None:
+                    yield []
+                    continue
+                contents, records, stats = future.result()
+                for level, message in records:
+                    self.logger.log(level, message)
+                cache.merge(stats['cache_entries'].items(), scope=week.number)
+                cache.mark_used(stats['cache_used'], week.number)
+                cache.hits += stats['cache_hits']
+                cache.misses += stats['cache_misses']
+                for (path, _), (name, start, duration, read) in zip(names, stats['timings']):
+                    IO_STATS['read'] += read
+                    self.profiler.add_event(
+                        name, 'generator', start, duration, pid=stats['pid'],
+                        week=week.number, page=f'weeks/{week.number:02d}/{path.name}', bytes_read=read
+                    )
+                yield contents
     
     def _generate_global_pages(self) -> None:
         """生成全局页面"""
         self.logger.info("  生成全局页面...")
         
-        self._write_file(self.docs_dir / 'index.mdx', self.content_generator.generate_index(self.repo_root))
-        self._write_file(self.docs_dir / 'syllabus.mdx', self.content_generator.generate_syllabus())
-        self._write_file(self.docs_dir / 'campusflow.mdx', self.content_generator.generate_campusflow())
-        self._write_file(self.docs_dir / 'glossary.mdx', self.content_generator.generate_glossary())
-        self._write_file(self.docs_dir / 'style-guide.mdx', self.content_generator.generate_style_guide())
+        gen = self.content_generator
+        self._build_page(self.docs_dir / 'index.mdx', lambda: gen.generate_index(self.repo_root),
+                         [self.repo_root / 'README.md'])
+        self._build_page(self.docs_dir / 'syllabus.mdx', gen.generate_syllabus,
+                         [self.chapters_dir / 'SYLLABUS.md'])
+        self._build_page(self.docs_dir / 'campusflow.mdx', gen.generate_campusflow,
+                         [self.shared_dir / 'book_project.md'])
+        self._build_page(self.docs_dir / 'glossary.mdx', gen.generate_glossary,
+                         [self.shared_dir / 'glossary.yml'])
+        self._build_page(self.docs_dir / 'style-guide.mdx', gen.generate_style_guide,
+                         [self.shared_dir / 'style_guide.md'])
+    
+    def _page_status(self, path: Path, inputs: list[Path], extra: str = '') -> tuple[str, list[str], bool]:
+        """计算页面的构建键，返回 (键, 输入文件列表, 是否可以跳过)"""
+        key, files = self.manifest.page_key(inputs, extra)
+        return key, files, not self.force and self.manifest.is_fresh(path, key)
+    
+    def _store_page(self, path: Path, content: Any, key: str, files: list[str]) -> None:
+        """写入重新生成的页面，并在清单中记录构建键"""
+        self.stats['generated'] += 1
+        if self._write_file(path, content):
+            self.manifest.record(path, key, files)
+    
+    def _build_page(self, path: Path, generate: Any, inputs: list[Path], extra: str = '') -> None:
+        """按需生成单个页面：构建键未变化且输出存在时直接跳过"""
+        key, files, fresh = self._page_status(path, inputs, extra)
+        if fresh:
+            self.stats['skipped'] += 1
+            self.logger.debug(f"  未变化，跳过: {path}")
+            return
+        with self.profiler.stage(path.stem, cat='generator', page=path.name):
+            self._store_page(path, generate(), key, files)
     
     def _generate_sidebars(self, phases: list[PhaseInfo]) -> None:
         """生成 sidebars.ts (仅当文件不存在时)"""
@@ -1626,13 +2334,44 @@ class SiteBuilder:
         sidebars_content = self.sidebars_generator.generate(phases)
         self._write_file(sidebars_path, sidebars_content)
     
-    def _write_file(self, path: Path, content: str) -> None:
-        """写入文件"""
+    def _write_file(self, path: Path, content: 'str | Iterable[str] | StagedFile') -> bool:
+        """写入文件（内容未变化时不触碰文件，避免触发 Docusaurus 热更新）
+
+        content 可以是字符串、逐块产出字符串的迭代器（边生成边写入临时文件），
+        或子进程已经写好的 StagedFile。返回 True 表示磁盘上的文件已是最新内容。
+        """
         try:
-            path.write_text(content, encoding='utf-8')
+            if not isinstance(content, str):
+                staged = content if isinstance(content, StagedFile) else _stage_chunks(path, content)
+                return self._replace_staged(path, staged)
+            data = content.encode('utf-8')
+            try:
+                if path.read_bytes() == data:
+                    self.logger.debug(f"  内容未变化: {path}")
+                    return True
+            except FileNotFoundError:
+                pass
+            path.write_bytes(data)
+            IO_STATS['written'] += len(data)
+            self.stats['written'] += 1
             self.logger.debug(f"  写入文件: {path}")
+            return True
         except Exception as e:
             self.logger.warning(f"  写入文件失败: {path} - {e}")
+            return False
+    
+    def _replace_staged(self, path: Path, staged: StagedFile) -> bool:
+        """用临时文件替换目标文件（内容相同时丢弃临时文件）"""
+        if _same_file_content(staged.path, path):
+            staged.path.unlink()
+            self.logger.debug(f"  内容未变化: {path}")
+            return True
+        size = staged.path.stat().st_size
+        os.replace(staged.path, path)
+        IO_STATS['written'] += size
+        self.stats['written'] += 1
+        self.logger.debug(f"  写入文件: {path}")
+        return True
 
 
 # =============================================================================
@@ -1648,6 +2387,11 @@ def parse_args() -> argparse.Namespace:
 示例:
     python scripts/build_site.py
     python scripts/build_site.py --verbose
+    python scripts/build_site.py --force
+    python scripts/build_site.py --jobs 8
+    python scripts/build_site.py --escape-cache .cache/escape_cache.json
+    python scripts/build_site.py --force --profile
+    python scripts/build_site.py --force --profile --profile-stage generate_chapter
     python scripts/build_site.py --site-dir ./my-site --chapters-dir ./content
         '''
     )
@@ -1673,6 +2417,46 @@ def parse_args() -> argparse.Namespace:
         help='shared 目录路径 (默认: shared)'
     )
     
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='忽略增量构建清单，重新生成所有页面'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='并行生成每周页面的进程数 (默认: CPU 核数；1 表示串行)'
+    )
+    
+    parser.add_argument(
+        '--escape-cache',
+        type=str,
+        default=None,
+        help='转义结果缓存文件路径，在多次构建之间复用转义结果 (默认: 只在本次构建内缓存)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='记录各阶段、每周和每个生成函数的耗时与读写字节数，输出汇总表和 trace 文件'
+    )
+    
+    parser.add_argument(
+        '--profile-trace',
+        type=str,
+        default=None,
+        help='Chrome trace-event 格式的计时文件路径 (默认: <site-dir>/.build_trace.json)'
+    )
+    
+    parser.add_argument(
+        '--profile-stage',
+        type=str,
+        default=None,
+        help='用 cProfile 分析指定阶段（如 week_pages、generate_chapter、Week 06），隐含 --profile 和 --jobs 1'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -1708,18 +2492,38 @@ def main() -> int:
         logger.warning(f"shared 目录不存在: {shared_dir}")
         shared_dir = chapters_dir  # 使用 chapters 作为 fallback
     
+    # 计时
+    profile = args.profile or bool(args.profile_stage)
+    profiler = BuildProfiler(enabled=profile, cprofile_stage=args.profile_stage)
+    jobs = args.jobs
+    if args.profile_stage and jobs > 1:
+        # cProfile 只能分析主进程，生成函数需要在主进程中运行
+        logger.info("--profile-stage: 使用 --jobs 1")
+        jobs = 1
+    
     # 创建站点构建器
     builder = SiteBuilder(
         site_dir=site_dir,
         chapters_dir=chapters_dir,
         shared_dir=shared_dir,
         repo_root=repo_root,
-        logger=logger
+        logger=logger,
+        force=args.force,
+        jobs=jobs,
+        escape_cache_path=repo_root / args.escape_cache if args.escape_cache else None,
+        profiler=profiler
     )
     
     # 构建站点
     success = builder.build()
     
+    if profile:
+        trace_path = repo_root / args.profile_trace if args.profile_trace else site_dir / '.build_trace.json'
+        profiler.log_summary(logger)
+        profiler.write_trace(trace_path)
+        logger.info(f"trace 已保存: {trace_path}（可在 https://ui.perfetto.dev 或 chrome://tracing 中打开）")
+        profiler.log_cprofile(logger, trace_path.with_suffix('.prof') if args.profile_stage else None)
+    
     return 0 if success else 1
 
 
@@ -0,0 +1,72 @@
+"""SiteBuilder 的计时（--profile）"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+SITE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SITE_DIR / "scripts"))
+
+from build_site import BuildProfiler, SiteBuilder  # noqa: E402
+
+LOGGER = logging.getLogger("test_build_profiler")
+
+
+def _make_book(tmp_path: Path) -> Path:
+    chapters = tmp_path / "chapters"
+    week_dir = chapters / "week_01"
+    (week_dir / "examples").mkdir(parents=True)
+    (chapters / "TOC.md").write_text(
+        "# 目录\n\n## 阶段一：入门基础\n\n"
+        "| 周次 | 章节 |\n|------|------|\n| 01 | [第一周](week_01/CHAPTER.md) |\n",
+        encoding="utf-8",
+    )
+    (week_dir / "CHAPTER.md").write_text("# 第一周\n\nList<String> {name}\n", encoding="utf-8")
+    (week_dir / "examples" / "hello.py").write_text('print("hi")\n', encoding="utf-8")
+    return chapters
+
+
+def test_profile_records_stages_weeks_and_generators(tmp_path):
+    chapters = _make_book(tmp_path)
+    profiler = BuildProfiler(enabled=True)
+    builder = SiteBuilder(tmp_path / "site", chapters, chapters, tmp_path, LOGGER, profiler=profiler)
+
+    assert builder.build()
+
+    by_cat = {}
+    for event in profiler.events:
+        by_cat.setdefault(event["cat"], []).append(event)
+    stages = [e["name"] for e in by_cat["stage"]]
+    assert stages[:5] == ["load_state", "parse_toc", "create_dirs", "week_pages", "global_pages"]
+    assert [e["name"] for e in by_cat["week"]] == ["Week 01"]
+
+    chapter = next(e for e in by_cat["generator"] if e["name"] == "generate_chapter")
+    assert chapter["args"]["week"] == 1
+    assert chapter["args"]["page"] == "weeks/01/chapter.mdx"
+    assert chapter["args"]["bytes_read"] > 0
+    assert chapter["args"]["bytes_written"] > 0
+
+    trace_path = tmp_path / "trace.json"
+    profiler.write_trace(trace_path)
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in trace["traceEvents"])
+
+
+def test_cprofile_wraps_the_named_stage(tmp_path):
+    chapters = _make_book(tmp_path)
+    profiler = BuildProfiler(enabled=True, cprofile_stage="generate_chapter")
+    builder = SiteBuilder(tmp_path / "site", chapters, chapters, tmp_path, LOGGER, profiler=profiler)
+
+    assert builder.build()
+    profiler.log_cprofile(LOGGER, tmp_path / "stage.prof")
+
+    assert (tmp_path / "stage.prof").stat().st_size > 0
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    chapters = _make_book(tmp_path)
+    builder = SiteBuilder(tmp_path / "site", chapters, chapters, tmp_path, LOGGER)
+
+    assert builder.build()
+    assert builder.profiler.events == []
@@ -0,0 +1,78 @@
+"""代码页面（code.mdx）的分块生成与大文件截断"""
+
+import logging
+import sys
+from pathlib import Path
+
+SITE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SITE_DIR / "scripts"))
+
+from build_site import CodeCollector, ContentGenerator, SiteBuilder, WeekInfo  # noqa: E402
+
+LOGGER = logging.getLogger("test_code_page")
+
+
+def _make_week(tmp_path: Path) -> tuple[Path, WeekInfo]:
+    examples = tmp_path / "chapters" / "week_01" / "examples"
+    examples.mkdir(parents=True)
+    (examples / "01_hello.py").write_text('print("hello {name}")\n', encoding="utf-8")
+    (examples / "data.json").write_text("".join(f'{{"row": {i}}}\n' for i in range(2000)), encoding="utf-8")
+    week = WeekInfo(number=1, title="Hello", phase="phase-1", phase_label="阶段一",
+                    has_examples=True)
+    return tmp_path / "chapters", week
+
+
+def test_large_files_are_truncated_with_notice(tmp_path):
+    chapters_dir, week = _make_week(tmp_path)
+    generator = ContentGenerator(chapters_dir, chapters_dir, LOGGER)
+    generator.code_collector = CodeCollector(LOGGER, max_inline_bytes=1024)
+
+    page = generator.generate_code(week)
+
+    assert '### 01_hello.py' in page
+    assert '{"row": 10}' in page
+    assert '{"row": 1999}' not in page
+    assert page.count("> ⚠️ 文件较大") == 1
+
+
+def test_streamed_page_is_written_once_and_then_left_alone(tmp_path):
+    chapters_dir, week = _make_week(tmp_path)
+    site_dir = tmp_path / "site"
+    builder = SiteBuilder(site_dir, chapters_dir, chapters_dir, tmp_path, LOGGER)
+    target = site_dir / "code.mdx"
+    target.parent.mkdir(parents=True)
+    expected = builder.content_generator.generate_code(week)
+
+    assert builder._write_file(target, builder.content_generator.iter_code_page(week))
+    assert target.read_text(encoding="utf-8") == expected
+    assert builder.stats["written"] == 1
+
+    mtime = target.stat().st_mtime_ns
+    assert builder._write_file(target, builder.content_generator.iter_code_page(week))
+    assert builder.stats["written"] == 1
+    assert target.stat().st_mtime_ns == mtime
+    assert list(site_dir.glob(".*.tmp")) == []
+
+
+def test_truncation_caps_bytes_not_characters(tmp_path):
+    source = tmp_path / "notes.py"
+    source.write_text("".join(f"# 第 {i} 行：中文注释\r\n" for i in range(500)), encoding="utf-8")
+    collector = CodeCollector(LOGGER, max_inline_bytes=1024)
+
+    head, truncated = collector.read_content({"file": source, "size": source.stat().st_size})
+
+    assert truncated
+    assert len(head.encode("utf-8")) <= 1024
+    assert head.startswith("# 第 0 行：中文注释\n# 第 1 行")
+    assert "\r" not in head and not head.endswith("\n")
+
+
+def test_truncation_without_newline_keeps_whole_characters(tmp_path):
+    source = tmp_path / "one_line.txt"
+    source.write_text("中" * 1000, encoding="utf-8")
+    collector = CodeCollector(LOGGER, max_inline_bytes=1000)
+
+    head, truncated = collector.read_content({"file": source, "size": source.stat().st_size})
+
+    assert truncated
+    assert head == "中" * 333
@@ -0,0 +1,105 @@
+"""转义结果缓存 EscapeCache"""
+
+import json
+import sys
+from pathlib import Path
+
+SITE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SITE_DIR / "scripts"))
+
+from build_site import EscapeCache, escape_mdx_content  # noqa: E402
+
+
+def test_repeated_content_is_escaped_once():
+    calls = []
+
+    def escape(text):
+        calls.append(text)
+        return escape_mdx_content(text)
+
+    cache = EscapeCache()
+    first = cache.get("mdx", "List<String> {id}", escape)
+    second = cache.get("mdx", "List<String> {id}", escape)
+
+    assert first == second == escape_mdx_content("List<String> {id}")
+    assert calls == ["List<String> {id}"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_kinds_do_not_share_entries():
+    cache = EscapeCache()
+    assert cache.get("mdx", "a", str.upper) == "A"
+    assert cache.get("inline", "a", str.lower) == "a"
+
+
+def test_least_recently_used_entry_is_evicted_by_size():
+    entry = EscapeCache._entry_size("A")
+    cache = EscapeCache(max_bytes=2 * entry)
+    cache.get("mdx", "a", str.upper)
+    cache.get("mdx", "b", str.upper)
+    cache.get("mdx", "a", str.upper)
+    cache.get("mdx", "c", str.upper)
+
+    assert len(cache) == 2
+    assert cache.nbytes == 2 * entry
+    cache.get("mdx", "a", str.upper)
+    assert cache.misses == 3
+    cache.get("mdx", "b", str.upper)
+    assert cache.misses == 4
+
+
+def test_large_inputs_are_not_cached():
+    cache = EscapeCache(max_entry_bytes=100)
+    big = "中" * 40  # 40 个字符，120 字节
+
+    assert cache.get("mdx", big, str.upper) == big
+    assert cache.get("mdx", "x" * 101, str.upper) == "X" * 101
+    assert len(cache) == 0 and cache.nbytes == 0
+    assert cache.get("mdx", "small", str.upper) == "SMALL"
+    assert len(cache) == 1
+
+
+def test_workers_only_receive_entries_of_their_week(tmp_path):
+    cache = EscapeCache(path=tmp_path / "escape_cache.json")
+    cache.scope = 1
+    cache.get("mdx", "shared", str.upper)
+    cache.get("mdx", "week one", str.upper)
+    cache.scope = 2
+    cache.get("mdx", "shared", str.upper)
+    cache.scope = None
+    cache.get("mdx", "global page", str.upper)
+    cache.save()
+
+    reloaded = EscapeCache(path=tmp_path / "escape_cache.json")
+    reloaded.load()
+    assert sorted(v for _, v in reloaded.entries_for(1)) == ["SHARED", "WEEK ONE"]
+    assert [v for _, v in reloaded.entries_for(2)] == ["SHARED"]
+    assert reloaded.entries_for(3) == []
+
+    worker = EscapeCache(record_new=True)
+    worker.merge(reloaded.entries_for(2))
+    worker.scope = 2
+    worker.get("mdx", "shared", str.upper)
+    worker.get("mdx", "week one", str.upper)
+    new, used = worker.take_new()
+    reloaded.merge(new.items(), scope=2)
+    reloaded.mark_used(used, 2)
+    assert sorted(v for _, v in reloaded.entries_for(2)) == ["SHARED", "WEEK ONE"]
+
+
+def test_persisted_cache_is_reused_and_invalidated_with_the_script(tmp_path):
+    path = tmp_path / "escape_cache.json"
+    cache = EscapeCache(path=path)
+    cache.get("mdx", "{id}", escape_mdx_content)
+    cache.save()
+
+    reloaded = EscapeCache(path=path)
+    reloaded.load()
+    assert reloaded.get("mdx", "{id}", lambda text: "recomputed") == escape_mdx_content("{id}")
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["generator"] = "an older build_site.py"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    stale = EscapeCache(path=path)
+    stale.load()
+    assert len(stale) == 0
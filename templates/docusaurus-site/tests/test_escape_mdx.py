@@ -0,0 +1,392 @@
+"""_escape_mdx_content 的等价性测试
+
+新实现必须与重写前的实现逐字节一致。下面的 legacy_escape_mdx_content 是旧实现的副本，
+只改了两处：
+  1. html_tags 从 set 改为 list，避免处理顺序随 PYTHONHASHSEED 变化
+  2. 占位符递归还原。旧实现按字符串倒序 replace，嵌套在内联代码里的 LaTeX
+     占位符会原样留在输出中（例如 week_09 CHAPTER.md 里的 `world$`）
+"""
+
+import re
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+SITE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SITE_DIR / "scripts"))
+
+from build_site import escape_mdx_content  # noqa: E402
+
+TEXT_SUFFIXES = {'.md', '.py', '.yml', '.yaml', '.txt', '.json', '.toml', '.cfg', '.ini', '.sh'}
+SKIP_DIRS = {'__pycache__', '.pytest_cache'}
+
+
+def _corpus_files() -> list[Path]:
+    """模板自带章节和仓库 chapters/ 下的全部文本文件"""
+    roots = [SITE_DIR / "chapters", SITE_DIR.parents[1] / "chapters"]
+    files = []
+    for root in roots:
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and path.suffix in TEXT_SUFFIXES and not SKIP_DIRS & set(path.parts):
+                files.append(path)
+    return files
+
+
+def legacy_escape_mdx_content(content: str) -> str:
+    """重写前的 _escape_mdx_content（去掉了日志，修正了两处问题，见模块说明）"""
+
+    # 使用唯一的占位符前缀避免冲突
+    placeholder_prefix = f"__MDX_PROTECTED_{uuid.uuid4().hex[:8]}__"
+    placeholders = {}
+    placeholder_id = 0
+
+    def make_placeholder():
+        nonlocal placeholder_id
+        ph = f"{placeholder_prefix}_{placeholder_id}_"
+        placeholder_id += 1
+        return ph
+
+    # 步骤0: 首先保护代码块（```...```），避免代码块内的内容被转义
+    # 同时对代码块内的 URL 进行特殊处理以避免 MDX 解析问题
+    def protect_code_blocks(text):
+        result = []
+        i = 0
+        while i < len(text):
+            # 查找代码块开始 - 必须在行首（或文件开头）
+            if text[i:i+3] == '```' and (i == 0 or text[i-1] == '\n'):
+                # 找到代码块结束 - 查找 \n``` 后跟换行或文件结尾
+                end_idx = text.find('\n```', i + 3)
+                if end_idx == -1:
+                    # 没有找到结束，保持原样
+                    result.append(text[i:])
+                    break
+                # 包含结束的 ``` 和后面的换行
+                end_idx = end_idx + 4
+                code_block = text[i:end_idx]
+                placeholder = make_placeholder()
+                # 存储原始代码块用于恢复
+                placeholders[placeholder] = code_block
+                result.append(placeholder)
+                i = end_idx
+            else:
+                result.append(text[i])
+                i += 1
+        return ''.join(result)
+
+    content = protect_code_blocks(content)
+
+    # 步骤0.3: 保护 LaTeX 数学公式（$$...$$ 和 $...$），避免公式中的 { } 被转义
+    def protect_latex_math(text):
+        result = []
+        i = 0
+        while i < len(text):
+            # 查找 $$...$$ 块（多行数学公式）
+            if text[i:i+2] == '$$':
+                end_idx = text.find('$$', i + 2)
+                if end_idx == -1:
+                    result.append(text[i:])
+                    break
+                end_idx = end_idx + 2
+                math_block = text[i:end_idx]
+                placeholder = make_placeholder()
+                placeholders[placeholder] = math_block
+                result.append(placeholder)
+                i = end_idx
+            # 查找行内 $...$ 公式（单行，不包含换行）
+            elif text[i] == '$' and (i == 0 or text[i-1] != '$'):
+                # 找到下一个 $，但确保不是 $$ 的一部分
+                end_idx = text.find('$', i + 1)
+                if end_idx == -1 or end_idx == i + 1:
+                    result.append(text[i])
+                    i += 1
+                    continue
+                # 确保不是 $$ 的开始
+                if end_idx + 1 < len(text) and text[end_idx + 1] == '$':
+                    result.append(text[i])
+                    i += 1
+                    continue
+                # 检查是否在同一行内
+                newline_idx = text.find('\n', i, end_idx)
+                if newline_idx != -1:
+                    # 跨行，不是有效的行内公式
+                    result.append(text[i])
+                    i += 1
+                    continue
+                math_block = text[i:end_idx + 1]
+                placeholder = make_placeholder()
+                placeholders[placeholder] = math_block
+                result.append(placeholder)
+                i = end_idx + 1
+            else:
+                result.append(text[i])
+                i += 1
+        return ''.join(result)
+
+    content = protect_latex_math(content)
+
+    # 保护合法的 MDX 组件和 HTML 标签（这些不应该被转义）
+    protected_tags = ['Tabs', 'TabItem', 'details', 'summary', 'br', 'code', 'pre', 'kbd', 'sub', 'sup']
+
+    # 步骤0.5: 保护内联代码（`...`），避免内联代码内的内容被转义
+    # 匹配单个反引号包围的内容（不是代码块）
+    inline_code_pattern = r'(?<!`)`(?!`)([^`\n]+)(?<!`)`(?!`)'
+    matches = list(re.finditer(inline_code_pattern, content))
+    for match in reversed(matches):
+        placeholder = make_placeholder()
+        placeholders[placeholder] = match.group(0)
+        content = content[:match.start()] + placeholder + content[match.end():]
+
+    # 步骤1: 保护合法的 MDX 组件，用占位符替换
+    # 使用列表存储替换信息，避免在迭代时修改字符串
+    for tag in protected_tags:
+        # 匹配 <Tag ...>...</Tag>（包括跨行的）
+        pattern = rf'<{tag}\b[^>]*>.*?</{tag}>'
+        matches = list(re.finditer(pattern, content, re.DOTALL))
+        for match in reversed(matches):  # 从后往前替换，避免位置偏移
+            placeholder = make_placeholder()
+            placeholders[placeholder] = match.group(0)
+            content = content[:match.start()] + placeholder + content[match.end():]
+        
+        # 匹配自闭合 <Tag ... /> 或 <Tag>
+        pattern = rf'<{tag}\b[^>]*/>'
+        matches = list(re.finditer(pattern, content))
+        for match in reversed(matches):
+            placeholder = make_placeholder()
+            placeholders[placeholder] = match.group(0)
+            content = content[:match.start()] + placeholder + content[match.end():]
+        
+        # 匹配 <Tag>（自闭合但没有斜杠，如 <br>, <hr>）
+        pattern = rf'<{tag}\b[^<>]*>'
+        matches = list(re.finditer(pattern, content))
+        for match in reversed(matches):
+            placeholder = make_placeholder()
+            placeholders[placeholder] = match.group(0)
+            content = content[:match.start()] + placeholder + content[match.end():]
+    
+    # 步骤2: 保护已知的合法 HTML 标签（这些不应该被转义）
+    html_tags = ['div', 'span', 'p', 'a', 'img', 'table', 'tr', 'td', 'th', 'thead', 'tbody',
+                 'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'em',
+                 'b', 'i', 'u', 's', 'del', 'ins', 'iframe', 'video', 'audio', 'source',
+                 'input', 'form', 'button', 'label', 'select', 'option', 'hr', 'small']
+    
+    for tag in html_tags:
+        # 匹配 <tag ...>...</tag>
+        pattern = rf'<{tag}\b[^>]*>.*?</{tag}>'
+        matches = list(re.finditer(pattern, content, re.DOTALL))
+        for match in reversed(matches):
+            placeholder = make_placeholder()
+            placeholders[placeholder] = match.group(0)
+            content = content[:match.start()] + placeholder + content[match.end():]
+        
+        # 匹配 <tag ... />
+        pattern = rf'<{tag}\b[^>]*/>'
+        matches = list(re.finditer(pattern, content))
+        for match in reversed(matches):
+            placeholder = make_placeholder()
+            placeholders[placeholder] = match.group(0)
+            content = content[:match.start()] + placeholder + content[match.end():]
+        
+        # 匹配 <tag>（自闭合但没有斜杠）
+        pattern = rf'<{tag}\b[^<>]*>'
+        matches = list(re.finditer(pattern, content))
+        for match in reversed(matches):
+            placeholder = make_placeholder()
+            placeholders[placeholder] = match.group(0)
+            content = content[:match.start()] + placeholder + content[match.end():]
+    
+    # 步骤3: 转义看起来像 JSX/泛型的标签
+    # 注意：此时所有合法标签已经被占位符保护
+    
+    # 3.1 转义空尖括号 <>（菱形操作符）
+    content = re.sub(r'(?<!&)<>', '&lt;&gt;', content)
+    
+    # 3.2 转义泛型类型参数 <T, K>、<String, Integer> 等
+    # 匹配 <字母,字母> 或 <字母, 字母> 等形式
+    def escape_generic(match):
+        inner = match.group(1)
+        # 如果内部包含逗号，且看起来像类型参数，则转义
+        return f'&lt;{inner}&gt;'
+    
+    # 匹配 <Type1, Type2> 或 <T, K extends Something> 等形式
+    content = re.sub(r'<([A-Za-z][A-Za-z0-9_]*\s*,\s*[A-Za-z][^>]*)>', escape_generic, content)
+    
+    # 3.3 转义单个泛型参数 <String>、<Integer>、<6> 等
+    def escape_single_tag(match):
+        tag = match.group(1)
+        # 任何看起来像标签的内容都转义
+        return f'&lt;{tag}&gt;'
+    
+    # 匹配 <Word> 形式的标签（包括 <6> 这种数字形式）
+    content = re.sub(r'<([A-Za-z0-9_]+)>', escape_single_tag, content)
+    
+    # 3.4 转义比较表达式中的 <数字（如 <60 分）
+    # 匹配 <数字 后跟非字母数字字符的情况
+    def escape_comparison(match):
+        return f'&lt;{match.group(1)}'
+    
+    content = re.sub(r'<(\d+)(?=[^\d>])', escape_comparison, content)
+    
+    # 3.4b 转义比较运算符 <= 和 >=
+    content = re.sub(r'<=', '&lt;=', content)
+    content = re.sub(r'>=', '&gt;=', content)
+    
+    # 3.5 转义闭合标签 </Word>
+    content = re.sub(r'</([A-Za-z0-9_]+)>', lambda m: f'&lt;/{m.group(1)}&gt;', content)
+    
+    # 3.6 转义 ${...} 格式的 shell 变量/占位符，避免被当作 JSX 表达式
+    # 所有 ${...} 格式都转义（它们通常是 shell 变量，不是 JS 表达式）
+    # 使用 HTML 实体转义 { 和 }
+    def escape_shell_var(match):
+        var_content = match.group(1)
+        # 转义 $ { } 为 HTML 实体
+        return f'&#36;&#123;{var_content}&#125;'
+    
+    content = re.sub(r'\$\{([^}]+)\}', escape_shell_var, content)
+    
+    # 3.7 转义 REST API 路径参数 {id}, {taskId} 等
+    # 这些会被误认为 JSX 表达式
+    # 匹配 {word} 格式，但排除纯数字（如 {1} 可能是合法对象字面量）
+    def escape_path_param(match):
+        inner = match.group(1)
+        # 如果是纯数字，不转义（可能是对象字面量）
+        if inner.isdigit():
+            return match.group(0)
+        # 其他情况转义
+        return f'\\{{{inner}}}'
+
+    # 匹配简单的 {identifier} 格式（不包括冒号，避免匹配 {PORT:8080} 这种 shell 变量默认值语法）
+    # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
+    content = re.sub(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*)\}', escape_path_param, content)
+
+    # 3.8 转义 Python f-string 格式的占位符 {var:.2f}, {var:.1%}, {var[key]} 等
+    # 这些在正文中的占位符会被 MDX 误解析为 JSX 表达式
+    # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
+    def escape_fstring_placeholder(match):
+        inner = match.group(1)
+        return f'\\{{{inner}}}'
+
+    # 匹配 {var:format} 格式（如 {mean_effect:.2f}, {prob_positive:.1%}）
+    content = re.sub(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*):[^}]+\}', escape_fstring_placeholder, content)
+
+    # 匹配 {var[key]} 格式（如 {result['mean']}）
+    content = re.sub(r'(?<!\\)\{([a-zA-Z_][a-zA-Z0-9_]*)\[[^\]]+\]\}', escape_fstring_placeholder, content)
+
+    # 匹配 {dict_var} 格式（如 {'mu': 0, 'sigma': 10}）
+    # 注意：这个要小心，只匹配看起来像字典或配置的内容
+    # 实际上，这种格式太复杂，我们选择转义所有剩余的 {word...word} 格式
+    # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
+    def escape_complex_braces(match):
+        inner = match.group(1)
+        # 如果内部只包含字母、数字、下划线、引号、冒号、逗号、空格、点号等安全字符
+        if re.match(r'^[a-zA-Z0-9_\'":,\s.\[\]%+-]+$', inner):
+            return f'\\{{{inner}}}'
+        return match.group(0)
+
+    # 匹配更复杂的 {...} 格式（如 {'mu': 0, 'sigma': 10}）
+    content = re.sub(r'(?<!\\)\{([a-zA-Z0-9_\'":,\s.\[\]%+-]{3,50})\}', escape_complex_braces, content)
+
+    # 3.9 转义包含中文或其他 Unicode 字符的占位符（如 {当前年份}、{变量名}）
+    # 这些会被 MDX 误解析为 JSX 表达式
+    # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
+    def escape_unicode_placeholder(match):
+        inner = match.group(1)
+        return f'\\{{{inner}}}'
+
+    # 匹配包含中文字符的 {...} 格式
+    content = re.sub(r'(?<!\\)\{([\u4e00-\u9fff\u3400-\u4dbf\w\s]+)\}', escape_unicode_placeholder, content)
+
+    # 3.10 转义所有剩余的简单 {...} 格式（兜底规则）
+    # 匹配任何剩余的 {xxx} 格式（1-30个字符，不包含特殊字符）
+    # 使用负向后瞻确保 { 前面不是反斜杠（避免重复转义）
+    def escape_remaining_braces(match):
+        inner = match.group(1)
+        # 如果内部看起来像简单的文本（不含已转义的反斜杠）
+        if '\\' not in inner and len(inner) <= 30:
+            return f'\\{{{inner}}}'
+        return match.group(0)
+
+    content = re.sub(r'(?<!\\)\{([^{}\n\\]{1,30})\}', escape_remaining_braces, content)
+
+    # 步骤4: 恢复保护的标签
+    # 从后往前恢复，避免嵌套问题
+    placeholder_pattern = re.compile(re.escape(placeholder_prefix) + r'_\d+_')
+
+    def restore(match):
+        return placeholder_pattern.sub(restore, placeholders[match.group(0)])
+
+    content = placeholder_pattern.sub(restore, content)
+
+    # 步骤4.5: 对代码块内的 URL 进行转义，避免 MDX 的 URL 解析问题
+    # Docusaurus/MDX 在某些情况下会尝试解析代码块内的 URL，导致错误
+    # 使用零宽断言来匹配代码块内的 http:// 和 https://
+    def escape_urls_in_code_blocks(text):
+        result = []
+        i = 0
+        while i < len(text):
+            # 只匹配行首的 ```
+            if text[i:i+3] == '```' and (i == 0 or text[i-1] == '\n'):
+                # 找到代码块结束
+                end_idx = text.find('\n```', i + 3)
+                if end_idx == -1:
+                    result.append(text[i:])
+                    break
+                end_idx = end_idx + 4
+                code_block = text[i:end_idx]
+                # 转义 URL 中的冒号
+                code_block = code_block.replace('http://', 'http&#58;//')
+                code_block = code_block.replace('https://', 'https&#58;//')
+                result.append(code_block)
+                i = end_idx
+            else:
+                result.append(text[i])
+                i += 1
+        return ''.join(result)
+
+    content = escape_urls_in_code_blocks(content)
+
+    # 步骤5: 确保自闭合标签使用正确的格式（<br /> 而不是 <br>）
+    # 这在 MDX 表格中特别重要
+    self_closing_tags = ['br', 'hr', 'img', 'input', 'meta', 'link', 'area', 'base', 'col', 
+                        'embed', 'param', 'source', 'track', 'wbr']
+    for tag in self_closing_tags:
+        # 将 <tag> 转换为 <tag />，但避免重复转换 <tag />
+        content = re.sub(rf'<{tag}\b([^<>]*[^/])?>', rf'<{tag}\1 />', content)
+        content = re.sub(rf'<{tag}\b\s*/\s*>', rf'<{tag} />', content)  # 标准化已有斜杠的格式
+    
+    return content
+
+
+CORPUS = _corpus_files()
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda p: str(p.relative_to(SITE_DIR.parents[1])))
+def test_matches_legacy_on_corpus(path):
+    content = path.read_text(encoding="utf-8")
+    assert escape_mdx_content(content) == legacy_escape_mdx_content(content)
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "List<String> and Map<K, V> and <> and <60 分, a <= b >= c",
+    "</Foo> ${HOME} {id} {1} {x:.2f} {row['a']} {'mu': 0} {当前年份}",
+    "```python\nurl = 'https://example.com/{id}'\n```\ntext {id}",
+    "```\nunclosed {fence}\n",
+    "$$\n{x}\n$$ and $a_{1}$ but $5 and\n$ {y}",
+    "`code {x}` and `$` | `world$` | {z}",
+    "<details><summary>{x}</summary>\n<br>\n</details><br/><img src='a.png'><hr >",
+    "<Tabs><TabItem value='a'>{a}</TabItem></Tabs> <div>{b}</div> <Custom>",
+    "${a} $${b}$$ $$$ `` ``` inline",
+    "<br>\n<br x>{a}\n</br> <hr>{b}</hr> <details open>{c}</details><details>{d}",
+])
+def test_matches_legacy_on_edge_cases(content):
+    assert escape_mdx_content(content) == legacy_escape_mdx_content(content)
+
+
+def test_inline_code_containing_dollar_is_restored():
+    result = escape_mdx_content("| `$` | 字符串结尾 | `world$` |")
+    assert result == "| `$` | 字符串结尾 | `world$` |"
+    assert "__MDX_PROTECTED_" not in result